@@ -0,0 +1,121 @@
+"""
+Runs benchmarks and writes their results as json, so results of two commits can be compared.
+
+Usage:
+```
+python -m benchmarks -o before.json
+python -m benchmarks parser run -o after.json
+python -m benchmarks compare before.json after.json
+```
+"""
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+BENCHMARKS = ("parser", "interpolation", "context", "run", "http", "import_time")
+
+
+def run_benchmarks(names: List[str]) -> Dict[str, Any]:
+    report = {"meta": collect_meta(), "benchmarks": {}}
+    for name in names:
+        if name not in BENCHMARKS:
+            raise ValueError(f"Unknown benchmark `{name}`, expected one of `{'`, `'.join(BENCHMARKS)}`.")
+        print(f"running {name}...", file=sys.stderr)
+        started = time.perf_counter()
+        module = importlib.import_module(f"benchmarks.bench_{name}")
+        report["benchmarks"][name] = {"results": module.run(), "seconds": time.perf_counter() - started}
+
+    return report
+
+
+def collect_meta() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def flatten(value: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """
+    Yields numeric leaves of a report with their paths, list items are identified by their first string or
+    integer field, e.g. `run/results/depth=3/sequential_per_test_us`.
+    """
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from flatten(item, f"{prefix}/{key}" if prefix else str(key))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from flatten(item, f"{prefix}/{_label(item, index)}")
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, float(value)
+
+
+def _label(item: Any, index: int) -> str:
+    if isinstance(item, dict):
+        for key, value in item.items():
+            if isinstance(value, (str, int)) and not isinstance(value, bool):
+                return f"{key}={value}"
+
+    return str(index)
+
+
+def compare(before: Dict[str, Any], after: Dict[str, Any], threshold: float) -> List[Tuple[str, float, float, float]]:
+    """
+    Returns metrics present in both reports with their relative change, changes below threshold are skipped.
+    """
+    old = dict(flatten(before["benchmarks"]))
+    changes = []
+    for key, value in flatten(after["benchmarks"]):
+        if key not in old or not old[key]:
+            continue
+        change = value / old[key] - 1
+        if abs(change) >= threshold:
+            changes.append((key, old[key], value, change))
+
+    return changes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["compare"]:
+        parser = argparse.ArgumentParser(prog="benchmarks compare")
+        parser.add_argument("before")
+        parser.add_argument("after")
+        parser.add_argument("--threshold", type=float, default=0.1, help="minimal relative change, `0.1` by default")
+        arguments = parser.parse_args(argv[1:])
+        with open(arguments.before) as before, open(arguments.after) as after:
+            changes = compare(json.load(before), json.load(after), arguments.threshold)
+        for key, old, new, change in changes:
+            print(f"{change:>+8.1%} {old:>14.3f} -> {new:<14.3f} {key}")
+        return 0
+
+    parser = argparse.ArgumentParser(prog="benchmarks")
+    parser.add_argument("names", nargs="*", default=list(BENCHMARKS), help="benchmarks to run, all by default")
+    parser.add_argument("-o", "--output", default=None, help="write json report to a file instead of stdout")
+    arguments = parser.parse_args(argv)
+    report = run_benchmarks(arguments.names)
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Measures `Context.copy` cost against test tree depth with a large fixture loaded at the root.
+
+Usage:
+```
+python -m benchmarks.bench_context
+```
+"""
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from urobor.commands.command import Context
+
+DEPTHS = (1, 10, 100, 1000)
+
+
+def create_fixture(size: int = 10_000) -> Dict[str, Any]:
+    return {f"item_{i}": {"id": i, "name": f"name {i}", "tags": ["a", "b", "c"]} for i in range(size)}
+
+
+def descend(context: Context, depth: int) -> Context:
+    for level in range(depth):
+        context = context.copy()
+        context[f"variable_{level % 10}"] = level
+
+    return context
+
+
+def measure(depth: int, fixture: Dict[str, Any]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    descend(Context({"fixture": fixture}), depth)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    descend(Context({"fixture": fixture}), depth)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "depth": depth,
+        "time_per_copy_us": elapsed / depth * 1_000_000,
+        "peak_memory_per_copy_bytes": peak / depth,
+    }
+
+
+def run() -> List[Dict[str, Any]]:
+    fixture = create_fixture()
+
+    return [measure(depth, fixture) for depth in DEPTHS]
+
+
+def main() -> None:
+    print(f"{'depth':>8} {'time/copy (us)':>16} {'peak mem/copy (B)':>18}")
+    for result in run():
+        print(
+            f"{result['depth']:>8} {result['time_per_copy_us']:>16.2f} {result['peak_memory_per_copy_bytes']:>18.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Compares pooled keep-alive requests with opening a new connection for every request, against the in-process
+stub server used by the test-suite.
+
+Usage:
+```
+python -m benchmarks.bench_http
+```
+"""
+import time
+from typing import Any, Dict, List
+
+from tests.fixtures.http_server import StubServer
+from urobor.http import ConnectionPool, Request
+
+REQUESTS = 1000
+
+
+def measure(url: str, pooled: bool) -> Dict[str, Any]:
+    pool = ConnectionPool()
+    started = time.perf_counter()
+    for index in range(REQUESTS):
+        if not pooled:
+            pool.close()
+        pool.send(Request("get", f"{url}/items/{index}"))
+    elapsed = time.perf_counter() - started
+    pool.close()
+
+    return {
+        "mode": "pooled" if pooled else "new connection",
+        "requests": REQUESTS,
+        "time_per_request_us": elapsed / REQUESTS * 1_000_000,
+    }
+
+
+def run() -> List[Dict[str, Any]]:
+    with StubServer() as server:
+        return [measure(server.url, False), measure(server.url, True)]
+
+
+def main() -> None:
+    print(f"{'mode':>16} {'time/request (us)':>18}")
+    for result in run():
+        print(f"{result['mode']:>16} {result['time_per_request_us']:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
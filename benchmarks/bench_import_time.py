@@ -0,0 +1,67 @@
+"""
+Measures cold start of the command line tool, every sample imports `urobor.cli` in a fresh interpreter.
+Slowest modules are taken from `python -X importtime` output.
+
+Usage:
+```
+python -m benchmarks.bench_import_time
+```
+"""
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+MODULE = "urobor.cli"
+SAMPLES = 10
+
+
+def measure_startup() -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {MODULE}"], check=True)
+
+    return time.perf_counter() - started
+
+
+def measure_baseline() -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+
+    return time.perf_counter() - started
+
+
+def slowest_imports(limit: int = 10) -> List[Tuple[str, int]]:
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULE}"], check=True, capture_output=True, text=True
+    ).stderr
+    imports = []
+    for line in output.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        imports.append((name.strip(), int(cumulative)))
+
+    return sorted(imports, key=lambda item: item[1], reverse=True)[:limit]
+
+
+def run() -> Dict[str, Any]:
+    baseline = statistics.median(measure_baseline() for _ in range(SAMPLES))
+    startup = statistics.median(measure_startup() for _ in range(SAMPLES))
+
+    return {
+        "module": MODULE,
+        "interpreter_ms": baseline * 1000,
+        "import_ms": (startup - baseline) * 1000,
+        "slowest_imports_us": dict(slowest_imports()),
+    }
+
+
+def main() -> None:
+    result = run()
+    print(f"interpreter start: {result['interpreter_ms']:.1f} ms")
+    print(f"import {result['module']}: {result['import_ms']:.1f} ms")
+    for name, cumulative in result["slowest_imports_us"].items():
+        print(f"{cumulative:>10} us  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Measures rendering of templates with variables, nested paths, filters and functions, both through
+`InterpolatedString.interpolate` and through a compiled template.
+
+Usage:
+```
+python -m benchmarks.bench_interpolation
+```
+"""
+import time
+from typing import Any, Dict, List
+
+import urobor.interpolation  # noqa: F401 registers built-in functions and filters
+from urobor.interpolation.interpolated_string import InterpolatedString
+
+ITERATIONS = 100_000
+VARIABLES = {
+    "name": "Bob Builder",
+    "config": {"url": "http://localhost:8080", "users": [{"id": 1, "name": "Alice"}]},
+}
+TEMPLATES = {
+    "constant": "plain text without placeholders",
+    "variable": "Hello {{ name }}!",
+    "nested_path": "{{ config.url }}/users/{{ config.users.0.id }}",
+    "filters": "{{ name | snakecase | uppercase }}",
+    "function": "id-{{ uuid() }}",
+    "mixed": "{{ config.url }}/{{ uuid() }}?at={{ datetime() }}&name={{ name | hyphens }}",
+}
+
+
+def measure(name: str, template: str) -> Dict[str, Any]:
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        InterpolatedString(template).interpolate(VARIABLES)
+    interpolated = time.perf_counter()
+
+    compiled = InterpolatedString.compile(template)
+    for _ in range(ITERATIONS):
+        compiled.render(VARIABLES)
+    rendered = time.perf_counter()
+
+    return {
+        "template": name,
+        "interpolate_us": (interpolated - started) / ITERATIONS * 1_000_000,
+        "render_compiled_us": (rendered - interpolated) / ITERATIONS * 1_000_000,
+    }
+
+
+def run() -> List[Dict[str, Any]]:
+    return [measure(name, template) for name, template in TEMPLATES.items()]
+
+
+def main() -> None:
+    print(f"{'template':>12} {'interpolate (us)':>17} {'compiled (us)':>14}")
+    for result in run():
+        print(f"{result['template']:>12} {result['interpolate_us']:>17.3f} {result['render_compiled_us']:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Measures parsing time of synthetic documents with growing number of sections, each holding commands with
+code blocks. Time per section should stay flat. `Parser` construction is measured on generated spec files
+with and without the parse cache.
+
+Usage:
+```
+python -m benchmarks.bench_parser
+```
+"""
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from markdown_it import MarkdownIt
+
+from benchmarks.generator import count_sections, write_spec
+from urobor.markdown.builder import TreeBuilder
+from urobor.markdown.cache import ParseCache
+from urobor.markdown.lexer import tokenize
+from urobor.markdown.parser import Parser
+
+SECTIONS = (1_000, 5_000, 10_000)
+TREES: Tuple[Tuple[int, int], ...] = ((2, 30), (3, 10), (4, 6))
+
+
+def create_document(sections: int) -> str:
+    parts = []
+    for index in range(sections):
+        parts.append(
+            f"{'#' * (index % 3 + 1)} Section {index}\n\n"
+            f"Description of section {index}.\n\n"
+            f"> set `variable_{index}` value {index}\n\n"
+            f"> post {{{{ base_url }}}}/items/{index}\n\n"
+            "```json\n"
+            f'{{"id": {index}, "name": "item {index}"}}\n'
+            "```\n\n"
+            "```headers\n"
+            "Accept: application/json\n"
+            "```\n\n"
+        )
+
+    return "".join(parts)
+
+
+def measure(sections: int) -> Dict[str, Any]:
+    document = create_document(sections)
+
+    started = time.perf_counter()
+    markdown_tokens = MarkdownIt().parse(document)
+    tokenized = time.perf_counter()
+    TreeBuilder().feed_all(tokenize(markdown_tokens))
+    built = time.perf_counter()
+
+    return {
+        "sections": sections,
+        "markdown_it_per_section_us": (tokenized - started) / sections * 1_000_000,
+        "urobor_per_section_us": (built - tokenized) / sections * 1_000_000,
+    }
+
+
+def measure_parser(depth: int, width: int) -> Dict[str, Any]:
+    sections = count_sections(depth, width)
+    with tempfile.TemporaryDirectory() as directory:
+        filename = write_spec(depth, width, directory=directory)
+        cache = ParseCache(os.path.join(directory, "cache"))
+
+        started = time.perf_counter()
+        Parser(filename)
+        parsed = time.perf_counter()
+        Parser(filename, cache=cache)
+        stored = time.perf_counter()
+        Parser(filename, cache=cache)
+        loaded = time.perf_counter()
+
+    return {
+        "depth": depth,
+        "width": width,
+        "sections": sections,
+        "parser_ms": (parsed - started) * 1000,
+        "parser_cache_store_ms": (stored - parsed) * 1000,
+        "parser_cache_hit_ms": (loaded - stored) * 1000,
+    }
+
+
+def run() -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        "documents": [measure(sections) for sections in SECTIONS],
+        "files": [measure_parser(depth, width) for depth, width in TREES],
+    }
+
+
+def main() -> None:
+    results = run()
+    print(f"{'sections':>10} {'markdown-it/section (us)':>26} {'urobor/section (us)':>21}")
+    for result in results["documents"]:
+        print(
+            f"{result['sections']:>10} {result['markdown_it_per_section_us']:>26.2f} "
+            f"{result['urobor_per_section_us']:>21.2f}"
+        )
+    print(f"{'depth':>6} {'width':>6} {'sections':>9} {'parser (ms)':>12} {'cache store (ms)':>17} {'cache hit (ms)':>15}")
+    for result in results["files"]:
+        print(
+            f"{result['depth']:>6} {result['width']:>6} {result['sections']:>9} {result['parser_ms']:>12.2f} "
+            f"{result['parser_cache_store_ms']:>17.2f} {result['parser_cache_hit_ms']:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
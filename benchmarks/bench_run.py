@@ -0,0 +1,61 @@
+"""
+Measures full `TestCase.run` of synthetic spec trees, sequentially and with a thread pool.
+
+Usage:
+```
+python -m benchmarks.bench_run
+```
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.generator import count_sections, write_spec
+from urobor.markdown.parser import Parser
+
+TREES: Tuple[Tuple[int, int], ...] = ((2, 30), (3, 10), (4, 6))
+JOBS = 4
+
+
+def measure(depth: int, width: int) -> Dict[str, Any]:
+    filename = write_spec(depth, width)
+    try:
+        sequential = Parser(filename).test
+        threaded = Parser(filename).test
+    finally:
+        os.remove(filename)
+    tests = count_sections(depth, width)
+
+    started = time.perf_counter()
+    sequential.run()
+    finished = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=JOBS) as executor:
+        threaded.run(executor=executor)
+    threaded_finished = time.perf_counter()
+
+    return {
+        "depth": depth,
+        "width": width,
+        "tests": tests,
+        "passed": bool(sequential) and bool(threaded),
+        "sequential_per_test_us": (finished - started) / tests * 1_000_000,
+        "threads_per_test_us": (threaded_finished - finished) / tests * 1_000_000,
+    }
+
+
+def run() -> List[Dict[str, Any]]:
+    return [measure(depth, width) for depth, width in TREES]
+
+
+def main() -> None:
+    print(f"{'depth':>6} {'width':>6} {'tests':>7} {'sequential/test (us)':>21} {'threads/test (us)':>18}")
+    for result in run():
+        print(
+            f"{result['depth']:>6} {result['width']:>6} {result['tests']:>7} "
+            f"{result['sequential_per_test_us']:>21.2f} {result['threads_per_test_us']:>18.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
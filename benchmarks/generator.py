@@ -0,0 +1,51 @@
+"""
+Synthetic spec files used by benchmarks. Every section sets a few variables through placeholders with filters and
+functions, and a json block referencing its parent's variables, so parsing, interpolation and context copies all
+take part when the spec runs. No command touches the network.
+"""
+import os
+import tempfile
+from typing import Iterator, List
+
+MAX_DEPTH = 6
+
+
+def create_spec(depth: int, width: int, commands: int = 3) -> str:
+    """
+    Returns spec with `width` sections on every level down to `depth` heading levels.
+    """
+    if not 1 <= depth <= MAX_DEPTH:
+        raise ValueError(f"Depth must be between `1` and `{MAX_DEPTH}`, `{depth}` given.")
+
+    return "".join(["> set base http://localhost:8080\n\n", *_sections(depth, width, commands, 1, "s")])
+
+
+def count_sections(depth: int, width: int) -> int:
+    return sum(width ** level for level in range(1, depth + 1))
+
+
+def write_spec(depth: int, width: int, commands: int = 3, directory: str = None) -> str:
+    descriptor, filename = tempfile.mkstemp(suffix=".md", dir=directory)
+    with os.fdopen(descriptor, "w") as spec_file:
+        spec_file.write(create_spec(depth, width, commands))
+
+    return filename
+
+
+def _sections(depth: int, width: int, commands: int, level: int, prefix: str) -> Iterator[str]:
+    for index in range(width):
+        name = f"{prefix}_{index}"
+        yield f"{'#' * level} Section {name}\n\nSynthetic section on level {level}.\n\n"
+        yield from _commands(name, commands)
+        if level < depth:
+            yield from _sections(depth, width, commands, level + 1, name)
+
+
+def _commands(name: str, commands: int) -> List[str]:
+    lines = [
+        f"> set url_{name} {{{{ base }}}}/{name}\n\n",
+        f"> set slug_{name} {{{{ uuid() }}}}-{{{{ url_{name} | snakecase | uppercase }}}}\n\n",
+        f"> set payload\n\n```json\n{{\"name\": \"{name}\", \"url\": \"{{{{ url_{name} }}}}\", \"tags\": [1, 2, 3]}}\n```\n\n",
+    ]
+
+    return [lines[index % len(lines)] for index in range(commands)]
@@ -0,0 +1,118 @@
+import pickle
+
+import pytest
+
+from urobor.commands import SetCommand, Argument
+from urobor.commands.command import BlockArgument, Context
+from urobor.commands.decoders import StreamedValue, stream_json
+
+
+def test_can_decode_yaml_block_once() -> None:
+    # given
+    argument = BlockArgument("address:\n  city: Berlin\n", "yaml")
+
+    # when
+    first = argument.parse(Context({}))
+    second = argument.parse(Context({}))
+
+    # then
+    assert first == {"address": {"city": "Berlin"}}
+    assert first is second
+
+
+def test_decoded_block_is_read_only() -> None:
+    # given
+    argument = BlockArgument('{"user": {"name": "Bob", "tags": ["admin"]}}', "json")
+    context = Context({})
+    SetCommand([Argument("payload"), argument]).execute(context)
+
+    # when
+    SetCommand([Argument("payload.user.name"), Argument("Alice")]).execute(context)
+
+    # then
+    assert context["payload"]["user"]["name"] == "Alice"
+    assert argument.decode() == {"user": {"name": "Bob", "tags": ("admin",)}}
+    with pytest.raises(TypeError):
+        argument.decode()["user"]["name"] = "Alice"
+
+
+def test_interpolates_block_before_decoding() -> None:
+    # given
+    argument = BlockArgument('{"name": "{{ name }}"}', "json")
+
+    # when
+    result = argument.parse(Context({"name": "Bob"}))
+
+    # then
+    assert result == {"name": "Bob"}
+
+
+def test_keeps_unknown_blocks_as_text() -> None:
+    # given
+    argument = BlockArgument("plain text", "text")
+
+    # then
+    assert argument.parse(Context({})) == "plain text"
+
+
+@pytest.mark.parametrize("content", [
+    '[{"id": 1}, {"id": 2} ,{"id": 3}]',
+    ' [\n  {"id": 1},\n  {"id": 2},\n  {"id": 3}\n]\n',
+])
+def test_can_stream_json_array(content: str) -> None:
+    # when
+    items = list(stream_json(content))
+
+    # then
+    assert items == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+
+def test_stream_json_fails_on_malformed_array() -> None:
+    # given
+    items = stream_json('[1, 2 3]')
+
+    # then
+    assert next(items) == 1
+    assert next(items) == 2
+    with pytest.raises(ValueError):
+        next(items)
+
+
+def test_can_stream_ndjson_block() -> None:
+    # given
+    argument = BlockArgument('{"id": 1}\n\n{"id": 2}\n', "ndjson", "stream")
+
+    # when
+    value = argument.parse(Context({}))
+
+    # then
+    assert isinstance(value, StreamedValue)
+    assert list(value) == [{"id": 1}, {"id": 2}]
+    assert list(value) == [{"id": 1}, {"id": 2}]
+
+
+def test_does_not_pickle_decoded_value() -> None:
+    # given
+    argument = BlockArgument('{"a": 1}', "json")
+    argument.decode()
+
+    # when
+    state = argument.__getstate__()
+    restored = pickle.loads(pickle.dumps(argument))
+
+    # then
+    assert "_decoded" not in state
+    assert restored.decode() == {"a": 1}
+
+
+def test_set_command_stores_decoded_block() -> None:
+    # given
+    context = Context({})
+    command = SetCommand([Argument("config"), BlockArgument("port: 8080\n", "yaml")])
+
+    # when
+    result = command.execute(context)
+
+    # then
+    assert result
+    assert context["config"] == {"port": 8080}
@@ -0,0 +1,162 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from urobor import TestCase
+from urobor.commands import Argument, BlockArgument, ExpectCommand, LoadCommand
+from urobor.commands.command import Context
+from urobor.commands.schema import ValidationError
+from urobor.http import Response
+from urobor.runner import Runner
+from urobor.test_case import Status
+
+SPEC = """
+# Users
+
+> set response.json.id 1
+
+> set response.json.name bob
+
+> expect response.json shape
+
+```yaml
+id: 1
+name: bob
+```
+
+## Invalid
+
+> expect response.json schema
+
+```json
+{"required": ["email"]}
+```
+"""
+
+
+@pytest.mark.parametrize("line_args, expected", [
+    ("response.json schema", ["response.json", "schema"]),
+    ("response.body  schema  stream", ["response.body", "schema", "stream"]),
+    ("user shape", ["user", "shape"]),
+])
+def test_can_parse_line_arguments(line_args: str, expected: list) -> None:
+    # when
+    args = ExpectCommand.parse_line_arguments(line_args)
+
+    # then
+    assert [arg.value for arg in args] == expected
+
+
+def test_passes_when_value_matches_schema() -> None:
+    # given
+    command = ExpectCommand([Argument("user"), Argument("schema"), BlockArgument('{"type": "object"}', "json")])
+
+    # when
+    result = command.execute(Context({"user": {"id": 1}}))
+
+    # then
+    assert result
+
+
+def test_fails_with_validation_errors() -> None:
+    # given
+    command = ExpectCommand([Argument("user"), Argument("shape"), BlockArgument("id: 1\nname: bob\n", "yaml")])
+
+    # when
+    result = command.execute(Context({"user": {"id": "1"}}))
+
+    # then
+    assert not result
+    assert isinstance(result.error.exception, ValidationError)
+    assert result.error.exception.errors == [
+        "`$`: missing required property `name`", "`$.id`: expected integer, got string"
+    ]
+
+
+def test_fails_when_variable_is_not_set() -> None:
+    # given
+    command = ExpectCommand([Argument("user"), Argument("schema"), BlockArgument("{}", "json")])
+
+    # then
+    with pytest.raises(KeyError):
+        command.execute(Context({}))
+
+
+def test_can_validate_response_body_as_stream() -> None:
+    # given
+    command = ExpectCommand([
+        Argument("response.body"), Argument("schema"), Argument("stream"),
+        BlockArgument('{"type": "array", "items": {"type": "integer"}}', "json"),
+    ])
+
+    # when
+    result = command.execute(Context({"response": {"body": "[1, 2, \"3\"]"}}))
+
+    # then
+    assert not result
+    assert result.error.exception.errors == ["`$[2]`: expected integer, got string"]
+
+
+def test_streams_http_response_body_without_decoding_it_whole(monkeypatch) -> None:
+    # given
+    body = b'[1, 2, "3"]'
+    decoded = []
+    loads = json.loads
+
+    def fail(*args) -> None:
+        raise AssertionError("Response body was decoded whole.")
+
+    def record(content, *args, **kwargs):
+        decoded.append(content)
+        return loads(content, *args, **kwargs)
+
+    monkeypatch.setattr(Response, "text", property(fail))
+    monkeypatch.setattr(Response, "json", fail)
+    monkeypatch.setattr(json, "loads", record)
+    response = Response(200, "OK", {"content-type": "application/json"}, body)
+    command = ExpectCommand([
+        Argument("response.body"), Argument("schema"), Argument("stream"),
+        BlockArgument('{"type": "array", "items": {"type": "integer"}}', "json"),
+    ])
+
+    # when
+    result = command.execute(Context({"response": response.to_dict()}))
+
+    # then
+    assert not result
+    assert result.error.exception.errors == ["`$[2]`: expected integer, got string"]
+    assert body not in decoded
+    assert body.decode() not in decoded
+
+
+def test_can_validate_streamed_fixture(tmp_path: Path) -> None:
+    # given
+    (tmp_path / "rows.json").write_text(json.dumps([{"id": index} for index in range(100)]))
+    test = TestCase("Rows")
+    test.commands.append(LoadCommand([Argument("rows"), Argument(str(tmp_path / "rows.json")), Argument("stream")]))
+    test.commands.append(ExpectCommand([
+        Argument("rows"), Argument("schema"), Argument("stream"),
+        BlockArgument('{"items": {"required": ["id"]}, "maxItems": 100}', "json"),
+    ]))
+
+    # when
+    test.run()
+
+    # then
+    assert test.status == Status.PASSED
+
+
+def test_runs_expectations_from_spec(tmp_path: Path) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    spec.write_text(SPEC)
+
+    # when
+    results = Runner().run([str(spec)])
+
+    # then
+    users = results[str(spec)].children[0]
+    assert users.commands[-1].id() == "expect"
+    assert [test.status for test in users.walk()] == [Status.FAILED, Status.FAILED]
+    assert users.status == Status.FAILED
@@ -0,0 +1,245 @@
+import asyncio
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Pattern, Tuple
+
+import pytest
+
+from urobor import TestCase
+from urobor.commands import Argument, BlockArgument, CommandCatalog, DEFAULT_CATALOG, ForeachCommand, SetCommand
+from urobor.commands.command import Command, Context, Error, Result
+from urobor.runner import Runner
+from urobor.test_case import Reporter, Status
+
+SPEC = """
+# Users
+
+> foreach user
+
+```ndjson
+{"name": "bob"}
+{"name": "alice"}
+{"email": "nobody@example.com"}
+```
+
+> set greeting hello {{ user.name }}
+
+> require {{ user.name }}
+
+## Profile
+
+> set profile {{ greeting }}
+"""
+
+
+class RequireCommand(Command):
+    def execute(self, context: Context) -> Result:
+        result = Result()
+        if not self.arguments[0].parse(context):
+            result.error = Error(ValueError("Missing value."))
+
+        return result
+
+    @classmethod
+    def id(cls) -> str:
+        return "require"
+
+    @classmethod
+    def line_arguments(cls) -> Pattern:
+        return re.compile(r"(.+)")
+
+
+class RecordingReporter(Reporter):
+    def __init__(self):
+        self.commands: List[Tuple[Tuple[str, ...], str, bool]] = []
+
+    def command_finished(self, test: TestCase, command: Command, result: Result, duration: float) -> None:
+        self.commands.append((tuple(test.path), command.id(), bool(result)))
+
+
+@pytest.mark.parametrize("line_args, expected", [
+    ("user", ["user"]),
+    ("user ./fixtures/users.csv", ["user", "./fixtures/users.csv"]),
+    ("user {{ dir }}/users.ndjson   concurrently ", ["user", "{{ dir }}/users.ndjson", "concurrently"]),
+])
+def test_can_parse_line_arguments(line_args: str, expected: list) -> None:
+    # when
+    args = ForeachCommand.parse_line_arguments(line_args)
+
+    # then
+    assert [arg.value for arg in args] == expected
+
+
+def test_can_read_rows_from_csv_block() -> None:
+    # given
+    command = ForeachCommand([Argument("user"), BlockArgument("name,age\nbob,31\nalice,27\n", "csv")])
+
+    # when
+    rows = command.rows(Context({}))
+
+    # then
+    assert rows == [{"name": "bob", "age": "31"}, {"name": "alice", "age": "27"}]
+
+
+def test_can_read_rows_from_file(tmp_path: Path) -> None:
+    # given
+    (tmp_path / "users.csv").write_text("name,age\nbob,31\n")
+    command = ForeachCommand([Argument("user"), Argument("{{ dir }}/users.csv"), Argument("concurrently")])
+
+    # when
+    rows = command.rows(Context({"dir": str(tmp_path)}))
+
+    # then
+    assert rows == [{"name": "bob", "age": "31"}]
+    assert command.concurrent
+
+
+def test_rejects_rows_which_are_not_a_list() -> None:
+    # given
+    command = ForeachCommand([Argument("user"), BlockArgument('{"name": "bob"}', "json")])
+
+    # then
+    with pytest.raises(ValueError):
+        command.rows(Context({}))
+
+
+def create_tree(concurrently: bool = False) -> TestCase:
+    root = TestCase("Root", level=0)
+    arguments = [Argument("user"), BlockArgument('[{"name": "bob"}, {"name": "alice"}, {}]', "json")]
+    if concurrently:
+        arguments.append(Argument("concurrently"))
+    root.commands.append(ForeachCommand(arguments))
+    root.commands.append(SetCommand([Argument("greeting"), Argument("hello {{ user.name }}")]))
+    root.commands.append(RequireCommand([Argument("{{ user.name }}")]))
+    child = TestCase("Profile", level=1, parent=root)
+    child.commands.append(SetCommand([Argument("profile"), Argument("{{ greeting }}")]))
+    root.children.append(child)
+
+    return root
+
+
+def test_runs_commands_and_children_for_every_row() -> None:
+    # given
+    root = create_tree()
+    template = root.children
+
+    # when
+    root.run()
+
+    # then
+    assert [test.name for test in root.children] == ["#1", "#2", "#3"]
+    assert [test.status for test in root.children] == [Status.PASSED, Status.PASSED, Status.FAILED]
+    assert [test.children[0].name for test in root.children] == ["Profile"] * 3
+    assert root.template is template
+    assert root.status == Status.FAILED
+
+
+def test_rows_share_parsed_commands() -> None:
+    # given
+    root = create_tree()
+
+    # when
+    root.run()
+
+    # then
+    first, second, _ = root.children
+    assert first.commands is second.commands
+    assert first.commands[0] is root.commands[1]
+    assert first.children[0].commands is root.template[0].commands
+
+
+def test_rows_get_own_context() -> None:
+    # given
+    root = create_tree()
+    context = Context({})
+    values = []
+
+    class CaptureCommand(SetCommand):
+        def execute(self, context: Context) -> Result:
+            values.append(context["greeting"])
+            return super().execute(context)
+
+    root.template = None
+    root.children[0].commands.append(CaptureCommand([Argument("greeting"), Argument("changed")]))
+
+    # when
+    root.run(context)
+
+    # then
+    assert values == ["hello bob", "hello alice", "hello "]
+    assert "user" not in context
+
+
+def test_can_run_rows_concurrently() -> None:
+    # given
+    root = create_tree(concurrently=True)
+    reporter = RecordingReporter()
+
+    # when
+    root.run(reporter=reporter)
+
+    # then
+    assert [test.status for test in root.children] == [Status.PASSED, Status.PASSED, Status.FAILED]
+    assert reporter.commands == [
+        ((), "foreach", True),
+        (("#1",), "set", True),
+        (("#1",), "require", True),
+        (("#1", "Profile"), "set", True),
+        (("#2",), "set", True),
+        (("#2",), "require", True),
+        (("#2", "Profile"), "set", True),
+        (("#3",), "set", True),
+        (("#3",), "require", False),
+        (("#3", "Profile"), "set", True),
+    ]
+
+
+@pytest.mark.parametrize("executor_type", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_can_run_rows_on_executor(executor_type: type) -> None:
+    # given
+    root = TestCase("Root", level=0)
+    root.children.append(create_tree())
+    root.children[0].parent = root
+    root.children[0].name = "Users"
+    root.children[0].level = 1
+    reporter = RecordingReporter()
+
+    # when
+    with executor_type(max_workers=2) as executor:
+        root.run(executor=executor, reporter=reporter)
+
+    # then
+    users = root.children[0]
+    assert [test.status for test in users.children] == [Status.PASSED, Status.PASSED, Status.FAILED]
+    assert reporter.commands[0] == (("Users",), "foreach", True)
+    assert reporter.commands[-2:] == [(("Users", "#3"), "require", False), (("Users", "#3", "Profile"), "set", True)]
+
+
+def test_can_run_rows_async() -> None:
+    # given
+    root = create_tree()
+
+    # when
+    asyncio.run(root.run_async(concurrency=2))
+
+    # then
+    assert [test.status for test in root.children] == [Status.PASSED, Status.PASSED, Status.FAILED]
+
+
+def test_runner_expands_spec_rows(tmp_path: Path) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    spec.write_text(SPEC)
+    catalog = CommandCatalog()
+    for command in DEFAULT_CATALOG:
+        catalog.add(command)
+    catalog.add(RequireCommand)
+
+    # when
+    results = Runner(jobs=2, catalog=catalog, cache=None).run([str(spec)])
+
+    # then
+    users = results[str(spec)].children[0]
+    assert [test.path for test in users.children] == [["Users", "#1"], ["Users", "#2"], ["Users", "#3"]]
+    assert [test.status for test in users.children] == [Status.PASSED, Status.PASSED, Status.FAILED]
@@ -0,0 +1,119 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from urobor import TestCase
+from urobor.commands import Argument, BlockArgument, GetCommand, PostCommand
+from urobor.commands.command import Context
+from urobor.http import ConnectionPool
+
+
+def test_can_send_get_request(http_server, transport) -> None:
+    # given
+    transport(ConnectionPool())
+    command = GetCommand([Argument("{{ base_url }}/users?page=2")])
+    context = Context({"base_url": http_server.url})
+
+    # when
+    result = command.execute(context)
+
+    # then
+    assert result
+    assert context["response"]["status"] == 200
+    assert context["response"]["json"]["method"] == "GET"
+    assert context["response"]["json"]["path"] == "/users?page=2"
+
+
+def test_can_send_post_request_with_body_and_headers(http_server, transport) -> None:
+    # given
+    transport(ConnectionPool())
+    command = PostCommand([
+        Argument(f"{http_server.url}/users"),
+        Argument("created"),
+        BlockArgument('{"name": "{{ name }}"}', "json"),
+        BlockArgument("X-Request-Id: {{ request_id }}", "headers"),
+    ])
+    context = Context({"name": "Bob", "request_id": "abc"})
+
+    # when
+    result = command.execute(context)
+
+    # then
+    assert result
+    echo = context["created"]["json"]
+    assert echo["body"] == '{"name": "Bob"}'
+    assert echo["headers"]["content-type"] == "application/json"
+    assert echo["headers"]["x-request-id"] == "abc"
+
+
+def test_stores_response_under_dotted_target(http_server, transport) -> None:
+    # given
+    transport(ConnectionPool())
+    command = GetCommand(GetCommand.parse_line_arguments(f"{http_server.url}/users > result.user"))
+    context = Context({"result": {"id": 1}})
+
+    # when
+    result = command.execute(context)
+    rendered = Argument("{{ result.user.status }} {{ result.id }}").interpolate(context)
+
+    # then
+    assert result
+    assert rendered == "200 1"
+    assert "result.user" not in context
+
+
+def test_can_parse_line_arguments() -> None:
+    # when
+    args = GetCommand.parse_line_arguments("{{ base_url }}/users > users")
+
+    # then
+    assert [arg.value for arg in args] == ["{{ base_url }}/users", "users"]
+
+
+def test_fails_on_connection_error(transport) -> None:
+    # given
+    transport(ConnectionPool(timeout=1))
+    command = GetCommand([Argument("http://127.0.0.1:1/")])
+
+    # when
+    result = command.execute(Context({}))
+
+    # then
+    assert not result
+    assert isinstance(result.error.exception, OSError)
+
+
+def test_reuses_connections_across_tests(http_server, transport) -> None:
+    # given
+    pool = transport(ConnectionPool(max_size=2))
+    root = TestCase("Root", level=0)
+    for index in range(20):
+        child = TestCase(f"Request {index}", level=1, parent=root)
+        child.commands.append(GetCommand([Argument(f"{http_server.url}/items/{index}")]))
+        root.children.append(child)
+
+    # when
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        root.run(executor=executor)
+
+    # then
+    assert root
+    assert http_server.requests == 20
+    assert http_server.connections <= 2
+    assert pool.created + pool.reused == 20
+
+
+def test_can_send_requests_asynchronously(http_server, transport) -> None:
+    # given
+    transport(ConnectionPool())
+    root = TestCase("Root", level=0)
+    for index in range(5):
+        child = TestCase(f"Request {index}", level=1, parent=root)
+        child.commands.append(GetCommand([Argument(f"{http_server.url}/items/{index}")]))
+        root.children.append(child)
+
+    # when
+    asyncio.run(root.run_async(concurrency=2))
+
+    # then
+    assert root
+    assert http_server.requests == 5
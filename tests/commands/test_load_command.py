@@ -0,0 +1,179 @@
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from urobor import TestCase
+from urobor.commands import Argument, LoadCommand, SetCommand, decoders
+from urobor.commands.command import Context
+from urobor.commands.decoders import iter_json_array, iter_json_object
+from urobor.commands.fixtures import FrozenDict, FrozenList, load_fixture
+
+
+@pytest.mark.parametrize("line_args, expected", [
+    ("payload ./fixtures/big.json", ["payload", "./fixtures/big.json"]),
+    ("rows   {{ dir }}/rows.ndjson   stream ", ["rows", "{{ dir }}/rows.ndjson", "stream"]),
+])
+def test_can_parse_line_arguments(line_args: str, expected: list) -> None:
+    # when
+    args = LoadCommand.parse_line_arguments(line_args)
+
+    # then
+    assert [arg.value for arg in args] == expected
+
+
+def test_can_load_json_file(tmp_path: Path) -> None:
+    # given
+    (tmp_path / "payload.json").write_text(json.dumps({"users": [{"name": "Bob"}], "total": 1}))
+    command = LoadCommand([Argument("payload"), Argument("{{ dir }}/payload.json")])
+    context = Context({"dir": str(tmp_path)})
+
+    # when
+    result = command.execute(context)
+
+    # then
+    assert result
+    payload = context["payload"]
+    assert isinstance(payload, FrozenDict)
+    assert isinstance(payload["users"], FrozenList)
+    assert payload == {"users": ({"name": "Bob"},), "total": 1}
+
+
+def test_shares_loaded_value_between_tests(tmp_path: Path) -> None:
+    # given
+    (tmp_path / "payload.json").write_text('{"a": {"b": 1}}')
+    root = TestCase("Root", level=0)
+    root.commands.append(LoadCommand([Argument("payload"), Argument(str(tmp_path / "payload.json"))]))
+    values = []
+
+    class CaptureCommand(SetCommand):
+        def execute(self, context: Context):
+            values.append(context["payload"])
+            return super().execute(context)
+
+    for name in ("first", "second"):
+        child = TestCase(name, parent=root)
+        child.commands.append(CaptureCommand([Argument("payload.a.b"), Argument("2")]))
+        root.children.append(child)
+
+    # when
+    root.run()
+
+    # then
+    assert root
+    assert values[0] is values[1]
+    assert values[0] == {"a": {"b": 1}}
+
+
+def test_can_load_top_level_array_and_ndjson(tmp_path: Path) -> None:
+    # given
+    (tmp_path / "items.json").write_text(" [1, [2, 3], {\"a\": []}] ")
+    (tmp_path / "rows.ndjson").write_text('{"id": 1}\n\n{"id": 2}\n')
+
+    # then
+    assert load_fixture(str(tmp_path / "items.json")) == (1, (2, 3), {"a": ()})
+    assert load_fixture(str(tmp_path / "rows.ndjson")) == ({"id": 1}, {"id": 2})
+
+
+def test_can_stream_fixture(tmp_path: Path) -> None:
+    # given
+    (tmp_path / "rows.json").write_text(json.dumps([{"id": index} for index in range(100)]))
+
+    # when
+    rows = load_fixture(str(tmp_path / "rows.json"), stream=True)
+
+    # then
+    assert [row["id"] for row in rows] == list(range(100))
+    assert len(list(rows)) == 100
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1024])
+def test_iter_json_array_handles_chunk_boundaries(chunk_size: int) -> None:
+    # given
+    items = [12345, "zażółć", {"nested": [1.5, None, True]}, [], "a,]b"]
+    buffer = json.dumps(items, ensure_ascii=False).encode()
+
+    # when
+    result = list(iter_json_array(buffer, chunk_size=chunk_size))
+
+    # then
+    assert result == items
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1024])
+def test_iter_json_object_handles_chunk_boundaries(chunk_size: int) -> None:
+    # given
+    value = {"id": 12345, "name": "zażółć", "a,}b": {"nested": [1.5, None, True]}, "empty": {}, "": []}
+    buffer = json.dumps(value, ensure_ascii=False, indent=2).encode()
+
+    # when
+    result = dict(iter_json_object(buffer, chunk_size=chunk_size))
+
+    # then
+    assert result == value
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 24))
+def test_keeps_numbers_strings_and_escapes_cut_by_chunk_boundary(monkeypatch, chunk_size: int) -> None:
+    # given
+    monkeypatch.setattr(decoders, "CHUNK_SIZE", chunk_size)
+    array = r'[12.5, -0.25e+10, 1E-3, 100, 7, "zażółć \u0041\n", {"value": 3.0e2}, true, null]'.encode()
+    members = r'{"price": 12.5, "rate": -0.25e+10, "text": "\u00e9 ż", "count": 100}'.encode()
+
+    # when
+    decoded_array = list(iter_json_array(array))
+    decoded_object = dict(iter_json_object(members))
+
+    # then
+    assert decoded_array == json.loads(array)
+    assert decoded_object == json.loads(members)
+
+
+@pytest.mark.parametrize("content", ['{"a": 1,}', '{"a" 1}', '{1: 2}', '{"a": 1'])
+def test_iter_json_object_rejects_malformed_objects(content: str) -> None:
+    # then
+    with pytest.raises(ValueError):
+        dict(iter_json_object(content.encode()))
+
+
+def test_can_load_yaml_file(tmp_path: Path) -> None:
+    # given
+    (tmp_path / "user.yaml").write_text("name: Bob\ntags:\n  - admin\n")
+
+    # when
+    user = load_fixture(str(tmp_path / "user.yaml"))
+
+    # then
+    assert isinstance(user, FrozenDict)
+    assert user == {"name": "Bob", "tags": ("admin",)}
+    assert pickle.loads(pickle.dumps(user)) is user
+
+
+def test_reloads_changed_file(tmp_path: Path) -> None:
+    # given
+    filename = tmp_path / "data.yaml"
+    filename.write_text("value: 1\n")
+    first = load_fixture(str(filename))
+
+    # when
+    filename.write_text("value: 22\n")
+    second = load_fixture(str(filename))
+
+    # then
+    assert first == {"value": 1}
+    assert second == {"value": 22}
+    assert load_fixture(str(filename)) is second
+
+
+def test_pickles_loaded_value_as_reference(tmp_path: Path) -> None:
+    # given
+    (tmp_path / "payload.json").write_text('{"a": ' + json.dumps(list(range(1000))) + "}")
+    value = load_fixture(str(tmp_path / "payload.json"))
+
+    # when
+    data = pickle.dumps(value)
+
+    # then
+    assert len(data) < 500
+    assert pickle.loads(data) is value
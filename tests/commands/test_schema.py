@@ -0,0 +1,174 @@
+import pickle
+from typing import Any
+
+import pytest
+
+from urobor.commands.schema import ValidationError, Validator, compile_validator, shape_to_schema
+
+USER_SCHEMA = {
+    "type": "object",
+    "required": ["id", "name"],
+    "additionalProperties": False,
+    "properties": {
+        "id": {"type": "integer", "minimum": 1},
+        "name": {"type": "string", "minLength": 1, "pattern": "^[a-z]+$"},
+        "role": {"enum": ["admin", "user"]},
+        "tags": {"type": "array", "items": {"type": "string"}, "maxItems": 2},
+    },
+}
+
+
+@pytest.mark.parametrize("value", [
+    {"id": 1, "name": "bob"},
+    {"id": 2.0, "name": "alice", "role": "admin", "tags": ["a", "b"]},
+])
+def test_accepts_valid_values(value: Any) -> None:
+    # given
+    validator = Validator(USER_SCHEMA)
+
+    # then
+    assert validator.validate(value) == []
+
+
+@pytest.mark.parametrize("value, expected", [
+    ([], ["`$`: expected object, got array"]),
+    ({"id": True, "name": "bob"}, ["`$.id`: expected integer, got boolean"]),
+    ({"id": 0, "name": "Bob"}, ["`$.id`: expected at least 1, got 0", "`$.name`: 'Bob' does not match `^[a-z]+$`"]),
+    ({"name": "bob", "extra": 1}, ["`$`: missing required property `id`", "`$`: unexpected property `extra`"]),
+    ({"id": 1, "name": "bob", "role": "owner"}, ["`$.role`: expected one of ['admin', 'user'], got 'owner'"]),
+    ({"id": 1, "name": "bob", "tags": ["a", 1, "c"]}, [
+        "`$.tags[1]`: expected string, got integer", "`$.tags`: expected at most 2, got 3"
+    ]),
+])
+def test_reports_errors_with_paths(value: Any, expected: list) -> None:
+    # given
+    validator = Validator(USER_SCHEMA)
+
+    # then
+    assert validator.validate(value) == expected
+
+
+def test_supports_combinators_and_references() -> None:
+    # given
+    validator = Validator({
+        "definitions": {"node": {
+            "type": "object",
+            "properties": {"value": {"type": "integer"}, "children": {"type": "array", "items": {"$ref": "#/definitions/node"}}},
+        }},
+        "allOf": [{"$ref": "#/definitions/node"}],
+        "anyOf": [{"required": ["value"]}, {"required": ["children"]}],
+        "not": {"required": ["deleted"]},
+    })
+
+    # then
+    assert validator.validate({"value": 1, "children": [{"value": 2, "children": []}]}) == []
+    assert validator.validate({"children": [{"value": "x"}]}) == ["`$.children[0].value`: expected integer, got string"]
+    assert validator.validate({"deleted": True}) == [
+        "`$`: value does not match any of `anyOf` schemas", "`$`: value must not match `not` schema"
+    ]
+
+
+def test_rejects_unsupported_keywords() -> None:
+    # then
+    with pytest.raises(ValueError):
+        Validator({"type": "object", "unevaluatedProperties": False})
+
+
+def test_converts_shape_to_schema() -> None:
+    # when
+    schema = shape_to_schema({"id": 1, "name": "bob", "tags": ["admin"], "extra": None})
+
+    # then
+    validator = Validator(schema)
+    assert validator.validate({"id": 2, "name": "alice", "tags": [], "extra": [1], "other": 1}) == []
+    assert validator.validate({"id": "2", "name": "alice", "tags": [1]}) == [
+        "`$`: missing required property `extra`",
+        "`$.id`: expected integer, got string",
+        "`$.tags[0]`: expected string, got integer",
+    ]
+
+
+def test_validates_streamed_items() -> None:
+    # given
+    validator = Validator({"type": "array", "minItems": 3, "items": {"type": "object", "required": ["id"]}})
+    produced = []
+
+    def items():
+        for index in range(2):
+            produced.append(index)
+            yield {"id": index} if index == 0 else {}
+
+    # when
+    errors = validator.validate_stream(items())
+
+    # then
+    assert produced == [0, 1]
+    assert errors == ["`$[1]`: missing required property `id`", "`$`: expected at least 3 items, got 2"]
+
+
+def test_streaming_requires_array_schema() -> None:
+    # then
+    with pytest.raises(ValueError):
+        Validator({"type": "object"}).validate_stream([])
+
+
+def test_caches_compiled_validators() -> None:
+    # when
+    first = compile_validator('{"type": "string"}', "json", "schema")
+    second = compile_validator('{"type": "string"}', "json", "schema")
+
+    # then
+    assert first is second
+    assert compile_validator('{"type": "string"}', "json", "shape") is not first
+
+
+def test_validation_error_survives_pickling() -> None:
+    # given
+    error = ValidationError(["`$.id`: expected integer, got string", "`$`: missing required property `name`"])
+
+    # when
+    restored = pickle.loads(pickle.dumps(error))
+
+    # then
+    assert restored.errors == error.errors
+    assert str(restored) == str(error)
+
+
+@pytest.mark.parametrize("schema, valid, invalid, expected", [
+    ({"uniqueItems": True}, [1, True, "1", [1], {"a": 1}], [1, [2], 1.0], "`$`: item 2 is not unique"),
+    ({"minProperties": 1, "maxProperties": 2}, {"a": 1}, {}, "`$`: expected at least 1 properties, got 0"),
+    ({"multipleOf": 0.1}, 0.3, 0.35, "`$`: expected multiple of 0.1, got 0.35"),
+    ({"multipleOf": 3}, 9, 10, "`$`: expected multiple of 3, got 10"),
+    (
+        {"if": {"properties": {"kind": {"const": "user"}}}, "then": {"required": ["name"]}, "else": {"required": ["id"]}},
+        {"kind": "user", "name": "bob"}, {"kind": "group"}, "`$`: missing required property `id`",
+    ),
+    (
+        {"patternProperties": {"^x-": {"type": "string"}}, "properties": {"id": {}}, "additionalProperties": False},
+        {"id": 1, "x-trace": "abc"}, {"id": 1, "x-trace": 1}, "`$.x-trace`: expected string, got integer",
+    ),
+    ({"type": "string", "nullable": True}, None, 1, "`$`: expected string, got integer"),
+    ({"minimum": 1, "exclusiveMinimum": True}, 2, 1, "`$`: expected more than 1, got 1"),
+    ({"maximum": 1, "exclusiveMaximum": False}, 1, 2, "`$`: expected at most 1, got 2"),
+    ({"exclusiveMaximum": 1}, 0.5, 1, "`$`: expected less than 1, got 1"),
+    ({"contains": {"type": "string"}}, [1, "a"], [1, 2], "`$`: 0 items match `contains` schema"),
+    ({"items": [{"type": "integer"}], "additionalItems": False}, [1], [1, 2], "`$`: expected at most 1 items, got 2"),
+    ({"prefixItems": [{"type": "integer"}], "items": {"type": "string"}}, [1, "a"], [1, 2], "`$[1]`: expected string, got integer"),
+    ({"propertyNames": {"pattern": "^[a-z]+$"}}, {"id": 1}, {"Id": 1}, "`$.Id`: 'Id' does not match `^[a-z]+$`"),
+    ({"dependencies": {"card": ["billing"]}}, {"card": 1, "billing": 2}, {"card": 1}, "`$`: property `card` requires property `billing`"),
+])
+def test_supports_keyword(schema: dict, valid: Any, invalid: Any, expected: str) -> None:
+    # given
+    validator = Validator(schema)
+
+    # then
+    assert validator.validate(valid) == []
+    assert validator.validate(invalid) == [expected]
+
+
+def test_ignores_openapi_annotations() -> None:
+    # given
+    validator = Validator({"type": "string", "readOnly": True, "example": "bob", "deprecated": True})
+
+    # then
+    assert validator.validate("alice") == []
@@ -94,3 +94,18 @@ def test_can_set_variables_from_yaml() -> None:
     assert context["variable_0"] == 10
     assert context["variable_1"] == "is 10"
     assert context["variable_2"] == "this is 10"
+
+
+def test_can_set_nested_variables() -> None:
+    # given
+    test_case = TestCase("Example test")
+    test_case.commands.append(SetCommand([Argument("config.url"), Argument("http://localhost")]))
+    test_case.commands.append(SetCommand([Argument("config.new_url"), Argument("{{ config.url }}/v2")]))
+    context = Context({})
+
+    # when
+    test_case.run(context)
+
+    # then
+    assert test_case
+    assert context["config"] == {"url": "http://localhost", "new_url": "http://localhost/v2"}
@@ -0,0 +1,85 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterator
+
+from pytest import fixture
+
+from urobor.http import Transport, set_transport
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _echo(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+        with self.server.lock:
+            self.server.requests += 1
+        payload = json.dumps({
+            "method": self.command,
+            "path": self.path,
+            "headers": {name.lower(): value for name, value in self.headers.items()},
+            "body": body,
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _echo
+
+    def log_message(self, *args) -> None:
+        ...
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    In-process keep-alive http server echoing received requests back as json.
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _EchoHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+@fixture()
+def http_server() -> Iterator[StubServer]:
+    with StubServer() as server:
+        yield server
+
+
+@fixture()
+def transport() -> Iterator[Callable[[Transport], Transport]]:
+    """
+    Returns a function installing the transport used by http commands, the default one is restored after the test.
+    """
+    def install(value: Transport) -> Transport:
+        set_transport(value)
+        return value
+
+    yield install
+    set_transport(None)
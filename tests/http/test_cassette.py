@@ -0,0 +1,90 @@
+import json
+import time
+
+import pytest
+
+from urobor.http import Cassette, ConnectionPool, Request
+
+
+def test_records_and_replays_responses(http_server, tmp_path) -> None:
+    # given
+    filename = str(tmp_path / "cassette.jsonl")
+    recorder = Cassette(filename, mode="record")
+    request = Request("post", f"{http_server.url}/users", {"Content-Type": "application/json"}, b'{"a": 1}')
+
+    # when
+    recorded = recorder.send(request)
+    recorder.close()
+    requests_sent = http_server.requests
+    player = Cassette(filename, mode="replay")
+    replayed = player.send(Request("POST", f"{http_server.url}/users", {"content-type": "application/json"}, b'{ "a":1 }'))
+
+    # then
+    assert http_server.requests == requests_sent
+    assert replayed.status == recorded.status == 200
+    assert replayed.body == recorded.body
+    assert replayed.headers == recorded.headers
+    assert player.hits == 1
+
+
+def test_replay_fails_on_unknown_request(tmp_path) -> None:
+    # given
+    cassette = Cassette(str(tmp_path / "cassette.jsonl"), mode="replay")
+
+    # then
+    with pytest.raises(KeyError):
+        cassette.send(Request("get", "http://localhost/users"))
+
+
+@pytest.mark.parametrize("first, second", [
+    (Request("get", "http://Example.com:80/users?b=2&a=1"), Request("GET", "http://example.com/users?a=1&b=2")),
+    (Request("get", "http://example.com", {"User-Agent": "a", "X-Id": "1"}), Request("get", "http://example.com/", {"X-Id": " 1"})),
+])
+def test_normalizes_requests(first: Request, second: Request) -> None:
+    # given
+    cassette = Cassette("unused.jsonl")
+
+    # then
+    assert cassette.key(first) == cassette.key(second)
+
+
+@pytest.mark.parametrize("first, second", [
+    (Request("get", "http://example.com/users"), Request("delete", "http://example.com/users")),
+    (Request("get", "http://example.com", {"X-Id": "1"}), Request("get", "http://example.com", {"X-Id": "2"})),
+    (Request("post", "http://example.com", body=b"a"), Request("post", "http://example.com", body=b"b")),
+])
+def test_distinguishes_requests(first: Request, second: Request) -> None:
+    # given
+    cassette = Cassette("unused.jsonl")
+
+    # then
+    assert cassette.key(first) != cassette.key(second)
+
+
+def test_refreshes_only_stale_entries(http_server, tmp_path) -> None:
+    # given
+    filename = tmp_path / "cassette.jsonl"
+    cassette = Cassette(str(filename), mode="record")
+    cassette.send(Request("get", f"{http_server.url}/fresh"))
+    cassette.send(Request("get", f"{http_server.url}/stale"))
+    cassette.close()
+    entries = [json.loads(line) for line in filename.read_text().splitlines()]
+    entries[1]["recorded_at"] = time.time() - 3600
+    filename.write_text("".join(json.dumps(entry) + "\n" for entry in entries))
+    requests_sent = http_server.requests
+
+    # when
+    cassette = Cassette(str(filename), mode="refresh", max_age=60, transport=lambda: ConnectionPool(max_size=1))
+    cassette.send(Request("get", f"{http_server.url}/fresh"))
+    cassette.send(Request("get", f"{http_server.url}/stale"))
+    cassette.close()
+
+    # then
+    assert http_server.requests == requests_sent + 1
+    assert (cassette.hits, cassette.misses) == (1, 1)
+    assert len(filename.read_text().splitlines()) == 2
+
+
+def test_fails_on_unknown_mode() -> None:
+    with pytest.raises(ValueError):
+        Cassette("cassette.jsonl", mode="other")
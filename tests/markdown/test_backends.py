@@ -0,0 +1,48 @@
+import pytest
+
+from urobor.markdown.backends import MarkdownItBackend, MistuneBackend, get_backend
+from urobor.markdown.builder import TreeBuilder
+
+SPEC = """> set base http://localhost
+
+# Section
+
+> set `config.address`
+
+```yaml
+city: New York
+```
+
+## Nested
+# Other
+"""
+
+
+def test_can_get_default_backend() -> None:
+    # then
+    assert isinstance(get_backend(), MarkdownItBackend)
+
+
+def test_fail_get_unknown_backend() -> None:
+    # then
+    with pytest.raises(KeyError):
+        get_backend("unknown")
+
+
+def test_backends_produce_same_tree() -> None:
+    # given
+    pytest.importorskip("mistune")
+
+    # when
+    markdown_it_tree = TreeBuilder().feed_all(MarkdownItBackend().tokenize(SPEC))
+    mistune_tree = TreeBuilder().feed_all(MistuneBackend().tokenize(SPEC))
+
+    # then
+    def describe(tree):
+        return [
+            (test.name, test.level, [repr(command) for command in test.commands],
+             [argument.value for command in test.commands for argument in command.arguments])
+            for test in tree.walk()
+        ]
+
+    assert describe(markdown_it_tree) == describe(mistune_tree)
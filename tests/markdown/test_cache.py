@@ -0,0 +1,54 @@
+from os import path
+
+from urobor.commands.catalog import CommandCatalog
+from urobor.commands import SetCommand
+from urobor.markdown import Parser
+from urobor.markdown.backends import MarkdownItBackend
+from urobor.markdown.cache import ParseCache
+
+
+def test_can_load_parsed_tree_from_cache(examples_dir: str, tmp_path, monkeypatch) -> None:
+    # given
+    cache = ParseCache(str(tmp_path))
+    filename = path.join(examples_dir, "variables.md")
+    parsed = Parser(filename, cache=cache).test
+
+    # when
+    monkeypatch.setattr(MarkdownItBackend, "tokenize", None)
+    cached = Parser(filename, cache=cache).test
+
+    # then
+    assert [test.name for test in cached.walk()] == [test.name for test in parsed.walk()]
+    assert [repr(command) for test in cached.walk() for command in test.commands] == [
+        repr(command) for test in parsed.walk() for command in test.commands
+    ]
+    assert cached.children[0].children[0].parent is cached.children[0]
+
+
+def test_cache_key_changes_with_contents_and_catalog() -> None:
+    # given
+    cache = ParseCache()
+    catalog = CommandCatalog()
+    catalog.add(SetCommand)
+    other_catalog = CommandCatalog()
+
+    # then
+    assert cache.key(b"# Test", catalog) == cache.key(b"# Test", catalog)
+    assert cache.key(b"# Test", catalog) != cache.key(b"# Other test", catalog)
+    assert cache.key(b"# Test", catalog) != cache.key(b"# Test", other_catalog)
+    assert cache.key(b"# Test", catalog) != cache.key(b"# Test", catalog, "mistune")
+
+
+def test_changed_file_is_parsed_again(tmp_path) -> None:
+    # given
+    cache = ParseCache(str(tmp_path / "cache"))
+    spec = tmp_path / "spec.md"
+    spec.write_text("# First\n")
+    Parser(str(spec), cache=cache)
+
+    # when
+    spec.write_text("# Second\n")
+    test = Parser(str(spec), cache=cache).test
+
+    # then
+    assert test.children[0].name == "Second"
@@ -0,0 +1,51 @@
+from markdown_it import MarkdownIt
+
+from urobor.markdown import TokenType
+from urobor.markdown.lexer import tokenize
+
+SPEC = """# Section
+
+Description
+
+> set `config.url` http://localhost
+
+```json extra
+{"a": 1}
+```
+
+## Nested
+# Other
+"""
+
+
+def test_can_tokenize_sections_and_commands() -> None:
+    # when
+    tokens = list(tokenize(MarkdownIt().parse(SPEC)))
+
+    # then
+    assert [token.type for token in tokens] == [
+        TokenType.SECTION_START,
+        TokenType.SECTION_NAME,
+        TokenType.SECTION_DESCRIPTION,
+        TokenType.COMMAND_START,
+        TokenType.COMMAND_NAME,
+        TokenType.COMMAND_EXTRA,
+        TokenType.COMMAND_ATTRIBUTE_START,
+        TokenType.COMMAND_ATTRIBUTE_TYPE,
+        TokenType.COMMAND_ATTRIBUTE_EXTRA,
+        TokenType.COMMAND_ATTRIBUTE_VALUE,
+        TokenType.COMMAND_ATTRIBUTE_END,
+        TokenType.SECTION_START,
+        TokenType.SECTION_NAME,
+        TokenType.SECTION_END,
+        TokenType.SECTION_END,
+        TokenType.SECTION_START,
+        TokenType.SECTION_NAME,
+        TokenType.SECTION_END,
+    ]
+    assert tokens[4].value == "set"
+    assert tokens[5].value == "config.url http://localhost"
+    assert tokens[5].section == "Section"
+    assert tokens[8].value == "extra"
+    assert tokens[9].value == '{"a": 1}\n'
+    assert tokens[9].map == (6, 9)
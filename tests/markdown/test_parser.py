@@ -1,6 +1,7 @@
 from os import path
 
 from urobor import TestCase
+from urobor.commands import BlockArgument, SetCommand
 from urobor.markdown import Parser
 
 
@@ -41,3 +42,31 @@ def test_can_parse_commands(examples_dir: str) -> None:
 
     # then
     a = 1
+
+
+def test_can_parse_skipped_heading_levels(tmp_path) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    spec.write_text("# First\n### Deep\n## Second\n# Third\n")
+
+    # when
+    test = Parser(str(spec)).test
+
+    # then
+    assert [child.name for child in test.children] == ["First", "Third"]
+    assert [child.name for child in test.children[0].children] == ["Deep", "Second"]
+
+
+def test_can_parse_block_arguments(examples_dir: str) -> None:
+    # given
+    instance = Parser(path.join(examples_dir, "variables.md"))
+
+    # when
+    command = instance.test.children[0].children[2].commands[0]
+
+    # then
+    assert isinstance(command, SetCommand)
+    assert command.arguments[0].value == "config.address"
+    assert isinstance(command.arguments[1], BlockArgument)
+    assert command.arguments[1].content_type == "yaml"
+    assert command.arguments[1].value.startswith("street_name: Seasame street")
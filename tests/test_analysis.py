@@ -0,0 +1,100 @@
+from urobor.analysis import prune, undefined_references
+from urobor.commands import ForeachCommand, GetCommand, PostCommand, SetCommand, Argument
+from urobor.commands.command import BlockArgument
+from urobor.test_case import TestCase
+
+
+def create_test(name: str, parent: TestCase, *commands) -> TestCase:
+    test = TestCase(name, parent.level + 1, parent)
+    test.commands.extend(commands)
+    parent.children.append(test)
+
+    return test
+
+
+def test_reports_undefined_references() -> None:
+    # given
+    root = TestCase("", level=0)
+    root.commands.append(SetCommand([Argument("config.url"), Argument("http://localhost")]))
+    first = create_test("First", root, GetCommand([Argument("{{ config.url }}/users"), Argument("users")]))
+    create_test("Nested", first, SetCommand([Argument("name"), Argument("{{ users.json.0.name }} {{ uuid() }}")]))
+    second = create_test("Second", root, SetCommand([Argument("other"), Argument("{{ users.json }}")]))
+    create_test("Body", second, PostCommand([Argument("{{ config.url }}"), BlockArgument('{"a": "{{ missing }}"}', "json")]))
+
+    # when
+    references = undefined_references(root)
+
+    # then
+    assert [(reference.test.name, reference.variable) for reference in references] == [
+        ("Second", "users.json"),
+        ("Body", "missing"),
+    ]
+    assert str(references[1]) == "Second / Body: `post {{ config.url }} code@json` reads undefined variable `missing`"
+
+
+def test_known_variables_cover_parents_and_children() -> None:
+    # given
+    root = TestCase("", level=0)
+    root.commands.append(SetCommand([Argument("response"), Argument("{}")]))
+    root.commands.append(SetCommand([Argument("config.url"), Argument("value")]))
+    root.commands.append(SetCommand([Argument("a"), Argument("{{ response.json.id }} {{ config }} {{ config.other }}")]))
+
+    # when
+    references = undefined_references(root)
+
+    # then
+    assert [reference.variable for reference in references] == ["config.other"]
+
+
+def test_prune_keeps_matching_tests_and_needed_commands() -> None:
+    # given
+    root = TestCase("", level=0)
+    set_url = SetCommand([Argument("url"), Argument("http://localhost")])
+    set_unused = SetCommand([Argument("unused"), Argument("value")])
+    get_unused = GetCommand([Argument("{{ url }}/slow"), Argument("slow")])
+    login = PostCommand([Argument("{{ url }}/login")])
+    root.commands.extend([set_url, set_unused, get_unused, login])
+    first = create_test("First", root)
+    target = create_test("Target", first, GetCommand([Argument("{{ token }}")]))
+    create_test("Child", target)
+    first.commands.append(SetCommand([Argument("token"), Argument("{{ response.json.token }}")]))
+    create_test("Other", first)
+    create_test("Second", root)
+
+    # when
+    pruned = prune(root, lambda test: test.name == "Target")
+
+    # then
+    assert pruned.commands == [set_url, login]
+    assert [child.name for child in pruned.children] == ["First"]
+    assert [child.name for child in pruned.children[0].children] == ["Target"]
+    assert pruned.children[0].children[0].children[0].name == "Child"
+    assert pruned.children[0].children[0].parent is pruned.children[0]
+    assert root.commands == [set_url, set_unused, get_unused, login]
+    assert len(root.children) == 2
+
+
+def test_prune_keeps_commands_with_unknown_writes_and_expansions() -> None:
+    # given
+    root = TestCase("", level=0)
+    set_name = SetCommand([Argument("name"), Argument("token")])
+    set_templated = SetCommand([Argument("{{ name }}"), Argument("secret")])
+    set_unused = SetCommand([Argument("unused"), Argument("value")])
+    foreach = ForeachCommand([Argument("user"), BlockArgument("name\nbob\nalice\n", "csv")])
+    root.commands.extend([set_name, set_templated, set_unused, foreach])
+    create_test("Target", root, GetCommand([Argument("http://localhost/{{ token }}")]))
+
+    # when
+    pruned = prune(root, lambda test: test.name == "Target")
+
+    # then
+    assert pruned.commands == [set_name, set_templated, foreach]
+
+
+def test_prune_returns_none_without_matches() -> None:
+    # given
+    root = TestCase("", level=0)
+    create_test("First", root)
+
+    # then
+    assert prune(root, lambda test: False) is None
@@ -0,0 +1,127 @@
+import pickle
+from typing import Any
+
+import pytest
+
+from urobor.commands.command import Argument, Context
+
+
+def test_context_copy_isolates_child_writes() -> None:
+    # given
+    parent = Context({"name": "parent"})
+
+    # when
+    child = parent.copy()
+    child["name"] = "child"
+    child["other"] = 1
+
+    # then
+    assert parent["name"] == "parent"
+    assert "other" not in parent
+    assert child["name"] == "child"
+
+
+def test_context_copy_isolates_parent_writes_after_copy() -> None:
+    # given
+    parent = Context({"name": "parent"})
+    child = parent.copy()
+
+    # when
+    parent["name"] = "changed"
+
+    # then
+    assert child["name"] == "parent"
+    assert parent["name"] == "changed"
+
+
+def test_context_copy_on_write_for_nested_values() -> None:
+    # given
+    parent = Context({"config": {"url": "http://localhost", "tags": ["a"]}})
+    child = parent.copy()
+
+    # when
+    child["config"]["url"] = "http://example.com"
+    child["config"]["tags"].append("b")
+
+    # then
+    assert parent["config"] == {"url": "http://localhost", "tags": ["a"]}
+    assert child["config"] == {"url": "http://example.com", "tags": ["a", "b"]}
+
+
+def test_context_copy_shares_unmodified_values() -> None:
+    # given
+    fixture = {"items": list(range(100))}
+    parent = Context({"fixture": fixture})
+
+    # when
+    child = parent.copy().copy().copy()
+
+    # then
+    assert child.variables["fixture"] is fixture
+    assert len(child.variables.maps) == 2
+
+
+def test_context_copy_keeps_chain_depth_bounded() -> None:
+    # given
+    context = Context({"level": 0})
+
+    # when
+    for level in range(1, 200):
+        context = context.copy()
+        context["level"] = level
+
+    # then
+    assert context["level"] == 199
+    assert len(context.variables.maps) <= Context.MAX_DEPTH + 1
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("true", True),
+    ("false", False),
+    ("10", 10),
+    ("-3", -3),
+    ("0", 0),
+    ("0.5", 0.5),
+    ("1e3", 1000.0),
+    ("007", "007"),
+    ("0e5", "0e5"),
+    ("plain text", "plain text"),
+    ("True", "True"),
+])
+def test_argument_decodes_literals_once(value: str, expected: Any) -> None:
+    # given
+    argument = Argument(value)
+
+    # when
+    result = argument.parse(Context({}))
+
+    # then
+    assert result == expected
+    assert type(result) is type(expected)
+    assert not argument._dynamic
+
+
+def test_argument_interpolates_templates_on_every_parse() -> None:
+    # given
+    argument = Argument("{{ name }}-1")
+
+    # then
+    assert argument._dynamic
+    assert argument.parse(Context({"name": "a"})) == "a-1"
+    assert argument.parse(Context({"name": "b"})) == "b-1"
+
+
+def test_argument_keeps_interpolated_numbers_as_strings() -> None:
+    # given
+    argument = Argument("{{ value }}")
+
+    # then
+    assert argument.parse(Context({"value": 10})) == "10"
+
+
+def test_argument_survives_pickling() -> None:
+    # given
+    argument = pickle.loads(pickle.dumps(Argument("{{ name }}")))
+
+    # then
+    assert argument.parse(Context({"name": "a"})) == "a"
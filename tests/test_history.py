@@ -0,0 +1,204 @@
+import io
+import sqlite3
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, List
+
+from urobor import TestCase
+from urobor.cli import main
+from urobor.history import History
+from urobor.reporting import ProgressReporter
+from urobor.runner import Runner
+from urobor.test_case import Status
+
+SPEC = """
+# First
+
+> set url http://localhost/first
+
+# Second
+
+> set url http://localhost/second
+
+## Nested
+
+> set other {{ url }}
+
+# Third
+
+> set url http://localhost/third
+"""
+
+
+def create_spec(tmp_path: Path) -> str:
+    spec = tmp_path / "spec.md"
+    spec.write_text(SPEC)
+
+    return str(spec)
+
+
+def test_records_outcomes_of_a_run(tmp_path: Path) -> None:
+    # given
+    spec = create_spec(tmp_path)
+    history = History(str(tmp_path / "cache"))
+
+    # when
+    results = Runner(history=history).run([spec])
+
+    # then
+    stored = History(str(tmp_path / "cache"))
+    second = results[spec].children[1]
+    record = stored.get(spec, second.children[0])
+    assert record.status == Status.PASSED
+    assert record.runs == 1
+    assert stored.duration(spec, second) == second.duration
+    assert not stored.failed(spec, second)
+
+
+def test_smooths_durations_over_runs(tmp_path: Path) -> None:
+    # given
+    history = History(str(tmp_path))
+    test = TestCase("First")
+    test.status = Status.FAILED
+
+    # when
+    for duration in (1.0, 3.0):
+        test.duration = duration
+        history.file_started("spec.md")
+        history.test_finished(test)
+        history.run_finished()
+
+    # then
+    record = History(str(tmp_path)).get("spec.md", test)
+    assert record == (Status.FAILED, 2.0, 2)
+
+
+def test_ignores_unreadable_database(tmp_path: Path) -> None:
+    # given
+    (tmp_path / "history.sqlite").write_text("not a database")
+
+    # when
+    history = History(str(tmp_path))
+
+    # then
+    assert history.get("spec.md", TestCase("First")) is None
+
+
+def store(history: History, filename: str, root: TestCase, failed: List[str], durations: dict) -> None:
+    history.file_started(filename)
+    for test in root.walk():
+        test.status = Status.FAILED if test.name in failed else Status.PASSED
+        test.duration = durations.get(test.name, 0.1)
+        history.test_finished(test)
+    history.run_finished()
+
+
+def test_orders_failed_tests_first(tmp_path: Path) -> None:
+    # given
+    spec = create_spec(tmp_path)
+    other = tmp_path / "other.md"
+    other.write_text(SPEC)
+    runner = Runner()
+    tests = runner.parse([str(other), spec])
+    history = History(str(tmp_path / "cache"))
+    store(history, spec, tests[spec], ["Third", tests[spec].name], {})
+
+    # when
+    ordered = History(str(tmp_path / "cache")).order(runner.parse([str(other), spec]))
+
+    # then
+    assert list(ordered) == [spec, str(other)]
+    assert [test.name for test in ordered[spec].children] == ["Third", "First", "Second"]
+    assert [test.name for test in ordered[str(other)].children] == ["First", "Second", "Third"]
+
+
+def test_provides_durations_of_shard_units(tmp_path: Path) -> None:
+    # given
+    spec = create_spec(tmp_path)
+    tests = Runner().parse([spec])
+    history = History(str(tmp_path / "cache"))
+    store(history, spec, tests[spec], [], {"First": 1.0, "Second": 5.0})
+
+    # when
+    durations = history.durations(tests)
+
+    # then
+    assert durations == {f"{spec}::First": 1.0, f"{spec}::Second": 5.0, f"{spec}::Third": 0.1}
+
+
+class RecordingExecutor:
+    def __init__(self):
+        self.submitted: List[str] = []
+
+    def submit(self, function: Callable, test: TestCase, *args: Any) -> Future:
+        self.submitted.append(test.name)
+        future = Future()
+        future.set_result(function(test, *args))
+
+        return future
+
+
+def test_submits_longest_subtrees_first(tmp_path: Path) -> None:
+    # given
+    spec = create_spec(tmp_path)
+    tests = Runner().parse([spec])
+    history = History(str(tmp_path / "cache"))
+    store(history, spec, tests[spec], [], {"First": 1.0, "Second": 5.0, "Third": 2.0})
+    executor = RecordingExecutor()
+
+    # when
+    tests[spec].run(executor=executor, priority=history.priority(spec))
+
+    # then
+    assert executor.submitted == ["Second", "Third", "First"]
+    assert [test.name for test in tests[spec].children] == ["First", "Second", "Third"]
+    assert tests[spec].status == Status.PASSED
+
+
+def test_progress_estimates_time_left(tmp_path: Path) -> None:
+    # given
+    spec = create_spec(tmp_path)
+    tests = Runner().parse([spec])
+    expected = {"First": 1.0, "Second": 2.0}
+    stream = io.StringIO()
+    reporter = ProgressReporter(stream, tests, lambda filename, test: expected.get(test.name))
+
+    # when
+    tests[spec].run(reporter=reporter)
+
+    # then
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 3
+    assert lines[0].startswith("[1/3] First passed in ")
+    assert "s left" in lines[1]
+    assert lines[2].startswith("[3/3] Third passed in ")
+    assert lines[2].endswith("s elapsed")
+
+
+def test_cli_records_history_and_reports_progress(tmp_path: Path, capsys) -> None:
+    # given
+    spec = create_spec(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+
+    # when
+    exit_code = main(["run", spec, "--cache-dir", cache_dir, "--failed-first", "--progress", "-j", "2"])
+
+    # then
+    assert exit_code == 0
+    assert "[3/3] Third passed" in capsys.readouterr().err
+    with sqlite3.connect(str(tmp_path / "cache" / "history.sqlite")) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM tests").fetchone() == (5,)
+
+
+def test_cli_records_history_without_parse_cache(tmp_path: Path) -> None:
+    # given
+    spec = create_spec(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+
+    # when
+    exit_code = main(["run", spec, "--cache-dir", cache_dir, "--no-cache"])
+
+    # then
+    assert exit_code == 0
+    with sqlite3.connect(str(tmp_path / "cache" / "history.sqlite")) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM tests").fetchone() == (5,)
@@ -1,6 +1,10 @@
+import subprocess
+import sys
+
 import pytest
 
 from urobor.interpolation.interpolated_string import InterpolatedString
+from urobor.interpolation.memoization import PureCallable
 from urobor.interpolation.modifiers import string_to_snake_case, string_strip, string_to_upper
 
 
@@ -157,3 +161,132 @@ def test_can_call_a_user_defined_function_with_extra() -> None:
     # then
     assert substituted_string == "Hello, Rob!"
 
+
+
+def test_compiles_template_once() -> None:
+    # given
+    first = InterpolatedString("{{ foo.bar }} and {{ baz | strip }}")
+    second = InterpolatedString("{{ foo.bar }} and {{ baz | strip }}")
+
+    # then
+    assert first.compiled is second.compiled
+    assert len(first.compiled.nodes) == 3
+    assert first.compiled.nodes[1] == " and "
+
+
+def test_compiled_template_follows_registry_changes() -> None:
+    # given
+    template = InterpolatedString("{{ value | decorate }}")
+    InterpolatedString.register_filter("decorate", lambda value: f"[{value}]")
+
+    # when
+    first = template + {"value": "a"}
+    InterpolatedString.register_filter("decorate", lambda value: f"<{value}>")
+    second = template + {"value": "a"}
+
+    # then
+    assert first == "[a]"
+    assert second == "<a>"
+
+    InterpolatedString.unregister_filter("decorate")
+
+
+def test_constant_template_has_no_placeholders() -> None:
+    # given
+    constant = InterpolatedString.compile("plain `{{` text `}}`")
+    template = InterpolatedString.compile("{{ value }}")
+
+    # then
+    assert constant.is_constant
+    assert constant.render({}) == "plain {{ text }}"
+    assert not template.is_constant
+
+
+def test_built_in_functions_are_loaded_on_first_use() -> None:
+    # given
+    code = (
+        "import sys\n"
+        "from urobor.interpolation import InterpolatedString\n"
+        "assert 'bson' not in sys.modules\n"
+        "assert 'urobor.interpolation.functions' not in sys.modules\n"
+        "assert len(InterpolatedString('{{ objectid() }}') + {}) == 24\n"
+        "assert 'bson' in sys.modules\n"
+    )
+
+    # then
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+@pytest.mark.parametrize("template", ["{{ uuid() }}", "{{ date() }}", "{{ datetime() }}", "{{ time() }}"])
+def test_can_call_built_in_functions(template: str) -> None:
+    # then
+    assert InterpolatedString(template) + {}
+
+
+def test_can_use_built_in_filters() -> None:
+    # given
+    template = InterpolatedString("{{ name | snakecase | uppercase }}")
+
+    # then
+    assert template + {"name": "Project Name"} == "PROJECT_NAME"
+
+
+def test_pure_filters_are_memoized() -> None:
+    # given
+    calls = []
+
+    def shout(value: str) -> str:
+        calls.append(value)
+        return value.upper()
+
+    InterpolatedString.register_filter("shout", shout, pure=True)
+    template = InterpolatedString("{{ name | shout }}")
+
+    # when
+    results = [template + {"name": name} for name in ("bob", "bob", "rob", "bob")]
+
+    # then
+    assert results == ["BOB", "BOB", "ROB", "BOB"]
+    assert calls == ["bob", "rob"]
+    stats = InterpolatedString.cache_stats()["filter:shout"]
+    assert stats.hits == 2
+    assert stats.misses == 2
+
+    InterpolatedString.unregister_filter("shout")
+
+
+def test_pure_filters_bypass_cache_for_unhashable_values() -> None:
+    # given
+    InterpolatedString.register_filter("keys", lambda value: ",".join(value), pure=True)
+    template = InterpolatedString("{{ config | keys }}")
+
+    # when
+    result = template + {"config": {"url": 1, "port": 2}}
+
+    # then
+    assert result == "url,port"
+    assert InterpolatedString.cache_stats()["filter:keys"].uncached == 1
+
+    InterpolatedString.unregister_filter("keys")
+
+
+def test_pure_callables_cache_equal_values_of_different_types_separately() -> None:
+    # given
+    describe = PureCallable(repr)
+
+    # when
+    results = [describe(value) for value in (1, 1.0, True, 1)]
+
+    # then
+    assert results == ["1", "1.0", "True", "1"]
+    assert describe.cache_stats().misses == 3
+    assert describe.cache_stats().hits == 1
+
+
+def test_non_deterministic_functions_are_not_memoized() -> None:
+    # given
+    template = InterpolatedString("{{ uuid() }}")
+
+    # then
+    assert template + {} != template + {}
+    assert "function:uuid" not in InterpolatedString.cache_stats()
@@ -0,0 +1,57 @@
+import pytest
+
+from urobor.commands.command import Context
+from urobor.interpolation.path import MISSING, Path
+
+VALUES = {
+    "config": {"url": "http://localhost", "ports": [8080, 8081]},
+    "users": [{"name": "Bob"}, {"name": "Rob"}],
+    "name": "urobor",
+}
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ["name", "urobor"],
+    ["config.url", "http://localhost"],
+    ["config.ports.1", 8081],
+    ["users.0.name", "Bob"],
+    ["users.-1.name", "Rob"],
+    ["users.2.name", MISSING],
+    ["config.missing", MISSING],
+    ["name.length", MISSING],
+])
+def test_can_get_value(expression: str, expected) -> None:
+    # then
+    assert Path.compile(expression).get(VALUES) == expected
+
+
+def test_compiled_paths_are_cached() -> None:
+    # then
+    assert Path.compile("config.url") is Path.compile("config.url")
+
+
+def test_can_set_nested_value_without_modifying_shared_values() -> None:
+    # given
+    shared = {"config": {"url": "http://localhost"}, "users": [{"name": "Bob"}]}
+    context = Context(shared).copy()
+
+    # when
+    Path.compile("config.url").set(context, "http://example.com")
+    Path.compile("users.0.name").set(context, "Rob")
+    Path.compile("users.1").set(context, {"name": "Paul"})
+    Path.compile("new.nested.value").set(context, 1)
+
+    # then
+    assert context.get("config") == {"url": "http://example.com"}
+    assert context.get("users") == [{"name": "Rob"}, {"name": "Paul"}]
+    assert context.get("new") == {"nested": {"value": 1}}
+    assert shared == {"config": {"url": "http://localhost"}, "users": [{"name": "Bob"}]}
+
+
+def test_fail_set_list_item_out_of_range() -> None:
+    # given
+    context = Context({"users": []})
+
+    # then
+    with pytest.raises(IndexError):
+        Path.compile("users.3").set(context, "Bob")
@@ -0,0 +1,140 @@
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from urobor import TestCase, instrumentation
+from urobor.commands import Argument, GetCommand, SetCommand
+from urobor.commands.command import Context
+from urobor.http.client import Request, Response, Transport
+from urobor.profiling import Profiler, percentile
+
+
+def create_tree() -> TestCase:
+    root = TestCase("__root__", level=0)
+    root.commands.append(SetCommand([Argument("config"), Argument("value")]))
+    child = TestCase("Child", parent=root)
+    child.commands.append(SetCommand([Argument("url"), Argument("{{ config }}/users")]))
+    child.commands.append(SetCommand([Argument("other"), Argument("{{ url }}/1")]))
+    root.children.append(child)
+
+    return root
+
+
+def test_collects_command_latencies_and_phases() -> None:
+    # given
+    test = create_tree()
+    profiler = Profiler()
+
+    # when
+    with profiler:
+        profiler.file_started("spec.md")
+        test.run(Context({}), reporter=profiler)
+
+    # then
+    assert test
+    assert len(profiler.latencies["set"]) == 3
+    assert profiler.counts["interpolation"] >= 2
+    assert profiler.counts["context_copy"] == 1
+    assert ("spec.md", "Child", "set", "interpolation") in profiler.stacks
+    assert ("spec.md", "Child", "set", "self") in profiler.stacks
+    assert "set" in profiler.summary()
+
+
+def test_measures_async_and_threaded_runs() -> None:
+    # given
+    profiler = Profiler()
+    threaded = create_tree()
+    for index in range(3):
+        child = TestCase(f"Sibling {index}", parent=threaded)
+        child.commands.append(SetCommand([Argument("other"), Argument("{{ config }}/{{ config }}")]))
+        threaded.children.append(child)
+
+    # when
+    with profiler, ThreadPoolExecutor(2) as executor:
+        threaded.run(Context({}), executor=executor, reporter=profiler)
+        asyncio.run(create_tree().run_async(concurrency=2))
+
+    # then
+    assert len(profiler.latencies["set"]) == 3 + 3 + 3
+    assert ("(run)", "Child", "set", "interpolation") in profiler.stacks
+    assert ("(run)", "Sibling 2", "set", "interpolation") in profiler.stacks
+
+
+class StaticTransport(Transport):
+    def send(self, request: Request) -> Response:
+        return Response(200, "OK", {}, b"")
+
+    def close(self) -> None:
+        pass
+
+
+def test_attributes_transport_calls_of_async_commands(transport) -> None:
+    # given
+    profiler = Profiler()
+    root = TestCase("__root__", level=0)
+    child = TestCase("Request", parent=root)
+    child.commands.append(GetCommand([Argument("http://localhost/users")]))
+    root.children.append(child)
+    transport(StaticTransport())
+
+    # when
+    with profiler:
+        asyncio.run(root.run_async())
+
+    # then
+    assert root
+    assert profiler.counts["io"] == 1
+    assert ("(run)", "Request", "get", "io") in profiler.stacks
+
+
+def test_uninstall_unsubscribes_from_hooks() -> None:
+    # given
+    profiler = Profiler()
+
+    # when
+    profiler.install()
+    installed = instrumentation.instruments
+    profiler.uninstall()
+    create_tree().run(Context({}))
+
+    # then
+    assert installed == (profiler,)
+    assert instrumentation.instruments == ()
+    assert profiler.counts == {}
+
+
+def test_measures_deep_copies() -> None:
+    # given
+    context = Context({"payload": {"items": list(range(100))}})
+    child = context.copy()
+    profiler = Profiler()
+
+    # when
+    with profiler:
+        child["payload"]
+
+    # then
+    assert profiler.counts["deepcopy"] == 1
+    assert profiler.copied_bytes > 100 * 8
+
+
+def test_writes_collapsed_stacks() -> None:
+    # given
+    profiler = Profiler()
+    profiler.stacks = {("spec.md", "A;B", "set", "self"): 0.0015, ("spec.md", "set", "io"): 0.0000001}
+    stream = io.StringIO()
+
+    # when
+    profiler.write_collapsed(stream)
+
+    # then
+    assert stream.getvalue() == "spec.md;A,B;set;self 1500\n"
+
+
+def test_percentile() -> None:
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 90) == 0.0
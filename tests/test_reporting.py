@@ -0,0 +1,72 @@
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree
+
+from urobor import TestCase
+from urobor.commands import Argument, SetCommand
+from urobor.reporting import JsonLinesReporter, JUnitReporter, MultiReporter
+
+
+def create_tree() -> TestCase:
+    root = TestCase("__root__", level=0)
+    for index in range(4):
+        child = TestCase(f"Test {index}", level=1, parent=root)
+        child.commands.append(SetCommand([Argument("value"), Argument(str(index))]))
+        if index == 2:
+            child.commands.append(SetCommand([Argument("value"), Argument("{{ unknown_function() }}")]))
+        nested = TestCase(f"Nested {index}", level=2, parent=child)
+        nested.commands.append(SetCommand([Argument("nested"), Argument("{{ value }}")]))
+        child.children.append(nested)
+        root.children.append(child)
+
+    return root
+
+
+def test_streams_events_as_json_lines_in_document_order() -> None:
+    # given
+    stream = io.StringIO()
+    reporter = JsonLinesReporter(stream)
+
+    # when
+    reporter.file_started("spec.md")
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        create_tree().run(executor=executor, reporter=reporter)
+    reporter.run_finished()
+
+    # then
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    finished = [event["path"] for event in events if event["event"] == "test_finished"]
+    commands = [event for event in events if event["event"] == "command_finished"]
+    assert finished == [
+        ["Test 0", "Nested 0"], ["Test 0"],
+        ["Test 1", "Nested 1"], ["Test 1"],
+        ["Test 2", "Nested 2"], ["Test 2"],
+        ["Test 3", "Nested 3"], ["Test 3"],
+        [],
+    ]
+    assert all(event["duration"] >= 0 for event in commands)
+    assert [event["passed"] for event in commands if event["path"] == ["Test 2"]] == [True, False]
+    assert "unknown_function" in commands[5]["error"]
+    assert events[-1] == {"event": "run_finished"}
+
+
+def test_streams_junit_xml() -> None:
+    # given
+    stream = io.StringIO()
+    reporter = MultiReporter([JUnitReporter(stream)])
+
+    # when
+    reporter.file_started("spec.md")
+    create_tree().run(reporter=reporter)
+    reporter.run_finished()
+
+    # then
+    suites = ElementTree.fromstring(stream.getvalue())
+    cases = suites.find("testsuite").findall("testcase")
+    assert suites.find("testsuite").get("name") == "spec.md"
+    assert len(cases) == 8
+    assert cases[0].get("name") == "Nested 0"
+    assert cases[0].get("classname") == "Test 0"
+    assert cases[1].get("name") == "Test 0"
+    assert [case.get("name") for case in cases if case.find("failure") is not None] == ["Test 2"]
@@ -0,0 +1,130 @@
+from os import path
+
+from urobor.cli import main
+from urobor.runner import Runner, discover
+
+SPEC = """
+> set base http://localhost
+
+# First
+
+> set url {{ base }}/first
+
+## Nested
+
+> set other {{ url }}
+
+# Second
+
+> set url {{ base }}/second
+"""
+
+
+def test_can_discover_spec_files(tmp_path) -> None:
+    # given
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "a.md").write_text(SPEC)
+    (tmp_path / "nested" / "b.md").write_text(SPEC)
+    (tmp_path / "notes.txt").write_text("")
+
+    # when
+    files = discover([str(tmp_path)])
+
+    # then
+    assert files == [path.join(str(tmp_path), "a.md"), path.join(str(tmp_path), "nested", "b.md")]
+
+
+def test_can_run_with_jobs(tmp_path) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    spec.write_text(SPEC)
+
+    # when
+    results = Runner(jobs=4).run([str(spec)])
+
+    # then
+    test = results[str(spec)]
+    assert test
+    assert [child.name for child in test.children] == ["First", "Second"]
+
+
+def test_cli_returns_exit_code(tmp_path, capsys) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    spec.write_text(SPEC)
+
+    # when
+    exit_code = main(["run", str(spec), "--jobs", "2", "--cache-dir", str(tmp_path / "cache")])
+
+    # then
+    assert exit_code == 0
+    assert "[+] Nested" in capsys.readouterr().out
+
+
+def test_can_run_async(tmp_path) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    spec.write_text(SPEC)
+
+    # when
+    results = Runner(use_async=True, concurrency=2).run([str(spec)])
+
+    # then
+    assert results[str(spec)]
+    assert all(test for test in results[str(spec)].walk())
+
+
+def test_cli_strict_mode_rejects_undefined_variables(tmp_path, capsys) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    spec.write_text(SPEC + "\n# Third\n\n> set other {{ missing }}\n")
+
+    # when
+    exit_code = main(["run", str(spec), "--strict", "--cache-dir", str(tmp_path / "cache")])
+
+    # then
+    assert exit_code == 1
+    assert "Third: `set other {{ missing }}` reads undefined variable `missing`" in capsys.readouterr().err
+
+
+def test_cli_can_filter_tests(tmp_path, capsys) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    spec.write_text(SPEC)
+
+    # when
+    exit_code = main(["run", str(spec), "-k", "nested", "--cache-dir", str(tmp_path / "cache")])
+
+    # then
+    output = capsys.readouterr().out
+    assert exit_code == 0
+    assert "Nested" in output
+    assert "Second" not in output
+
+
+def test_cli_fail_fast_skips_remaining_tests(tmp_path, capsys) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    spec.write_text(SPEC.replace("# Second", "# Failing\n\n> print value\n\n# Second"))
+
+    # when
+    exit_code = main(["run", str(spec), "--no-cache", "--no-history", "--fail-fast"])
+
+    # then
+    assert exit_code == 1
+    output = capsys.readouterr().out
+    assert "[x] Failing" in output
+    assert "[-] Second" in output
+
+
+def test_cli_fails_when_time_budget_is_exceeded(tmp_path, capsys) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    spec.write_text(SPEC)
+
+    # when
+    exit_code = main(["run", str(spec), "--no-cache", "--no-history", "--time-budget", "0.000001"])
+
+    # then
+    assert exit_code == 1
+    assert "[-] First" in capsys.readouterr().out
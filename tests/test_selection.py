@@ -0,0 +1,106 @@
+import pytest
+
+from urobor.runner import Runner
+from urobor.selection import HeadingIndex, Selector
+
+SPEC = """
+> set base http://localhost
+
+# Variables usage
+
+> set url {{ base }}/variables
+
+## Declaring a variable
+
+> set declared {{ url }}
+
+## Reusing a variable
+
+> set reused {{ url }}
+
+# Filters
+
+## Upper-case
+
+> set upper {{ base | uppercase }}
+"""
+
+
+@pytest.mark.parametrize("expression, headings, expected", [
+    ("Variables usage/Reusing a variable", ["Variables usage", "Reusing a variable"], True),
+    ("Variables usage", ["Variables usage"], True),
+    ("Variables usage", ["Variables usage", "Reusing a variable"], False),
+    ("Variables usage/Re*", ["Variables usage", "Reusing a variable"], True),
+    ("*/re:(Up|Low)per-case", ["Filters", "Upper-case"], True),
+    ("re:Var.*", ["Variables usage"], True),
+    ("re:Var", ["Variables usage"], False),
+    ("**/Upper-case", ["Filters", "Upper-case"], True),
+    ("**/Upper-case", ["Upper-case"], True),
+    ("Filters/**", ["Filters"], True),
+    ("Filters/**", ["Variables usage"], False),
+])
+def test_can_match_headings(expression: str, headings: list, expected: bool) -> None:
+    # given
+    selector = Selector.parse(expression)
+
+    # then
+    assert selector.match(headings) is expected
+
+
+def test_fails_on_empty_selector() -> None:
+    with pytest.raises(ValueError):
+        Selector.parse(" / ")
+
+
+def test_runs_selected_subtree_only(tmp_path) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    spec.write_text(SPEC)
+    runner = Runner(selectors=[Selector.parse("Variables usage/Reusing a variable")])
+
+    # when
+    results = runner.run([str(spec)])
+
+    # then
+    test = results[str(spec)]
+    assert test
+    assert [child.name for child in test.children] == ["Variables usage"]
+    assert [child.name for child in test.children[0].children] == ["Reusing a variable"]
+
+
+def test_skips_files_which_cannot_match(tmp_path) -> None:
+    # given
+    (tmp_path / "a.md").write_text(SPEC)
+    (tmp_path / "b.md").write_text("# Other\n\n> set value 1\n")
+    index = HeadingIndex(str(tmp_path / "cache"))
+    Runner(index=index).parse([str(tmp_path)])
+    parsed = []
+
+    class CountingRunner(Runner):
+        def parse_file(self, filename):
+            parsed.append(filename)
+            return super().parse_file(filename)
+
+    runner = CountingRunner(selectors=[Selector.parse("Other")], index=HeadingIndex(str(tmp_path / "cache")))
+
+    # when
+    tests = runner.parse([str(tmp_path)])
+
+    # then
+    assert parsed == [str(tmp_path / "b.md")]
+    assert list(tests) == [str(tmp_path / "b.md")]
+
+
+def test_ignores_stale_index_entries(tmp_path) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    spec.write_text("# Other\n")
+    index = HeadingIndex(str(tmp_path / "cache"))
+    Runner(index=index).parse([str(spec)])
+
+    # when
+    spec.write_text("# Changed heading\n\n> set value 1\n")
+    tests = Runner(selectors=[Selector.parse("Changed*")], index=HeadingIndex(str(tmp_path / "cache"))).parse([str(spec)])
+
+    # then
+    assert list(tests) == [str(spec)]
@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from urobor import TestCase
+from urobor.cli import main
+from urobor.runner import Runner
+from urobor.sharding import Shard, collect_units, partition
+
+
+def create_tests(names) -> dict:
+    root = TestCase("__root__", level=0)
+    for name in names:
+        root.children.append(TestCase(name, level=1, parent=root))
+
+    return {"spec.md": root}
+
+
+def test_can_parse_shard() -> None:
+    # then
+    assert Shard.parse("3/8") == Shard(3, 8)
+    with pytest.raises(ValueError):
+        Shard.parse("9/8")
+    with pytest.raises(ValueError):
+        Shard.parse("three")
+
+
+def test_partition_balances_by_duration() -> None:
+    # given
+    units = collect_units(create_tests(["a", "b", "c", "d", "e"]))
+    durations = {"spec.md::a": 10.0, "spec.md::b": 6.0, "spec.md::c": 4.0, "spec.md::d": 1.0, "spec.md::e": 1.0}
+
+    # when
+    shards = partition(units, 2, durations)
+
+    # then
+    assert [[unit.test.name for unit in shard] for shard in shards] == [["a", "d"], ["b", "c", "e"]]
+
+
+def test_partition_covers_all_units_once() -> None:
+    # given
+    units = collect_units(create_tests([f"test {index}" for index in range(17)]))
+
+    # when
+    shards = partition(units, 4)
+
+    # then
+    assert sorted(unit.id for shard in shards for unit in shard) == sorted(unit.id for unit in units)
+    assert max(len(shard) for shard in shards) - min(len(shard) for shard in shards) <= 1
+
+
+def test_duplicated_names_get_unique_ids() -> None:
+    # when
+    units = collect_units(create_tests(["a", "a"]))
+
+    # then
+    assert [unit.id for unit in units] == ["spec.md::a", "spec.md::a#2"]
+
+
+def test_can_run_shards_and_merge_results(tmp_path, capsys) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    spec.write_text("> set base 1\n\n# A\n> set a {{ base }}\n# B\n# C\n## C.1\n# D\n")
+    headingless = tmp_path / "setup.md"
+    headingless.write_text("> set only 1\n")
+
+    # when
+    exit_codes = [
+        main([
+            "run", str(spec), str(headingless), "--no-cache", "--no-history", "--shard", f"{index}/2",
+            "--results", str(tmp_path / f"{index}.json"),
+        ])
+        for index in (1, 2)
+    ]
+    merge_code = main([
+        "merge", str(tmp_path / "1.json"), str(tmp_path / "2.json"),
+        "--output", str(tmp_path / "report.json"), "--durations", str(tmp_path / "durations.json"),
+    ])
+
+    # then
+    report = json.loads((tmp_path / "report.json").read_text())
+    durations = json.loads((tmp_path / "durations.json").read_text())
+    assert exit_codes == [0, 0]
+    assert merge_code == 0
+    assert [item["name"] for item in report["results"]] == ["setup.md", "A", "B", "C", "D"]
+    assert report["passed"] == 5
+    assert set(durations) == {f"{spec}::{name}" for name in "ABCD"} | {f"{headingless}::"}
+    assert "5/5 passed" in capsys.readouterr().out
+
+
+def test_runner_selects_shard(tmp_path) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    spec.write_text("# A\n# B\n# C\n")
+
+    # when
+    first = Runner(shard=Shard(1, 2)).run([str(spec)])
+    second = Runner(shard=Shard(2, 2)).run([str(spec)])
+
+    # then
+    names = [test.name for result in (first, second) for root in result.values() for test in root.children]
+    assert sorted(names) == ["A", "B", "C"]
+
+
+def test_merged_results_keep_document_order_with_skewed_durations(tmp_path) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    spec.write_text("# A\n# B\n# A\n# D\n")
+    durations = tmp_path / "durations.json"
+    durations.write_text(json.dumps({f"{spec}::D": 10.0, f"{spec}::A#2": 5.0, f"{spec}::A": 1.0, f"{spec}::B": 1.0}))
+
+    # when
+    for index in (1, 2, 3):
+        main([
+            "run", str(spec), "--no-cache", "--no-history", "--shard", f"{index}/3", "--durations", str(durations),
+            "--results", str(tmp_path / f"{index}.json"),
+        ])
+    main(["merge", *(str(tmp_path / f"{index}.json") for index in (1, 2, 3)), "--output", str(tmp_path / "report.json")])
+
+    # then
+    first = json.loads((tmp_path / "1.json").read_text())
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert [(item["id"], item["position"]) for item in first["results"]] == [(f"{spec}::D", 3)]
+    assert [(item["name"], item["position"]) for item in report["results"]] == [("A", 0), ("B", 1), ("A", 2), ("D", 3)]
+    assert [item["id"] for item in report["results"]] == [f"{spec}::{name}" for name in ("A", "B", "A#2", "D")]
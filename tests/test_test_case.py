@@ -1,5 +1,13 @@
+import asyncio
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Pattern
+
 from urobor import TestCase
-from urobor.test_case import Status
+from urobor.commands import Argument, Command, SetCommand
+from urobor.commands.command import Context, Error, Result, run_blocking
+from urobor.test_case import Reporter, RunControl, Status
 
 
 def test_can_instantiate() -> None:
@@ -20,3 +28,250 @@ def test_can_run() -> None:
     # then
     assert test_case
     assert test_case.status == Status.PASSED
+
+
+class FailingCommand(Command):
+    def execute(self, context: Context) -> Result:
+        result = Result()
+        result.error = Error(RuntimeError("failed"))
+
+        return result
+
+    @classmethod
+    def id(cls) -> str:
+        return "fail"
+
+    @classmethod
+    def line_arguments(cls) -> Pattern:
+        return re.compile(r"(.*)")
+
+
+def create_tree(failing_child: int = -1) -> TestCase:
+    root = TestCase("Root", level=0)
+    root.commands.append(SetCommand([Argument("base"), Argument("value")]))
+    for index in range(5):
+        child = TestCase(f"Child {index}", level=1, parent=root)
+        child.commands.append(SetCommand([Argument("name"), Argument(f"{{{{ base }}}} {index}")]))
+        if index == failing_child:
+            child.commands.append(FailingCommand())
+        grandchild = TestCase(f"Grandchild {index}", level=2, parent=child)
+        child.children.append(grandchild)
+        root.children.append(child)
+
+    return root
+
+
+def test_can_run_children_on_thread_pool() -> None:
+    # given
+    test_case = create_tree(failing_child=3)
+
+    # when
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        test_case.run(executor=executor)
+
+    # then
+    assert test_case.status == Status.FAILED
+    assert [child.status for child in test_case.children] == [
+        Status.PASSED, Status.PASSED, Status.PASSED, Status.FAILED, Status.PASSED
+    ]
+    assert all(child.children[0].status == Status.PASSED for child in test_case.children)
+
+
+def test_can_run_children_on_process_pool() -> None:
+    # given
+    test_case = create_tree()
+
+    # when
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        test_case.run(executor=executor)
+
+    # then
+    assert test_case.status == Status.PASSED
+    assert all(test.status == Status.PASSED for test in test_case.walk())
+
+
+class SleepCommand(Command):
+    in_flight = 0
+    max_in_flight = 0
+
+    def execute(self, context: Context) -> Result:
+        return Result()
+
+    async def execute_async(self, context: Context) -> Result:
+        SleepCommand.in_flight += 1
+        SleepCommand.max_in_flight = max(SleepCommand.max_in_flight, SleepCommand.in_flight)
+        await asyncio.sleep(0.01)
+        SleepCommand.in_flight -= 1
+
+        return Result()
+
+    @classmethod
+    def id(cls) -> str:
+        return "sleep"
+
+    @classmethod
+    def line_arguments(cls) -> Pattern:
+        return re.compile(r"(.*)")
+
+
+def test_can_run_async_with_concurrency_limit() -> None:
+    # given
+    test_case = create_tree(failing_child=1)
+    for test in test_case.walk():
+        test.commands.append(SleepCommand())
+    SleepCommand.max_in_flight = 0
+
+    # when
+    asyncio.run(test_case.run_async(concurrency=3))
+
+    # then
+    assert SleepCommand.max_in_flight == 3
+    assert test_case.status == Status.FAILED
+    assert [child.status for child in test_case.children] == [
+        Status.PASSED, Status.FAILED, Status.PASSED, Status.PASSED, Status.PASSED
+    ]
+
+
+class BarrierCommand(Command):
+    barrier: threading.Barrier
+
+    def execute(self, context: Context) -> Result:
+        BarrierCommand.barrier.wait()
+
+        return Result()
+
+    async def execute_async(self, context: Context) -> Result:
+        return await run_blocking(self.execute, context)
+
+    @classmethod
+    def id(cls) -> str:
+        return "barrier"
+
+    @classmethod
+    def line_arguments(cls) -> Pattern:
+        return re.compile(r"(.*)")
+
+
+def test_async_blocking_calls_are_not_limited_by_default_executor() -> None:
+    # given
+    concurrency = 40
+    test_case = TestCase("Root", level=0)
+    for index in range(concurrency):
+        child = TestCase(f"Child {index}", level=1, parent=test_case)
+        child.commands.append(BarrierCommand())
+        test_case.children.append(child)
+    BarrierCommand.barrier = threading.Barrier(concurrency, timeout=5)
+
+    # when
+    asyncio.run(test_case.run_async(concurrency=concurrency))
+
+    # then
+    assert test_case.status == Status.PASSED
+
+
+def test_stop_on_failure_skips_rest_of_test_and_children() -> None:
+    # given
+    test_case = create_tree(failing_child=2)
+    failing = test_case.children[2]
+    failing.commands.append(SetCommand([Argument("after"), Argument("failure")]))
+    executed = []
+
+    class RecordingReporter(Reporter):
+        def command_finished(self, test: TestCase, command: Command, result: Result, duration: float) -> None:
+            executed.append((test.name, command.id()))
+
+    # when
+    test_case.run(reporter=RecordingReporter(), control=RunControl(stop_on_failure=True))
+
+    # then
+    assert ("Child 2", "fail") in executed
+    assert [test.status for test in failing.walk()] == [Status.FAILED, Status.SKIPPED]
+    assert len([item for item in executed if item[0] == "Child 2"]) == 2
+    assert test_case.children[3].status == Status.PASSED
+    assert test_case.status == Status.FAILED
+
+
+def test_fail_fast_skips_remaining_tests() -> None:
+    # given
+    test_case = create_tree(failing_child=1)
+
+    # when
+    test_case.run(control=RunControl(fail_fast=True))
+
+    # then
+    assert [child.status for child in test_case.children] == [
+        Status.PASSED, Status.FAILED, Status.SKIPPED, Status.SKIPPED, Status.SKIPPED
+    ]
+    assert test_case.children[4].children[0].status == Status.SKIPPED
+    assert test_case.status == Status.FAILED
+
+
+def test_fail_fast_cancels_pending_subtrees() -> None:
+    # given
+    test_case = create_tree(failing_child=0)
+
+    # when
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        test_case.run(executor=executor, control=RunControl(fail_fast=True))
+
+    # then
+    assert test_case.children[0].status == Status.FAILED
+    assert all(test.status == Status.SKIPPED for child in test_case.children[1:] for test in child.walk())
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TickCommand(Command):
+    clock = FakeClock()
+
+    def execute(self, context: Context) -> Result:
+        TickCommand.clock.now += 0.05
+
+        return Result()
+
+    @classmethod
+    def id(cls) -> str:
+        return "tick"
+
+    @classmethod
+    def line_arguments(cls) -> Pattern:
+        return re.compile(r"(.*)")
+
+
+def test_time_budget_skips_tests_started_after_deadline() -> None:
+    # given
+    test_case = create_tree()
+    for child in test_case.children:
+        child.commands.insert(0, TickCommand())
+    TickCommand.clock = FakeClock()
+
+    # when
+    test_case.run(control=RunControl(time_budget=0.075, clock=TickCommand.clock))
+
+    # then
+    assert [child.status for child in test_case.children[:2]] == [Status.PASSED, Status.SKIPPED]
+    assert test_case.children[1].children[0].status == Status.SKIPPED
+    assert test_case.children[2].duration == 0.0
+    assert all(child.status == Status.SKIPPED for child in test_case.children[2:])
+    assert test_case.status == Status.PASSED
+
+
+def test_time_budget_stops_async_run() -> None:
+    # given
+    test_case = create_tree()
+    for child in test_case.children:
+        child.commands.insert(0, TickCommand())
+    TickCommand.clock = FakeClock()
+
+    # when
+    asyncio.run(test_case.run_async(concurrency=1, control=RunControl(time_budget=0.075, clock=TickCommand.clock)))
+
+    # then
+    assert [child.status for child in test_case.children] == [Status.PASSED] + [Status.SKIPPED] * 4
+    assert test_case.status == Status.PASSED
@@ -0,0 +1,127 @@
+import os
+import re
+from typing import List, Pattern
+
+from urobor.commands import SetCommand
+from urobor.commands.catalog import CommandCatalog
+from urobor.commands.command import Command, Context, Error, Result
+from urobor.markdown.parser import Parser
+from urobor.runner import Runner
+from urobor.test_case import Status
+from urobor.watch import Watcher, diff
+
+EXECUTED: List[str] = []
+
+SPEC = """
+> record root
+
+# First
+
+> record first
+
+## Nested
+
+> record nested {{ value }}
+
+# Second
+
+> set value second
+
+## Nested
+
+> record second-nested {{ value }}
+"""
+
+
+class RecordCommand(Command):
+    LINE_ARGUMENTS = re.compile(r"(.+?)\s*$")
+
+    def execute(self, context: Context) -> Result:
+        value = self.arguments[0].interpolate(context)
+        EXECUTED.append(value)
+        result = Result()
+        if value.startswith("fail"):
+            result.error = Error(RuntimeError(value))
+
+        return result
+
+    @classmethod
+    def id(cls) -> str:
+        return "record"
+
+    @classmethod
+    def line_arguments(cls) -> Pattern:
+        return cls.LINE_ARGUMENTS
+
+
+def create_catalog() -> CommandCatalog:
+    catalog = CommandCatalog()
+    catalog.add(SetCommand)
+    catalog.add(RecordCommand)
+
+    return catalog
+
+
+def write(spec, contents: str) -> None:
+    stat = os.stat(spec) if spec.exists() else None
+    spec.write_text(contents)
+    if stat is not None:
+        os.utime(spec, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_diff_returns_changed_subtrees(tmp_path) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    write(spec, SPEC)
+    old = Parser(str(spec), create_catalog()).test
+    write(spec, SPEC.replace("> set value second", "> set value changed") + "\n# Third\n")
+    new = Parser(str(spec), create_catalog()).test
+
+    # when
+    changed = diff(old, new)
+
+    # then
+    assert [test.path for test in changed] == [["Second"], ["Third"]]
+
+
+def test_runs_only_changed_sections(tmp_path) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    write(spec, SPEC)
+    watcher = Watcher(Runner(catalog=create_catalog()), [str(tmp_path)])
+    EXECUTED.clear()
+
+    # when
+    first = watcher.check()
+    root = watcher.tests[str(spec)]
+    executed_first = list(EXECUTED)
+    EXECUTED.clear()
+    unchanged = watcher.check()
+    write(spec, SPEC.replace("second-nested", "changed-nested"))
+    second = watcher.check()
+
+    # then
+    assert first[str(spec)] == [root]
+    assert executed_first == ["root", "first", "nested ", "second-nested second"]
+    assert unchanged == {}
+    assert [test.path for test in second[str(spec)]] == [["Second", "Nested"]]
+    assert EXECUTED == ["root", "changed-nested second"]
+    assert watcher.tests[str(spec)]
+
+
+def test_carries_failures_of_unchanged_sections(tmp_path) -> None:
+    # given
+    spec = tmp_path / "spec.md"
+    write(spec, SPEC.replace("> record first", "> record fail-first"))
+    watcher = Watcher(Runner(catalog=create_catalog()), [str(spec)])
+    watcher.check()
+
+    # when
+    write(spec, SPEC.replace("> record first", "> record fail-first").replace("second-nested", "other"))
+    watcher.check()
+
+    # then
+    test = watcher.tests[str(spec)]
+    assert test.status == Status.FAILED
+    assert test.children[0].status == Status.FAILED
+    assert test.children[1].status == Status.PASSED
@@ -1 +1,3 @@
 from .test_case import TestCase
+
+__version__ = "0.1.0"
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from typing import Callable, Iterable, List, NamedTuple, Optional, Set
+
+from .commands.command import Command
+from .test_case import TestCase
+
+
+class Reference(NamedTuple):
+    test: TestCase
+    command: Command
+    variable: str
+
+    def __str__(self) -> str:
+        return f"{' / '.join(self.test.path) or '(root)'}: `{self.command!r}` reads undefined variable `{self.variable}`"
+
+
+class _Names:
+    """
+    Set of written variable paths. A path is known when it was written, when one of its parents was written
+    or when it is a parent of a written path.
+    """
+    __slots__ = ("written", "parents")
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.written: Set[str] = set()
+        self.parents: Set[str] = set()
+        self.update(names)
+
+    def update(self, names: Iterable[str]) -> None:
+        for name in names:
+            self.written.add(name)
+            keys = name.split(".")
+            self.parents.update(".".join(keys[:index]) for index in range(1, len(keys)))
+
+    def copy(self) -> _Names:
+        copy = _Names()
+        copy.written = set(self.written)
+        copy.parents = set(self.parents)
+
+        return copy
+
+    def __contains__(self, name: str) -> bool:
+        if name in self.parents:
+            return True
+        keys = name.split(".")
+
+        return any(".".join(keys[:index]) in self.written for index in range(1, len(keys) + 1))
+
+
+def undefined_references(test: TestCase, variables: Iterable[str] = ()) -> List[Reference]:
+    """
+    Returns placeholders reading variables which are not set by any earlier command of the test or its ancestors.
+    Such placeholders are rendered as empty strings when tests run.
+    """
+    references = []
+    _collect_undefined(test, _Names(variables), references)
+
+    return references
+
+
+def _collect_undefined(test: TestCase, names: _Names, references: List[Reference]) -> None:
+    names = names.copy()
+    for command in test.commands:
+        for variable in sorted(command.reads()):
+            if variable not in names:
+                references.append(Reference(test, command, variable))
+        names.update(command.writes() or ())
+
+    for child in test.children:
+        _collect_undefined(child, names, references)
+
+
+def prune(test: TestCase, predicate: Callable[[TestCase], bool]) -> Optional[TestCase]:
+    """
+    Returns a copy of the tree holding tests matching `predicate` with their descendants and ancestors, or `None`
+    when nothing matches. Commands of ancestors are kept only when they have side effects, expand the test into
+    rows, write variables not known before running or set variables read by a command kept after them.
+    Copies share commands with the original tree.
+
+    Siblings never share variables, each of them gets its own copy of the context, so tests which are not
+    ancestors of a matching test never contribute to it.
+    """
+    matched: Set[int] = set()
+    selected = _select(test, predicate, None, matched)
+    if selected is not None and selected is not test:
+        _prune_commands(selected, matched)
+
+    return selected
+
+
+def _select(
+    test: TestCase, predicate: Callable[[TestCase], bool], parent: Optional[TestCase], matched: Set[int]
+) -> Optional[TestCase]:
+    if test.level > 0 and predicate(test):
+        if parent is None:
+            return test
+        copy = _clone(test, parent)
+        matched.add(id(copy))
+        return copy
+
+    copy = TestCase(test.name, test.level, parent)
+    copy.commands = list(test.commands)
+    selected = (_select(child, predicate, copy, matched) for child in test.children)
+    copy.children = [child for child in selected if child is not None]
+    if not copy.children:
+        return None
+
+    return copy
+
+
+def _clone(test: TestCase, parent: TestCase) -> TestCase:
+    copy = TestCase(test.name, test.level, parent)
+    copy.commands = list(test.commands)
+    copy.children = [_clone(child, copy) for child in test.children]
+
+    return copy
+
+
+def _prune_commands(test: TestCase, matched: Set[int]) -> Set[str]:
+    reads = set()
+    for child in test.children:
+        reads |= _subtree_reads(child) if id(child) in matched else _prune_commands(child, matched)
+
+    kept = []
+    for command in reversed(test.commands):
+        if command.side_effects or command.expands or _writes_any(command, reads):
+            kept.append(command)
+            reads |= command.reads()
+    test.commands = kept[::-1]
+
+    return reads
+
+
+def _writes_any(command: Command, names: Set[str]) -> bool:
+    writes = command.writes()
+    if writes is None:
+        return True
+
+    return any(_overlaps(name, other) for name in writes for other in names)
+
+
+def _subtree_reads(test: TestCase) -> Set[str]:
+    return {name for item in test.walk() for command in item.commands for name in command.reads()}
+
+
+def _overlaps(name: str, other: str) -> bool:
+    return name == other or name.startswith(other + ".") or other.startswith(name + ".")
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from contextlib import ExitStack, nullcontext
+from time import sleep
+from typing import Any, Callable, Dict, List, Optional
+
+from .analysis import undefined_references
+from .history import History
+from .markdown.backends import DEFAULT_BACKEND, get_backend
+from .markdown.cache import DEFAULT_CACHE_DIR, ParseCache
+from . import sharding
+from .profiling import PARSE, Profiler
+from .reporting import JsonLinesReporter, JUnitReporter, MultiReporter
+from .runner import Runner
+from .selection import HeadingIndex, Selector
+from .sharding import Shard, create_results, durations_from_results, load_durations, read_json, write_json
+from .test_case import Reporter, Status, TestCase
+from .watch import Watcher
+
+_STATUS_MARKS = {
+    Status.PASSED: "+",
+    Status.FAILED: "x",
+    Status.SKIPPED: "-",
+    Status.NOT_STARTED: " ",
+    Status.OTHER: "?",
+}
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="urobor", description="API contract testing tool")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run markdown spec files")
+    add_runner_arguments(run)
+    run.add_argument(
+        "--async", dest="use_async", action="store_true", help="run tests concurrently on an asyncio event loop"
+    )
+    run.add_argument(
+        "--concurrency", type=int, default=None, help="max number of tests running at once in `--async` mode"
+    )
+    run.add_argument(
+        "-k", "--filter", default=None, help="run only tests whose heading path contains given text"
+    )
+    run.add_argument(
+        "--select",
+        action="append",
+        type=Selector.parse,
+        default=[],
+        help="run only tests under given heading path, e.g. `Section/Test`, segments may be globs or `re:` patterns",
+    )
+    run.add_argument(
+        "--strict", action="store_true", help="do not run tests when they reference undefined variables"
+    )
+    run.add_argument("-x", "--fail-fast", action="store_true", help="stop the whole run at the first failed command")
+    run.add_argument(
+        "--stop-on-failure",
+        action="store_true",
+        help="stop a test at its first failed command and skip its subsections",
+    )
+    run.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="seconds after which no more tests or commands are started, remaining tests are skipped",
+    )
+    run.add_argument("--shard", type=Shard.parse, default=None, help="run only given shard, e.g. `3/8`")
+    run.add_argument(
+        "--durations",
+        default=None,
+        help="json file with recorded durations used to balance shards, run history is used when not given",
+    )
+    run.add_argument(
+        "--failed-first", action="store_true", help="run tests which failed in the previous run before the others"
+    )
+    run.add_argument(
+        "--progress", action="store_true", help="print finished top-level tests and estimated time left to stderr"
+    )
+    run.add_argument(
+        "--no-history", action="store_true", help="do not read or record outcomes and durations of tests"
+    )
+    run.add_argument(
+        "--profile",
+        nargs="?",
+        const="urobor.folded",
+        default=None,
+        help="write collapsed stacks for flamegraph tools to a file (`urobor.folded` by default) and print a summary",
+    )
+    run.add_argument("--results", default=None, help="write results of the run to a json file")
+    run.add_argument("--jsonl", default=None, help="stream events as json lines to a file, `-` for stdout")
+    run.add_argument("--junit", default=None, help="stream JUnit XML report to a file")
+
+    watch = commands.add_parser("watch", help="run changed sections of spec files whenever they are saved")
+    add_runner_arguments(watch)
+    watch.add_argument(
+        "--interval", type=float, default=0.5, help="seconds between checks for changed files, `0.5` by default"
+    )
+
+    merge = commands.add_parser("merge", help="merge results of sharded runs into one report")
+    merge.add_argument("results", nargs="+", help="json result files written by `run --results`")
+    merge.add_argument("-o", "--output", default=None, help="write merged report to a json file")
+    merge.add_argument("--durations", default=None, help="write recorded durations to a json file")
+
+    return parser
+
+
+def add_runner_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("paths", nargs="+", help="spec files or directories containing them")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="number of workers running sibling tests concurrently"
+    )
+    parser.add_argument(
+        "--processes", action="store_true", help="use a process pool instead of threads for `--jobs`"
+    )
+    parser.add_argument(
+        "--pool-size", type=int, default=None, help="max number of keep-alive connections per host"
+    )
+    parser.add_argument(
+        "--cache-dir", default=DEFAULT_CACHE_DIR, help=f"parse cache directory, `{DEFAULT_CACHE_DIR}` by default"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="always parse spec files")
+    parser.add_argument("--cassette", default=None, help="record and replay http responses using given file")
+    parser.add_argument(
+        "--record-mode",
+        choices=["record", "replay", "refresh"],
+        default="refresh",
+        help="`record` always sends requests, `replay` never does, `refresh` (default) sends only missing or stale ones",
+    )
+    parser.add_argument(
+        "--max-age", type=float, default=None, help="seconds after which recorded responses are stale in `refresh` mode"
+    )
+    parser.add_argument(
+        "--markdown-backend",
+        default=DEFAULT_BACKEND,
+        help=f"markdown parser backend, `{DEFAULT_BACKEND}` by default",
+    )
+
+
+def create_runner(arguments: argparse.Namespace, reporter: Reporter = None, **options: Any) -> Runner:
+    return Runner(
+        jobs=arguments.jobs,
+        processes=arguments.processes,
+        pool_size=arguments.pool_size,
+        cache=None if arguments.no_cache else ParseCache(arguments.cache_dir),
+        backend=get_backend(arguments.markdown_backend),
+        reporter=reporter,
+        cassette=arguments.cassette,
+        record_mode=arguments.record_mode,
+        max_age=arguments.max_age,
+        **options,
+    )
+
+
+def print_test(test: TestCase, indent: int = 0) -> None:
+    print(f"{'  ' * indent}[{_STATUS_MARKS[test.status]}] {test.name}")
+    for child in test.children:
+        print_test(child, indent + 1)
+
+
+def create_reporter(arguments: argparse.Namespace, stack: ExitStack) -> Reporter:
+    reporters = []
+    if arguments.jsonl == "-":
+        reporters.append(JsonLinesReporter(sys.stdout))
+    elif arguments.jsonl:
+        reporters.append(JsonLinesReporter(stack.enter_context(open(arguments.jsonl, "w"))))
+    if arguments.junit:
+        reporters.append(JUnitReporter(stack.enter_context(open(arguments.junit, "w"))))
+
+    return MultiReporter(reporters)
+
+
+def create_predicate(text: str) -> Callable[[TestCase], bool]:
+    text = text.lower()
+
+    return lambda test: text in " / ".join(test.path).lower()
+
+
+def check_variables(tests: Dict[str, TestCase]) -> bool:
+    valid = True
+    for filename, test in tests.items():
+        for reference in undefined_references(test):
+            print(f"{filename}: {reference}", file=sys.stderr)
+            valid = False
+
+    return valid
+
+
+def run(arguments: argparse.Namespace) -> int:
+    with ExitStack() as stack:
+        reporter = create_reporter(arguments, stack)
+        if not arguments.profile:
+            return _run(arguments, reporter)
+
+        profiler = stack.enter_context(Profiler())
+        exit_code = _run(arguments, MultiReporter([reporter, profiler]), profiler)
+        with open(arguments.profile, "w") as profile_file:
+            profiler.write_collapsed(profile_file)
+        print(profiler.summary(), file=sys.stderr)
+
+        return exit_code
+
+
+def _run(arguments: argparse.Namespace, reporter: Reporter, profiler: Profiler = None) -> int:
+    runner = create_runner(
+        arguments,
+        reporter,
+        use_async=arguments.use_async,
+        concurrency=arguments.concurrency,
+        shard=arguments.shard,
+        durations=load_durations(arguments.durations) if arguments.durations else None,
+        predicate=create_predicate(arguments.filter) if arguments.filter else None,
+        selectors=arguments.select,
+        index=None if arguments.no_cache else HeadingIndex(arguments.cache_dir),
+        history=None if arguments.no_history else History(arguments.cache_dir),
+        failed_first=arguments.failed_first,
+        progress=sys.stderr if arguments.progress else None,
+        fail_fast=arguments.fail_fast,
+        stop_on_failure=arguments.stop_on_failure,
+        time_budget=arguments.time_budget,
+    )
+    with profiler.measure(PARSE) if profiler else nullcontext():
+        tests = runner.parse(arguments.paths)
+    if not check_variables(tests) and arguments.strict:
+        return 1
+    results = runner.run_tests(tests)
+    for filename, test in results.items():
+        print(filename)
+        for child in test.children:
+            print_test(child, 1)
+
+    if arguments.results:
+        write_json(arguments.results, create_results(results, arguments.shard, runner.units))
+    skipped = [test for root in results.values() for test in root.walk() if test.status == Status.SKIPPED]
+    if runner.control and runner.control.expired and skipped:
+        print(f"Time budget of {arguments.time_budget:g}s exceeded, {len(skipped)} tests were skipped.", file=sys.stderr)
+        return 1
+
+    return 0 if all(results.values()) else 1
+
+
+def watch(arguments: argparse.Namespace) -> int:
+    runner = create_runner(arguments)
+    runner.configure_transport()
+    watcher = Watcher(runner, arguments.paths)
+    try:
+        while True:
+            try:
+                updates = watcher.check()
+            except Exception as error:
+                print(f"Error: {error}")
+                updates = {}
+            for filename, tests in updates.items():
+                print(f"{filename} ({len(tests)} changed)")
+                for child in watcher.tests[filename].children:
+                    print_test(child, 1)
+            sleep(arguments.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+def merge(arguments: argparse.Namespace) -> int:
+    report = sharding.merge(read_json(filename) for filename in arguments.results)
+    if arguments.output:
+        write_json(arguments.output, report)
+    if arguments.durations:
+        write_json(arguments.durations, durations_from_results(report))
+    print(f"{report['passed']}/{report['total']} passed, {report['failed']} failed")
+
+    return 0 if not report["failed"] else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arguments = create_parser().parse_args(argv)
+
+    if arguments.command == "run":
+        return run(arguments)
+    if arguments.command == "watch":
+        return watch(arguments)
+    if arguments.command == "merge":
+        return merge(arguments)
+
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
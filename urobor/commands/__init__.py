@@ -1,4 +1,8 @@
 from .catalog import CommandCatalog, DEFAULT_CATALOG
 from .command import Command, Argument, BlockArgument
+from .expect_command import ExpectCommand
+from .foreach_command import ForeachCommand
+from .http_command import HttpCommand, GetCommand, PostCommand, PutCommand, PatchCommand, DeleteCommand
+from .load_command import LoadCommand
 from .print_command import PrintCommand
 from .set_command import SetCommand
@@ -1,6 +1,10 @@
-from typing import Type
+from typing import Iterator, Type
 
 from urobor.commands.command import Command
+from urobor.commands.expect_command import ExpectCommand
+from urobor.commands.foreach_command import ForeachCommand
+from urobor.commands.http_command import DeleteCommand, GetCommand, PatchCommand, PostCommand, PutCommand
+from urobor.commands.load_command import LoadCommand
 from urobor.commands.print_command import PrintCommand
 from urobor.commands.set_command import SetCommand
 
@@ -21,8 +25,19 @@ class CommandCatalog:
     def __contains__(self, name: str) -> bool:
         return name in self._catalog
 
+    def __iter__(self) -> Iterator[Type[Command]]:
+        return iter(self._catalog.values())
+
 
 DEFAULT_CATALOG = CommandCatalog()
 DEFAULT_CATALOG.add(SetCommand)
 DEFAULT_CATALOG.add(PrintCommand)
+DEFAULT_CATALOG.add(LoadCommand)
+DEFAULT_CATALOG.add(ForeachCommand)
+DEFAULT_CATALOG.add(ExpectCommand)
+DEFAULT_CATALOG.add(GetCommand)
+DEFAULT_CATALOG.add(PostCommand)
+DEFAULT_CATALOG.add(PutCommand)
+DEFAULT_CATALOG.add(PatchCommand)
+DEFAULT_CATALOG.add(DeleteCommand)
 
@@ -1,10 +1,22 @@
 from __future__ import annotations
 
 from abc import abstractmethod, ABC
-from typing import Any, List, Pattern, Dict
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Pattern, Dict, Optional, Set, Tuple, TypeVar
+from collections import ChainMap
+from contextvars import ContextVar, copy_context
 from copy import deepcopy
 
-from urobor.interpolation.interpolated_string import InterpolatedString
+from urobor import instrumentation
+from urobor.commands import decoders
+from urobor.interpolation.interpolated_string import CompiledTemplate, InterpolatedString
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+T = TypeVar("T")
+
+# Threads for blocking calls of asynchronous commands, set by `TestCase.run_async` for the tree it runs.
+blocking_executor: ContextVar[Optional[Executor]] = ContextVar("blocking_executor", default=None)
 
 
 class Error:
@@ -13,51 +25,125 @@ class Error:
 
 
 class Argument:
+    """
+    Command argument classified once when it is created: `true`/`false`, integers, floats and strings without
+    placeholders are decoded up front, only templates are rendered on every `parse`. Numbers with leading zeros
+    are kept as strings.
+    """
+
     def __init__(self, value: str):
         self._value = value
+        self._template: Optional[CompiledTemplate] = None
+        self._dynamic, self._constant = self._classify(value)
 
     @property
     def value(self) -> str:
         return self._value
 
     def parse(self, context: Context) -> Any:
-        if self.value == "true":
-            return True
+        if not self._dynamic:
+            return self._constant
+
+        return self._template.render(context.variables)
 
-        if self.value == "false":
-            return False
+    def _classify(self, value: str) -> Tuple[bool, Any]:
+        if value == "true":
+            return False, True
 
-        if len(self.value) > 1 and self.value[0] == "0" and self.value[1] != ".":
-            return self._interpolate_value(context)
+        if value == "false":
+            return False, False
 
-        try:
-            return int(self.value)
-        except ValueError:
-            pass
+        if not (len(value) > 1 and value[0] == "0" and value[1] != "."):
+            for number_type in (int, float):
+                try:
+                    return False, number_type(value)
+                except ValueError:
+                    pass
 
-        try:
-            return float(self.value)
-        except ValueError:
-            pass
+        self._template = InterpolatedString.compile(value)
+        if self._template.is_constant:
+            return False, self._template.render({})
 
-        return self._interpolate_value(context)
+        return True, None
 
-    def _interpolate_value(self, context: Context) -> str:
-        value = InterpolatedString(self.value)
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        if self._template is None:
+            self._template = InterpolatedString.compile(self.value)
+
+        return self._template.variables
+
+    def interpolate(self, context: Context) -> str:
+        if self._template is None:
+            self._template = InterpolatedString.compile(self.value)
 
-        return value + context.variables
+        return self._template.render(context.variables)
 
     def __repr__(self) -> str:
         return f"{self.value}"
 
 
+_NOT_DECODED = object()
+
+
 class BlockArgument(Argument):
+    """
+    Code block passed to a command. Its contents are decoded according to the block type (json, yaml, ndjson)
+    when first needed and the result is reused by later executions, so it is frozen into read-only
+    `FrozenDict`/`FrozenList` values which writes through paths copy instead of modifying.
+    Blocks containing placeholders are interpolated and decoded on every execution. Json and ndjson blocks
+    marked with `stream` extra, e.g. ```ndjson stream, are decoded item by item while being iterated.
+    """
+
     def __init__(self, value: str, content_type: str, extra: str = ""):
         self.content_type = content_type
         self.extra = extra
+        self._decoded = _NOT_DECODED
 
         super().__init__(value)
 
+    def _classify(self, value: str) -> Tuple[bool, Any]:
+        return True, None
+
+    @property
+    def streamed(self) -> bool:
+        return "stream" in self.extra.split()
+
+    def parse(self, context: Context) -> Any:
+        if self._template is None:
+            self._template = InterpolatedString.compile(self.value)
+        if self._template.is_constant:
+            return self.decode()
+
+        return self._decode(self._template.render(context.variables))
+
+    def decode(self) -> Any:
+        if self._decoded is _NOT_DECODED:
+            from .fixtures import freeze
+
+            self._decoded = freeze(self._decode(self.value))
+
+        return self._decoded
+
+    def stream(self) -> Iterator[Any]:
+        return decoders.stream(self.value, self.content_type)
+
+    def _decode(self, content: str) -> Any:
+        if self.streamed:
+            return decoders.StreamedValue(content, self.content_type)
+
+        return decoders.decode(content, self.content_type)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_decoded"]
+
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._decoded = _NOT_DECODED
+
     def __repr__(self) -> str:
         return f"code@{self.content_type}"
 
@@ -70,27 +156,106 @@ class Result:
         ...
 
     def __bool__(self) -> bool:
-        return self.error is not None
+        return self.error is None
 
 
 class Context:
-    variables: Dict[str, Any]
+    """
+    Variables visible to a running test, stored as a chain of scopes.
+
+    `copy` does not clone any values, the child gets a new empty scope on top of the parent's chain. Scopes shared
+    with a child are never written again: the owner starts a new scope on its next write, and nested dict/list
+    values living in a shared scope are copied into the own scope when accessed through `__getitem__`.
+    `variables` is a read view for interpolation, all writes should go through the context.
+    """
+    MAX_DEPTH = 32
+
+    variables: ChainMap
 
     def __init__(self, variables: Dict[str, Any]):
-        self.variables = variables
+        self.variables = ChainMap(variables)
+        self._shared = False
 
     def __getitem__(self, key: str) -> Any:
-        return self.variables[key]
+        value = self.variables[key]
+        if isinstance(value, (dict, list)) and (self._shared or key not in self.variables.maps[0]):
+            if instrumentation.instruments:
+                with instrumentation.section(instrumentation.DEEPCOPY):
+                    value = deepcopy(value)
+                instrumentation.copied(value)
+            else:
+                value = deepcopy(value)
+            self[key] = value
+
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.variables
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Returns value without copying it into own scope, the value must not be modified.
+        """
+        return self.variables.get(key, default)
 
     def copy(self) -> Context:
-        return Context(deepcopy(self.variables))
+        if instrumentation.instruments:
+            with instrumentation.section(instrumentation.CONTEXT_COPY):
+                return self._copy()
+
+        return self._copy()
+
+    def _copy(self) -> Context:
+        self._shared = True
+        maps = self.variables.maps
+        if not maps[0] and len(maps) > 1:
+            maps = maps[1:]
+        if len(maps) >= self.MAX_DEPTH:
+            flattened = {}
+            for scope in reversed(maps):
+                flattened.update(scope)
+            maps = [flattened]
+
+        return Context._from_maps([{}, *maps])
 
     def __setitem__(self, key: str, value: Any) -> None:
-        self.variables[key] = value
+        if self._shared:
+            self.variables = self.variables.new_child()
+            self._shared = False
+        self.variables.maps[0][key] = value
+
+    @classmethod
+    def _from_maps(cls, maps: List[Dict[str, Any]]) -> Context:
+        context = cls.__new__(cls)
+        context.variables = ChainMap(*maps)
+        context._shared = False
+
+        return context
+
+
+async def run_blocking(function: Callable[..., T], *args: Any) -> T:
+    """
+    Runs a blocking function on the threads of the running tree, so the event loop keeps serving other tests.
+    Falls back to the default executor of the loop outside of `TestCase.run_async`. The function runs in a copy
+    of the current context, like with `asyncio.to_thread`.
+    """
+    import asyncio
+    from functools import partial
+
+    call = partial(copy_context().run, function, *args)
+
+    return await asyncio.get_running_loop().run_in_executor(blocking_executor.get(), call)
 
 
 class Command(ABC):
+    """
+    `reads`, `writes` and `side_effects` describe the command for static analysis. Commands without side effects
+    whose variables are not needed may be skipped. Commands with `expands` set are not executed, the test runs
+    the rest of its commands and its children once for every item returned by their `rows` method instead.
+    """
     result: Result
+    side_effects = False
+    expands = False
 
     def __init__(self, args: List[Argument] = None):
         self.arguments = args or []
@@ -99,6 +264,22 @@ class Command(ABC):
     def execute(self, context: Context) -> Result:
         ...
 
+    async def execute_async(self, context: Context) -> Result:
+        """
+        Asynchronous execution protocol, commands doing I/O should override it and not block the event loop.
+        By default synchronous `execute` is called directly.
+        """
+        return self.execute(context)
+
+    def reads(self) -> Set[str]:
+        return {name for argument in self.arguments for name in argument.variables}
+
+    def writes(self) -> Optional[Set[str]]:
+        """
+        Returns variables set by the command, `None` when they are known only while running, e.g. a templated target.
+        """
+        return set()
+
     @classmethod
     @abstractmethod
     def id(cls) -> str:
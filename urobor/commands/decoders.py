@@ -0,0 +1,215 @@
+import codecs
+import csv
+import io
+import json
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+CHUNK_SIZE = 1 << 20
+_WHITESPACE = re.compile(r"\s*")
+# Text after a number decoded at the window edge which may still be a part of it, e.g. `12.` of `12.5`.
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+_ARRAY = re.compile(r"\s*\[")
+_ARRAY_BYTES = re.compile(rb"\s*\[")
+
+
+def decode_json(content: str) -> Any:
+    return json.loads(content)
+
+
+def decode_yaml(content: str) -> Any:
+    import yaml
+
+    return yaml.load(content, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def decode_ndjson(content: str) -> Any:
+    return list(stream_ndjson(content))
+
+
+def decode_csv(content: str) -> List[Dict[str, str]]:
+    """
+    Decodes csv with a header line into a list of rows, values are kept as strings.
+    """
+    return list(csv.DictReader(io.StringIO(content.strip("\n"))))
+
+
+class _TextWindow:
+    """
+    Text of a string, or utf-8 text decoded from a bytes-like buffer a chunk at a time. Text before `index` is
+    dropped on next read.
+    """
+    __slots__ = ("buffer", "chunk_size", "text", "index", "position", "_utf8")
+
+    def __init__(self, buffer: Any, chunk_size: Optional[int]):
+        self.buffer = buffer
+        self.chunk_size = chunk_size or CHUNK_SIZE
+        self.text = buffer if isinstance(buffer, str) else ""
+        self.index = 0
+        self.position = len(self.text)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+
+    def read(self) -> bool:
+        if self.position >= len(self.buffer):
+            return False
+        size = max(self.chunk_size, len(self.text) - self.index)
+        chunk = self.buffer[self.position:self.position + size]
+        self.position += len(chunk)
+        self.text = self.text[self.index:] + self._utf8.decode(chunk, final=self.position >= len(self.buffer))
+        self.index = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.index = _WHITESPACE.match(self.text, self.index).end()
+            if self.index < len(self.text):
+                return self.text[self.index]
+            if not self.read():
+                return ""
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.index)
+            except json.JSONDecodeError:
+                if self.read():
+                    continue
+                raise
+            if self.position < len(self.buffer) and _NUMBER_TAIL.fullmatch(self.text, end) and self.read():
+                continue
+            self.index = end
+            return value
+
+    def separator(self, closing: str) -> bool:
+        """
+        Consumes `,` and returns `True` when more items follow, consumes the closing bracket otherwise.
+        """
+        character = self.peek()
+        self.index += 1
+        if character == ",":
+            return True
+        if character == closing:
+            return False
+        raise ValueError(f"Expected `,` or `{closing}` in json, got `{character}`.")
+
+
+def iter_json_array(buffer: Any, chunk_size: int = None, object_hook: Any = None) -> Iterator[Any]:
+    """
+    Decodes items of a top-level json array stored in a string or bytes-like buffer, only a window of the buffer is
+    held as text at any time.
+    """
+    decoder = json.JSONDecoder(object_hook=object_hook)
+    window = _TextWindow(buffer, chunk_size)
+    if window.peek() != "[":
+        raise ValueError("Expected json array.")
+    window.index += 1
+    if window.peek() == "]":
+        return
+
+    while True:
+        window.peek()
+        yield window.decode(decoder)
+        if not window.separator("]"):
+            return
+
+
+def iter_json_object(buffer: Any, chunk_size: int = None, object_hook: Any = None) -> Iterator[Tuple[str, Any]]:
+    """
+    Decodes members of a top-level json object stored in a string or bytes-like buffer one by one, only a window of
+    the buffer and the member being decoded are held as text at any time.
+    """
+    decoder = json.JSONDecoder(object_hook=object_hook)
+    window = _TextWindow(buffer, chunk_size)
+    if window.peek() != "{":
+        raise ValueError("Expected json object.")
+    window.index += 1
+    if window.peek() == "}":
+        return
+
+    while True:
+        if window.peek() != "\"":
+            raise ValueError(f"Expected property name in json object, got `{window.peek()}`.")
+        key = window.decode(decoder)
+        if window.peek() != ":":
+            raise ValueError(f"Expected `:` after json property name, got `{window.peek()}`.")
+        window.index += 1
+        window.peek()
+        yield key, window.decode(decoder)
+        if not window.separator("}"):
+            return
+
+
+def iter_ndjson(buffer: Any, object_hook: Any = None) -> Iterator[Any]:
+    newline = "\n" if isinstance(buffer, str) else b"\n"
+    start = 0
+    while start < len(buffer):
+        end = buffer.find(newline, start)
+        if end < 0:
+            end = len(buffer)
+        line = buffer[start:end].strip()
+        if line:
+            yield json.loads(line, object_hook=object_hook)
+        start = end + 1
+
+
+def stream_json(content: Any) -> Iterator[Any]:
+    """
+    Yields items of top-level json array one by one without building the whole list, other documents are
+    yielded as a single item. Bytes are decoded as utf-8 a chunk at a time.
+    """
+    if not (_ARRAY if isinstance(content, str) else _ARRAY_BYTES).match(content):
+        yield json.loads(content)
+        return
+
+    yield from iter_json_array(content)
+
+
+def stream_ndjson(content: Any) -> Iterator[Any]:
+    return iter_ndjson(content)
+
+
+DECODERS: Dict[str, Callable[[str], Any]] = {
+    "json": decode_json,
+    "yaml": decode_yaml,
+    "yml": decode_yaml,
+    "ndjson": decode_ndjson,
+    "jsonl": decode_ndjson,
+    "csv": decode_csv,
+}
+
+STREAMERS: Dict[str, Callable[[str], Iterator[Any]]] = {
+    "json": stream_json,
+    "ndjson": stream_ndjson,
+    "jsonl": stream_ndjson,
+}
+
+
+def decode(content: str, content_type: str) -> Any:
+    if content_type not in DECODERS:
+        return content
+
+    return DECODERS[content_type](content)
+
+
+def stream(content: str, content_type: str) -> Iterator[Any]:
+    if content_type in STREAMERS:
+        return STREAMERS[content_type](content)
+
+    return iter([decode(content, content_type)])
+
+
+class StreamedValue:
+    """
+    Re-iterable view over a json array or ndjson document, items are decoded while iterating.
+    """
+    __slots__ = ("content", "content_type")
+
+    def __init__(self, content: str, content_type: str):
+        self.content = content
+        self.content_type = content_type
+
+    def __iter__(self) -> Iterator[Any]:
+        return stream(self.content, self.content_type)
+
+    def __repr__(self) -> str:
+        return f"StreamedValue({self.content_type})"
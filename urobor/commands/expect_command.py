@@ -0,0 +1,93 @@
+import re
+from typing import Any, Iterable, Pattern, Set
+
+from . import decoders
+from .command import BlockArgument, Command, Context, Error, Result
+from .schema import ValidationError, compile_validator
+from ..interpolation.path import MISSING, Path
+
+
+class ExpectCommand(Command):
+    """
+    Example usage:
+    ```
+    expect response.json schema
+    ```json
+    {"type": "object", "required": ["id"], "properties": {"id": {"type": "integer"}}}
+    ```
+    expect response.json shape
+    ```yaml
+    id: 1
+    tags: [admin]
+    ```
+    expect response.body schema stream
+    ```
+    Validates a variable against a JSON schema or against a `shape`, an example document whose keys are required
+    and whose values give the expected types. Blocks are compiled once and reused by all executions. With `stream`
+    flag json text, streamed blocks or fixtures are validated item by item against an array schema.
+    """
+    LINE_ARGUMENTS = re.compile(r"([_a-z][_a-z0-9\.-]*)\s+(schema|shape)(?:\s+(stream))?\s*$")
+
+    def execute(self, context: Context) -> Result:
+        blocks = [argument for argument in self.arguments if isinstance(argument, BlockArgument)]
+        if len(self.arguments) - len(blocks) not in (2, 3) or len(blocks) != 1:
+            raise RuntimeError(f"`{self.id()}` command expects a variable, `schema` or `shape` and a code block.")
+        block = blocks[0]
+        if block.content_type not in ("json", "yaml", "yml"):
+            raise ValueError(f"Expected json or yaml block in `{self.id()}` command, got `{block.content_type}`.")
+
+        validator = compile_validator(block.interpolate(context), block.content_type, self.arguments[1].value)
+        value = self._value(context)
+        if value is MISSING:
+            raise KeyError(f"Variable `{self.target}` is not set.")
+
+        if self.streamed:
+            errors = validator.validate_stream(self._items(value))
+        else:
+            errors = validator.validate(value)
+
+        result = Result()
+        if errors:
+            result.error = Error(ValidationError(errors))
+
+        return result
+
+    @property
+    def target(self) -> str:
+        return self.arguments[0].value
+
+    @property
+    def streamed(self) -> bool:
+        return len(self.arguments) > 2 and not isinstance(self.arguments[2], BlockArgument)
+
+    def _value(self, context: Context) -> Any:
+        """
+        Streamed `body` of an http response is read from the raw response bytes, so it is never decoded whole.
+        """
+        parent, _, key = self.target.rpartition(".")
+        if self.streamed and parent and key == "body":
+            from ..http.client import ResponseValue
+
+            response = Path.compile(parent).get(context.variables)
+            if isinstance(response, ResponseValue):
+                return response.response.body
+
+        return Path.compile(self.target).get(context.variables)
+
+    @staticmethod
+    def _items(value: Any) -> Iterable[Any]:
+        if isinstance(value, (str, bytes)):
+            return decoders.stream_json(value)
+
+        return value
+
+    def reads(self) -> Set[str]:
+        return super().reads() | {self.target}
+
+    @classmethod
+    def id(cls) -> str:
+        return "expect"
+
+    @classmethod
+    def line_arguments(cls) -> Pattern:
+        return cls.LINE_ARGUMENTS
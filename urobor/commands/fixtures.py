@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+from threading import Lock
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+from .decoders import decode_csv, iter_json_array, iter_json_object, iter_ndjson
+
+_LEADING_BYTES = re.compile(rb"\s*(.?)")
+_CONTENT_TYPES = {
+    ".json": "json",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".csv": "csv",
+}
+Source = Tuple[str, bool]
+
+
+class FrozenDict(Mapping):
+    """
+    Read-only mapping used for values loaded from fixture files. It is not a `dict`, so `Context` never copies it.
+    Top-level values remember their file and are pickled as a reference, workers load the file on their own.
+    """
+    __slots__ = ("_data", "_source")
+
+    def __init__(self, data: Dict[str, Any] = None, source: Optional[Source] = None):
+        self._data = data if data is not None else {}
+        self._source = source
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        if self._source is not None:
+            return load_fixture, self._source
+
+        return FrozenDict, (self._data,)
+
+    def __repr__(self) -> str:
+        return repr(self._data)
+
+
+class FrozenList(tuple):
+    """
+    Read-only list used for values loaded from fixture files.
+    """
+    _source: Optional[Source] = None
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        if self._source is not None:
+            return load_fixture, self._source
+
+        return FrozenList, (tuple(self),)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class StreamedFixture:
+    """
+    Re-iterable view over a memory-mapped json array or ndjson file, items are decoded while iterating.
+    """
+    __slots__ = ("filename", "content_type")
+
+    def __init__(self, filename: str, content_type: str):
+        self.filename = filename
+        self.content_type = content_type
+
+    def __iter__(self) -> Iterator[Any]:
+        buffer = _map(self.filename)
+        if self.content_type == "ndjson":
+            return map(_freeze_item, iter_ndjson(buffer, object_hook=_freeze_object))
+
+        return map(_freeze_item, iter_json_array(buffer, object_hook=_freeze_object))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return load_fixture, (self.filename, True)
+
+    def __repr__(self) -> str:
+        return f"StreamedFixture({self.filename})"
+
+
+def content_type(filename: str) -> str:
+    return _CONTENT_TYPES.get(os.path.splitext(filename)[1].lower(), "text")
+
+
+def load_fixture(filename: str, stream: bool = False) -> Any:
+    """
+    Loads fixture file once per process, the loaded value is shared by all tests and must not be modified.
+    Files changed on disk since they were loaded are loaded again.
+    """
+    filename = os.path.realpath(filename)
+    stat = os.stat(filename)
+    key = (filename, stream)
+    with _LOCK:
+        cached = _FIXTURES.get(key)
+        if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+            return cached[1]
+
+    value = _load(filename, stream)
+    with _LOCK:
+        _FIXTURES[key] = ((stat.st_mtime_ns, stat.st_size), value)
+
+    return value
+
+
+def _load(filename: str, stream: bool) -> Any:
+    kind = content_type(filename)
+    if stream:
+        if kind not in ("json", "ndjson"):
+            raise ValueError(f"Only json and ndjson files can be streamed, got `{filename}`.")
+        return StreamedFixture(filename, kind)
+
+    if kind == "yaml":
+        import yaml
+
+        with open(filename, "rb") as file:
+            return _with_source(freeze(yaml.load(file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))), filename)
+
+    buffer = _map(filename)
+    if kind == "json":
+        leading = _LEADING_BYTES.match(buffer).group(1)
+        if leading == b"[":
+            value = FrozenList(map(_freeze_item, iter_json_array(buffer, object_hook=_freeze_object)))
+        elif leading == b"{":
+            members = iter_json_object(buffer, object_hook=_freeze_object)
+            value = FrozenDict({key: _freeze_item(item) for key, item in members})
+        else:
+            value = json.loads(buffer[:])
+    elif kind == "ndjson":
+        value = FrozenList(map(_freeze_item, iter_ndjson(buffer, object_hook=_freeze_object)))
+    elif kind == "csv":
+        value = freeze(decode_csv(buffer[:].decode("utf-8-sig")))
+    else:
+        value = buffer[:].decode("utf-8")
+
+    return _with_source(value, filename)
+
+
+def _with_source(value: Any, filename: str) -> Any:
+    if isinstance(value, (FrozenDict, FrozenList)):
+        value._source = (filename, False)
+
+    return value
+
+
+def _map(filename: str) -> Any:
+    """
+    Returns read-only memory map of the file, maps are kept open and reused while the file is unchanged.
+    """
+    stat = os.stat(filename)
+    with _LOCK:
+        cached = _MAPS.get(filename)
+        if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+            return cached[1]
+
+    if stat.st_size == 0:
+        buffer = b""
+    else:
+        with open(filename, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    with _LOCK:
+        _MAPS[filename] = ((stat.st_mtime_ns, stat.st_size), buffer)
+
+    return buffer
+
+
+def _freeze_object(value: Dict[str, Any]) -> FrozenDict:
+    for key, item in value.items():
+        if type(item) is list:
+            value[key] = _freeze_list(item)
+
+    return FrozenDict(value)
+
+
+def _freeze_list(value: list) -> FrozenList:
+    return FrozenList(_freeze_list(item) if type(item) is list else item for item in value)
+
+
+def _freeze_item(value: Any) -> Any:
+    return _freeze_list(value) if type(value) is list else value
+
+
+def freeze(value: Any) -> Any:
+    """
+    Converts decoded dicts and lists into `FrozenDict` and `FrozenList`, recursively.
+    """
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+
+    return value
+
+
+_LOCK = Lock()
+_FIXTURES: Dict[Tuple[str, bool], Tuple[Tuple[int, int], Any]] = {}
+_MAPS: Dict[str, Tuple[Tuple[int, int], Any]] = {}
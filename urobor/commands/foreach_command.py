@@ -0,0 +1,80 @@
+import re
+from typing import Any, List, Pattern, Set
+
+from .command import BlockArgument, Command, Context, Result
+from .fixtures import load_fixture
+from ..interpolation.path import Path
+
+
+class ForeachCommand(Command):
+    """
+    Example usage:
+    ```
+    foreach user ./fixtures/users.csv
+    foreach user {{ dir }}/users.ndjson concurrently
+    foreach user
+    ```csv
+    name,email
+    bob,bob@example.com
+    ```
+    ```
+    Commands following `foreach` and all subsections run once for every row, each row gets its own copy of the
+    context with the row stored in the given variable. Rows are reported as children named `#1`, `#2`, ...
+    and share parsed commands, nothing is parsed again. Rows come from a csv, json, ndjson or yaml code block
+    or file, with `concurrently` flag they run on a thread pool unless the runner already uses an executor.
+    """
+    LINE_ARGUMENTS = re.compile(r"([_a-z][_a-z0-9\.-]*)(?:\s+(.+?))?(?:\s+(concurrently))?\s*$")
+    CONCURRENTLY = "concurrently"
+
+    expands = True
+
+    def execute(self, context: Context) -> Result:
+        self.rows(context)
+
+        return Result()
+
+    def rows(self, context: Context) -> List[Any]:
+        blocks = [argument for argument in self.arguments if isinstance(argument, BlockArgument)]
+        sources = [
+            argument for argument in self.arguments[1:]
+            if not isinstance(argument, BlockArgument) and argument.value != self.CONCURRENTLY
+        ]
+        if blocks:
+            value = blocks[0].parse(context)
+        elif sources:
+            value = load_fixture(sources[0].interpolate(context))
+        else:
+            raise RuntimeError(f"Missing rows source in `{self.id()}` command, pass a file or a code block.")
+
+        if isinstance(value, (str, bytes)) or not hasattr(value, "__iter__") or hasattr(value, "keys"):
+            raise ValueError(f"Rows of `{self.id()}` command must be a list, got `{type(value).__name__}`.")
+
+        return list(value)
+
+    def bind(self, context: Context, row: Any) -> None:
+        Path.compile(self.target).set(context, row)
+
+    @property
+    def target(self) -> str:
+        if not self.arguments:
+            raise RuntimeError(f"Missing variable name in `{self.id()}` command.")
+
+        return self.arguments[0].value
+
+    @property
+    def concurrent(self) -> bool:
+        return any(
+            argument.value == self.CONCURRENTLY
+            for argument in self.arguments[1:] if not isinstance(argument, BlockArgument)
+        )
+
+    def writes(self) -> Set[str]:
+        return {self.target}
+
+    @classmethod
+    def id(cls) -> str:
+        return "foreach"
+
+    @classmethod
+    def line_arguments(cls) -> Pattern:
+        return cls.LINE_ARGUMENTS
@@ -1,12 +1,130 @@
-from .command import Command
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Dict, Optional, Pattern, Set
+
+from ..interpolation.path import Path
+from .command import BlockArgument, Command, Context, Error, Result, run_blocking
+
+if TYPE_CHECKING:
+    from ..http.client import Request
+
+_CONTENT_TYPES = {
+    "json": "application/json",
+    "yaml": "application/yaml",
+    "xml": "application/xml",
+    "html": "text/html",
+    "form": "application/x-www-form-urlencoded",
+}
 
 
 class HttpCommand(Command):
+    """
+    Example usage:
+    ```
+    get http://localhost:8080/users
+    post {{ config.url }}/users > created_user
+    ```
+    Request body is passed as a code block, a code block of `headers` type holds `Name: value` lines.
+    Response is stored in `response` variable unless other name is given after `>`.
+    """
+    LINE_ARGUMENTS = re.compile(r"(.+?)(?:\s*>\s*([_a-z][_a-z0-9\.-]*))?\s*$")
+    DEFAULT_TARGET = "response"
+
     method: str
-    url: str
-    headers: dict
-    body: bytes
+    side_effects = True
+
+    def execute(self, context: Context) -> Result:
+        if not self.arguments:
+            raise RuntimeError(f"Missing url argument in `{self.id()}` command.")
+
+        from http.client import HTTPException
+        from ..http.client import get_transport
+
+        result = Result()
+        try:
+            response = get_transport().perform(self.create_request(context))
+        except (OSError, HTTPException) as error:
+            result.error = Error(error)
+            return result
+
+        Path.compile(self.target).set(context, response.to_dict())
+        result.output = repr(response)
+
+        return result
+
+    async def execute_async(self, context: Context) -> Result:
+        return await run_blocking(self.execute, context)
+
+    def create_request(self, context: Context) -> Request:
+        from ..http.client import Request
+
+        url = self.arguments[0].interpolate(context)
+        headers: Dict[str, str] = {}
+        body: Optional[bytes] = None
+
+        for argument in self.arguments[1:]:
+            if not isinstance(argument, BlockArgument):
+                continue
+            if argument.content_type == "headers":
+                headers.update(self._parse_headers(argument.interpolate(context)))
+                continue
+            body = argument.interpolate(context).encode("utf-8")
+            if argument.content_type in _CONTENT_TYPES:
+                headers.setdefault("Content-Type", _CONTENT_TYPES[argument.content_type])
+            else:
+                headers.setdefault("Content-Type", "text/plain")
+
+        return Request(self.method, url, headers, body)
 
+    @property
+    def target(self) -> str:
+        if len(self.arguments) > 1 and not isinstance(self.arguments[1], BlockArgument):
+            return self.arguments[1].value
 
-class PostCommand(Command):
+        return self.DEFAULT_TARGET
+
+    def writes(self) -> Set[str]:
+        return {self.target}
+
+    @staticmethod
+    def _parse_headers(value: str) -> Dict[str, str]:
+        headers = {}
+        for line in value.splitlines():
+            if not line.strip():
+                continue
+            name, separator, header_value = line.partition(":")
+            if not separator:
+                raise ValueError(f"Invalid header line `{line}`, expected `Name: value` format.")
+            headers[name.strip()] = header_value.strip()
+
+        return headers
+
+    @classmethod
+    def id(cls) -> str:
+        return cls.method
+
+    @classmethod
+    def line_arguments(cls) -> Pattern:
+        return cls.LINE_ARGUMENTS
+
+
+class GetCommand(HttpCommand):
+    method = "get"
+    side_effects = False
+
+
+class PostCommand(HttpCommand):
     method = "post"
+
+
+class PutCommand(HttpCommand):
+    method = "put"
+
+
+class PatchCommand(HttpCommand):
+    method = "patch"
+
+
+class DeleteCommand(HttpCommand):
+    method = "delete"
@@ -0,0 +1,46 @@
+import re
+from typing import Optional, Pattern, Set
+
+from .command import Command, Context, Result
+from .fixtures import load_fixture
+from ..interpolation.path import Path
+
+
+class LoadCommand(Command):
+    """
+    Example usage:
+    ```
+    load payload ./fixtures/big.json
+    load users.0 ./fixtures/user.yaml
+    load rows ./fixtures/rows.ndjson stream
+    ```
+    Files are loaded once per process, loaded values are read-only and shared by all tests. Json and ndjson files
+    are memory-mapped and decoded a window at a time, yaml files are parsed while being read, csv and text files
+    are read whole.
+    With `stream` flag json arrays and ndjson files are decoded item by item while being iterated.
+    """
+    LINE_ARGUMENTS = re.compile(r"([_a-z][_a-z0-9\\.-]*)\s+(.+?)(?:\s+(stream))?\s*$")
+
+    def execute(self, context: Context) -> Result:
+        if len(self.arguments) not in (2, 3):
+            raise RuntimeError(f"Invalid number of arguments passed to `{self.id()}` command. Expected `2` or `3`, got `{len(self.arguments)}`")
+        value = load_fixture(self.arguments[1].interpolate(context), len(self.arguments) == 3)
+        Path.compile(str(self.arguments[0].parse(context))).set(context, value)
+
+        return Result()
+
+    def writes(self) -> Optional[Set[str]]:
+        if not self.arguments:
+            return set()
+        if self.arguments[0].variables:
+            return None
+
+        return {self.arguments[0].value}
+
+    @classmethod
+    def id(cls) -> str:
+        return "load"
+
+    @classmethod
+    def line_arguments(cls) -> Pattern:
+        return cls.LINE_ARGUMENTS
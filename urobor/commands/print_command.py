@@ -13,6 +13,7 @@ class PrintCommand(Command):
     ```
     """
     LINE_ARGUMENTS = re.compile(r"([^>]+)(?<!\s)\s*(?:>\s*(.+)?(?<!\s)\s*)?")
+    side_effects = True
 
     def execute(self, context: Context) -> Result:
         if len(self.arguments) != 2:
@@ -0,0 +1,533 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from . import decoders
+
+MAX_ERRORS = 10
+_ANNOTATIONS = {
+    "$schema", "$id", "$anchor", "$comment", "title", "description", "default", "examples", "example", "format",
+    "definitions", "$defs", "readOnly", "writeOnly", "deprecated", "contentMediaType", "contentEncoding",
+    "discriminator", "xml", "externalDocs",
+}
+_STREAM_KEYWORDS = {"type", "items", "minItems", "maxItems"}
+
+# Paths are linked pairs `(parent, key)`, they are only turned into strings when an error is reported.
+ErrorPath = Optional[Tuple[Any, Any]]
+Check = Callable[[Any, ErrorPath, List[str]], None]
+
+
+def _is_integer(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) or isinstance(value, float) and value.is_integer()
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, Mapping),
+    "array": lambda value: isinstance(value, (list, tuple)),
+    "string": lambda value: isinstance(value, str),
+    "integer": _is_integer,
+    "number": _is_number,
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+class ValidationError(AssertionError):
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__("\n".join(errors))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return ValidationError, (self.errors,)
+
+
+class Validator:
+    """
+    Schema compiled into nested checks, keywords are looked up once when compiling and not on every validation.
+    Validation keywords of drafts 4 to 2020-12 are supported, including boolean `exclusiveMinimum`/`exclusiveMaximum`
+    of draft 4 and OpenAPI `nullable`, references have to be local. Annotations like `format` are ignored, other
+    keywords like `unevaluatedProperties` or `$dynamicRef` are rejected.
+    """
+    __slots__ = ("schema", "_check", "_references")
+
+    def __init__(self, schema: Any):
+        self.schema = schema
+        self._references: Dict[str, Check] = {}
+        self._check = self._compile(schema)
+
+    def validate(self, value: Any) -> List[str]:
+        errors: List[str] = []
+        self._check(value, None, errors)
+
+        return errors[:MAX_ERRORS]
+
+    def validate_stream(self, items: Iterable[Any]) -> List[str]:
+        """
+        Validates items of an array one by one as they are produced, so neither the whole array nor more than
+        one item is held in memory. Only `type`, `items`, `minItems` and `maxItems` are allowed on the top level.
+        """
+        schema = self.schema if isinstance(self.schema, Mapping) else {}
+        unsupported = set(schema) - _STREAM_KEYWORDS - _ANNOTATIONS
+        if unsupported or schema.get("type", "array") != "array" or isinstance(schema.get("items"), list):
+            raise ValueError("Streamed values can be validated only against array schemas with `items`.")
+
+        check = self._compile(schema["items"]) if "items" in schema else None
+        errors: List[str] = []
+        count = 0
+        for count, item in enumerate(items, 1):
+            if check is not None:
+                check(item, (None, count - 1), errors)
+                if len(errors) >= MAX_ERRORS:
+                    return errors[:MAX_ERRORS]
+
+        if "minItems" in schema and count < schema["minItems"]:
+            errors.append(f"`$`: expected at least {schema['minItems']} items, got {count}")
+        if "maxItems" in schema and count > schema["maxItems"]:
+            errors.append(f"`$`: expected at most {schema['maxItems']} items, got {count}")
+
+        return errors
+
+    def _compile(self, schema: Any) -> Check:
+        if schema is True or schema == {}:
+            return _accept
+        if schema is False:
+            return lambda value, path, errors: errors.append(f"`{format_path(path)}`: no value is allowed")
+        if not isinstance(schema, Mapping):
+            raise ValueError(f"Schema must be an object or a boolean, got `{schema!r}`.")
+        if "$ref" in schema:
+            return self._reference(schema["$ref"])
+
+        checks = []
+        compiled = set()
+        for keyword, value in schema.items():
+            if keyword in _ANNOTATIONS or keyword == "nullable":
+                continue
+            if keyword in _GROUPED:
+                compile_group = _GROUPED[keyword]
+                if compile_group not in compiled:
+                    compiled.add(compile_group)
+                    checks.append(compile_group(self, schema))
+                continue
+            if keyword not in _KEYWORDS:
+                raise ValueError(f"Unsupported schema keyword `{keyword}`.")
+            checks.append(_KEYWORDS[keyword](self, value, schema))
+
+        if not checks:
+            check = _accept
+        elif len(checks) == 1:
+            check = checks[0]
+        else:
+            def check(value: Any, path: ErrorPath, errors: List[str]) -> None:
+                for subcheck in checks:
+                    subcheck(value, path, errors)
+
+        if schema.get("nullable") is True:
+            return lambda value, path, errors: None if value is None else check(value, path, errors)
+
+        return check
+
+    def _reference(self, reference: str) -> Check:
+        if not reference.startswith("#"):
+            raise ValueError(f"Only local schema references are supported, got `{reference}`.")
+        if reference not in self._references:
+            # Placeholder allows recursive schemas, it is replaced before the first validation.
+            self._references[reference] = _accept
+            target = self.schema
+            for key in reference[1:].split("/")[1:]:
+                key = key.replace("~1", "/").replace("~0", "~")
+                if not isinstance(target, Mapping) or key not in target:
+                    raise ValueError(f"Unresolvable schema reference `{reference}`.")
+                target = target[key]
+            self._references[reference] = self._compile(target)
+        references = self._references
+
+        return lambda value, path, errors: references[reference](value, path, errors)
+
+
+def _accept(value: Any, path: ErrorPath, errors: List[str]) -> None:
+    ...
+
+
+def format_path(path: ErrorPath) -> str:
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+
+    return "$" + "".join(reversed(keys))
+
+
+def _describe(value: Any) -> str:
+    for name in ("null", "boolean", "integer", "number", "string", "array", "object"):
+        if _TYPES[name](value):
+            return name
+
+    return type(value).__name__
+
+
+def _type(validator: Validator, expected: Any, schema: Mapping) -> Check:
+    names = [expected] if isinstance(expected, str) else list(expected)
+    unknown = [name for name in names if name not in _TYPES]
+    if unknown:
+        raise ValueError(f"Unknown schema type `{unknown[0]}`.")
+    tests = [_TYPES[name] for name in names]
+    description = " or ".join(names)
+
+    def check(value: Any, path: ErrorPath, errors: List[str]) -> None:
+        if not any(test(value) for test in tests):
+            errors.append(f"`{format_path(path)}`: expected {description}, got {_describe(value)}")
+
+    return check
+
+
+def _enum(validator: Validator, options: Any, schema: Mapping) -> Check:
+    options = list(options)
+
+    def check(value: Any, path: ErrorPath, errors: List[str]) -> None:
+        if not any(_equal(value, option) for option in options):
+            errors.append(f"`{format_path(path)}`: expected one of {options!r}, got {value!r}")
+
+    return check
+
+
+def _const(validator: Validator, expected: Any, schema: Mapping) -> Check:
+    def check(value: Any, path: ErrorPath, errors: List[str]) -> None:
+        if not _equal(value, expected):
+            errors.append(f"`{format_path(path)}`: expected {expected!r}, got {value!r}")
+
+    return check
+
+
+def _equal(value: Any, expected: Any) -> bool:
+    if isinstance(value, bool) or isinstance(expected, bool):
+        return type(value) is type(expected) and value == expected
+    if isinstance(value, (list, tuple)) and isinstance(expected, (list, tuple)):
+        return len(value) == len(expected) and all(_equal(item, other) for item, other in zip(value, expected))
+
+    return value == expected
+
+
+def _object(validator: Validator, schema: Mapping) -> Check:
+    properties = [(name, validator._compile(subschema)) for name, subschema in schema.get("properties", {}).items()]
+    patterns = [(re.compile(pattern), validator._compile(subschema)) for pattern, subschema in schema.get("patternProperties", {}).items()]
+    required = list(schema.get("required", ()))
+    additional = schema.get("additionalProperties", True)
+    additional_check = None if additional is True else validator._compile(additional)
+    names_check = validator._compile(schema["propertyNames"]) if "propertyNames" in schema else None
+    dependent_required = {name: list(names) for name, names in schema.get("dependentRequired", {}).items()}
+    dependent_schemas = {name: validator._compile(subschema) for name, subschema in schema.get("dependentSchemas", {}).items()}
+    for name, dependency in schema.get("dependencies", {}).items():
+        if isinstance(dependency, list):
+            dependent_required[name] = dependency
+        else:
+            dependent_schemas[name] = validator._compile(dependency)
+    minimum, maximum = schema.get("minProperties"), schema.get("maxProperties")
+    known = {name for name, _ in properties}
+
+    def check(value: Any, path: ErrorPath, errors: List[str]) -> None:
+        if not isinstance(value, Mapping):
+            return
+        for name in required:
+            if name not in value:
+                errors.append(f"`{format_path(path)}`: missing required property `{name}`")
+        if minimum is not None and len(value) < minimum:
+            errors.append(f"`{format_path(path)}`: expected at least {minimum} properties, got {len(value)}")
+        if maximum is not None and len(value) > maximum:
+            errors.append(f"`{format_path(path)}`: expected at most {maximum} properties, got {len(value)}")
+        for name, names in dependent_required.items():
+            if name in value:
+                for dependency in names:
+                    if dependency not in value:
+                        errors.append(f"`{format_path(path)}`: property `{name}` requires property `{dependency}`")
+        for name, dependent_check in dependent_schemas.items():
+            if name in value:
+                dependent_check(value, path, errors)
+        for name, property_check in properties:
+            if name in value:
+                property_check(value[name], (path, name), errors)
+        if not patterns and additional_check is None and names_check is None:
+            return
+        for name in value:
+            if names_check is not None:
+                names_check(name, (path, name), errors)
+            matched = name in known
+            for pattern, pattern_check in patterns:
+                if pattern.search(name):
+                    matched = True
+                    pattern_check(value[name], (path, name), errors)
+            if matched or additional_check is None:
+                continue
+            if additional is False:
+                errors.append(f"`{format_path(path)}`: unexpected property `{name}`")
+            else:
+                additional_check(value[name], (path, name), errors)
+
+    return check
+
+
+def _array(validator: Validator, schema: Mapping) -> Check:
+    items = schema.get("items", True)
+    if isinstance(items, list):
+        positional = [validator._compile(subschema) for subschema in items]
+        rest = schema.get("additionalItems", True)
+    else:
+        positional = [validator._compile(subschema) for subschema in schema.get("prefixItems", ())]
+        rest = items
+    rest_check = None if rest is True or rest == {} else validator._compile(rest)
+    contains = validator._compile(schema["contains"]) if "contains" in schema else None
+    min_contains = schema.get("minContains", 1)
+    max_contains = schema.get("maxContains")
+    unique = schema.get("uniqueItems") is True
+
+    def check(value: Any, path: ErrorPath, errors: List[str]) -> None:
+        if not isinstance(value, (list, tuple)):
+            return
+        for index, (item, item_check) in enumerate(zip(value, positional)):
+            item_check(item, (path, index), errors)
+        if rest_check is not None:
+            for index in range(len(positional), len(value)):
+                if rest is False:
+                    errors.append(f"`{format_path(path)}`: expected at most {len(positional)} items, got {len(value)}")
+                    break
+                rest_check(value[index], (path, index), errors)
+                if len(errors) >= MAX_ERRORS:
+                    return
+        if contains is not None:
+            matched = 0
+            for item in value:
+                suberrors: List[str] = []
+                contains(item, path, suberrors)
+                matched += not suberrors
+            if matched < min_contains or max_contains is not None and matched > max_contains:
+                errors.append(f"`{format_path(path)}`: {matched} items match `contains` schema")
+        if unique:
+            seen = set()
+            for index, item in enumerate(value):
+                key = _canonical(item)
+                if key in seen:
+                    errors.append(f"`{format_path(path)}`: item {index} is not unique")
+                    break
+                seen.add(key)
+
+    return check
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, bool) or value is None:
+        return value, type(value).__name__
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, Mapping):
+        return "object", tuple(sorted((key, _canonical(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return "array", tuple(_canonical(item) for item in value)
+
+    return value
+
+
+def _conditional(validator: Validator, schema: Mapping) -> Check:
+    condition = validator._compile(schema.get("if", True))
+    then_check = validator._compile(schema.get("then", True))
+    else_check = validator._compile(schema.get("else", True))
+
+    def check(value: Any, path: ErrorPath, errors: List[str]) -> None:
+        suberrors: List[str] = []
+        condition(value, path, suberrors)
+        (else_check if suberrors else then_check)(value, path, errors)
+
+    return check
+
+
+def _limit(kind: type, message: str, compare: Callable[[Any, Any], bool], measure: Callable[[Any], Any]) -> Callable:
+    def compile_limit(validator: Validator, limit: Any, schema: Mapping) -> Check:
+        def check(value: Any, path: ErrorPath, errors: List[str]) -> None:
+            if isinstance(value, kind) and not isinstance(value, bool) and not compare(measure(value), limit):
+                errors.append(f"`{format_path(path)}`: expected {message} {limit}, got {measure(value)}")
+
+        return check
+
+    return compile_limit
+
+
+def _bound(keyword: str, inclusive: Callable, exclusive: Callable) -> Callable:
+    """
+    `minimum` and `maximum` become exclusive when draft 4 boolean `exclusiveMinimum`/`exclusiveMaximum` is set.
+    """
+    def compile_bound(validator: Validator, limit: Any, schema: Mapping) -> Check:
+        if schema.get(keyword) is True:
+            return exclusive(validator, limit, schema)
+
+        return inclusive(validator, limit, schema)
+
+    return compile_bound
+
+
+def _exclusive(compile_limit: Callable) -> Callable:
+    def compile_exclusive(validator: Validator, limit: Any, schema: Mapping) -> Check:
+        if isinstance(limit, bool):
+            return _accept
+
+        return compile_limit(validator, limit, schema)
+
+    return compile_exclusive
+
+
+def _multiple_of(validator: Validator, divisor: Any, schema: Mapping) -> Check:
+    if isinstance(divisor, bool) or not isinstance(divisor, (int, float)) or divisor <= 0:
+        raise ValueError(f"`multipleOf` must be a positive number, got `{divisor!r}`.")
+
+    def check(value: Any, path: ErrorPath, errors: List[str]) -> None:
+        if not _is_number(value):
+            return
+        if isinstance(value, int) and isinstance(divisor, int):
+            valid = value % divisor == 0
+        else:
+            quotient = value / divisor
+            valid = abs(quotient - round(quotient)) <= 1e-9 * max(1.0, abs(quotient))
+        if not valid:
+            errors.append(f"`{format_path(path)}`: expected multiple of {divisor}, got {value}")
+
+    return check
+
+
+def _pattern(validator: Validator, pattern: str, schema: Mapping) -> Check:
+    compiled = re.compile(pattern)
+
+    def check(value: Any, path: ErrorPath, errors: List[str]) -> None:
+        if isinstance(value, str) and not compiled.search(value):
+            errors.append(f"`{format_path(path)}`: {value!r} does not match `{pattern}`")
+
+    return check
+
+
+def _all_of(validator: Validator, schemas: List[Any], schema: Mapping) -> Check:
+    checks = [validator._compile(subschema) for subschema in schemas]
+
+    def check(value: Any, path: ErrorPath, errors: List[str]) -> None:
+        for subcheck in checks:
+            subcheck(value, path, errors)
+
+    return check
+
+
+def _any_of(validator: Validator, schemas: List[Any], schema: Mapping) -> Check:
+    checks = [validator._compile(subschema) for subschema in schemas]
+
+    def check(value: Any, path: ErrorPath, errors: List[str]) -> None:
+        for subcheck in checks:
+            suberrors: List[str] = []
+            subcheck(value, path, suberrors)
+            if not suberrors:
+                return
+        errors.append(f"`{format_path(path)}`: value does not match any of `anyOf` schemas")
+
+    return check
+
+
+def _one_of(validator: Validator, schemas: List[Any], schema: Mapping) -> Check:
+    checks = [validator._compile(subschema) for subschema in schemas]
+
+    def check(value: Any, path: ErrorPath, errors: List[str]) -> None:
+        matched = 0
+        for subcheck in checks:
+            suberrors: List[str] = []
+            subcheck(value, path, suberrors)
+            matched += not suberrors
+        if matched != 1:
+            errors.append(f"`{format_path(path)}`: value matches {matched} of `oneOf` schemas, expected exactly 1")
+
+    return check
+
+
+def _not(validator: Validator, subschema: Any, schema: Mapping) -> Check:
+    subcheck = validator._compile(subschema)
+
+    def check(value: Any, path: ErrorPath, errors: List[str]) -> None:
+        suberrors: List[str] = []
+        subcheck(value, path, suberrors)
+        if not suberrors:
+            errors.append(f"`{format_path(path)}`: value must not match `not` schema")
+
+    return check
+
+
+_MINIMUM = _limit((int, float), "at least", lambda value, limit: value >= limit, lambda value: value)
+_MAXIMUM = _limit((int, float), "at most", lambda value, limit: value <= limit, lambda value: value)
+_MORE_THAN = _limit((int, float), "more than", lambda value, limit: value > limit, lambda value: value)
+_LESS_THAN = _limit((int, float), "less than", lambda value, limit: value < limit, lambda value: value)
+
+# Keywords depending on each other are compiled together into a single check.
+_GROUPS: List[Tuple[Tuple[str, ...], Callable[[Validator, Mapping], Check]]] = [
+    ((
+        "properties", "patternProperties", "additionalProperties", "required", "propertyNames", "minProperties",
+        "maxProperties", "dependentRequired", "dependentSchemas", "dependencies",
+    ), _object),
+    (("items", "prefixItems", "additionalItems", "contains", "minContains", "maxContains", "uniqueItems"), _array),
+    (("if", "then", "else"), _conditional),
+]
+_GROUPED = {keyword: compile_group for keywords, compile_group in _GROUPS for keyword in keywords}
+_KEYWORDS: Dict[str, Callable[[Validator, Any, Mapping], Check]] = {
+    "type": _type,
+    "enum": _enum,
+    "const": _const,
+    "minItems": _limit((list, tuple), "at least", lambda size, limit: size >= limit, len),
+    "maxItems": _limit((list, tuple), "at most", lambda size, limit: size <= limit, len),
+    "minLength": _limit(str, "length of at least", lambda size, limit: size >= limit, len),
+    "maxLength": _limit(str, "length of at most", lambda size, limit: size <= limit, len),
+    "minimum": _bound("exclusiveMinimum", _MINIMUM, _MORE_THAN),
+    "maximum": _bound("exclusiveMaximum", _MAXIMUM, _LESS_THAN),
+    "exclusiveMinimum": _exclusive(_MORE_THAN),
+    "exclusiveMaximum": _exclusive(_LESS_THAN),
+    "multipleOf": _multiple_of,
+    "pattern": _pattern,
+    "allOf": _all_of,
+    "anyOf": _any_of,
+    "oneOf": _one_of,
+    "not": _not,
+}
+
+
+def shape_to_schema(shape: Any) -> Any:
+    """
+    Turns an example document into a schema: objects require all their keys and allow others, arrays hold items
+    shaped like their first item and scalars only fix the type. `null` accepts any value.
+    """
+    if isinstance(shape, Mapping):
+        return {
+            "type": "object",
+            "required": list(shape),
+            "properties": {key: shape_to_schema(value) for key, value in shape.items()},
+        }
+    if isinstance(shape, (list, tuple)):
+        schema = {"type": "array"}
+        if shape:
+            schema["items"] = shape_to_schema(shape[0])
+        return schema
+    if shape is None:
+        return {}
+    if isinstance(shape, bool):
+        return {"type": "boolean"}
+    if isinstance(shape, int):
+        return {"type": "integer"}
+    if isinstance(shape, float):
+        return {"type": "number"}
+
+    return {"type": "string"}
+
+
+@lru_cache(maxsize=256)
+def compile_validator(content: str, content_type: str, kind: str) -> Validator:
+    """
+    Compiles `schema` or `shape` block, validators are cached by block contents and shared by all executions.
+    """
+    document = decoders.decode(content, content_type)
+    if kind == "shape":
+        return Validator(shape_to_schema(document))
+
+    return Validator(document)
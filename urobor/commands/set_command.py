@@ -1,7 +1,8 @@
 import re
-from typing import Pattern
+from typing import Optional, Pattern, Set
 
 from .command import Command, Context, Result
+from ..interpolation.path import Path
 
 
 class SetCommand(Command):
@@ -9,17 +10,28 @@ class SetCommand(Command):
     Example usage:
     ```
     set variable_name value
+    set config.url value
+    set users.0.name value
     ```
+    Dotted names write into nested objects, numeric segments address list items.
     """
     LINE_ARGUMENTS = re.compile(r"([_a-z][_a-z0-9\\.-]*)(?:\s+(.+)?(?<!\s))?\s*")
 
     def execute(self, context: Context) -> Result:
         if len(self.arguments) != 2:
             raise RuntimeError(f"Invalid number of arguments passed to `set` command. Expected `2`, got `{len(self.arguments)}`")
-        context[self.arguments[0].parse(context)] = self.arguments[1].parse(context)
+        Path.compile(str(self.arguments[0].parse(context))).set(context, self.arguments[1].parse(context))
 
         return Result()
 
+    def writes(self) -> Optional[Set[str]]:
+        if not self.arguments:
+            return set()
+        if self.arguments[0].variables:
+            return None
+
+        return {self.arguments[0].value}
+
     @classmethod
     def id(cls) -> str:
         return "set"
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from functools import lru_cache
+from os import path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .sharding import collect_units
+from .test_case import Reporter, Status, TestCase
+
+SMOOTHING = 0.5
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tests (
+    file TEXT NOT NULL,
+    path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL NOT NULL,
+    runs INTEGER NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (file, path)
+)
+"""
+
+Key = Tuple[str, str]
+
+
+class Record(NamedTuple):
+    status: Status
+    duration: float
+    runs: int
+
+
+class History(Reporter):
+    """
+    Outcomes and durations of tests from previous runs, stored in a SQLite database next to the parse cache.
+    Tests are identified by the real path of their file and their heading path. Durations are smoothed over
+    runs, so a single slow run does not reorder everything. Finished tests are written once the run finishes.
+    """
+
+    def __init__(self, directory: str):
+        self.filename = path.join(directory, "history.sqlite")
+        self._records: Optional[Dict[Key, Record]] = None
+        self._pending: Dict[Key, Tuple[Status, float]] = {}
+        self._file = ""
+
+    def get(self, filename: str, test: TestCase) -> Optional[Record]:
+        return self.records.get(_key(filename, test.path))
+
+    def duration(self, filename: str, test: TestCase) -> Optional[float]:
+        record = self.get(filename, test)
+
+        return record.duration if record else None
+
+    def failed(self, filename: str, test: TestCase) -> bool:
+        record = self.get(filename, test)
+
+        return record is not None and record.status == Status.FAILED
+
+    def durations(self, tests: Dict[str, TestCase]) -> Dict[str, float]:
+        """
+        Returns recorded durations of top-level tests keyed by shard unit id.
+        """
+        durations = {}
+        for unit in collect_units(tests):
+            duration = self.duration(unit.filename, unit.test)
+            if duration is not None:
+                durations[unit.id] = duration
+
+        return durations
+
+    def order(self, tests: Dict[str, TestCase]) -> Dict[str, TestCase]:
+        """
+        Moves tests which failed in the previous run, and files containing them, in front of the others.
+        Children are reordered in place, the order is otherwise kept.
+        """
+        for filename, root in tests.items():
+            for test in root.walk():
+                test.children.sort(key=lambda child: not self.failed(filename, child))
+
+        return dict(sorted(tests.items(), key=lambda item: not self.failed(item[0], item[1])))
+
+    def priority(self, filename: str) -> Callable[[TestCase], float]:
+        """
+        Returns expected duration of tests of the file, longest subtrees are submitted to workers first.
+        """
+        return lambda test: self.duration(filename, test) or 0.0
+
+    def file_started(self, filename: str) -> None:
+        self._file = filename
+
+    def test_finished(self, test: TestCase) -> None:
+        if test.status in (Status.PASSED, Status.FAILED):
+            self._pending[_key(self._file, test.path)] = (test.status, test.duration)
+
+    def run_finished(self) -> None:
+        self.save()
+
+    def save(self) -> None:
+        if not self._pending:
+            return
+
+        now = time.time()
+        rows = []
+        for key, (status, duration) in self._pending.items():
+            previous = self.records.get(key)
+            if previous is not None:
+                duration = SMOOTHING * duration + (1 - SMOOTHING) * previous.duration
+            runs = previous.runs + 1 if previous else 1
+            self.records[key] = Record(status, duration, runs)
+            rows.append((key[0], key[1], status.name.lower(), duration, runs, now))
+        self._pending.clear()
+
+        os.makedirs(path.dirname(self.filename) or ".", exist_ok=True)
+        with self._connect() as connection:
+            connection.executemany("INSERT OR REPLACE INTO tests VALUES (?, ?, ?, ?, ?, ?)", rows)
+        connection.close()
+
+    @property
+    def records(self) -> Dict[Key, Record]:
+        if self._records is None:
+            self._records = {}
+            if path.isfile(self.filename):
+                try:
+                    self._records = self._load()
+                except sqlite3.DatabaseError:
+                    pass
+
+        return self._records
+
+    def _load(self) -> Dict[Key, Record]:
+        records = {}
+        connection = self._connect()
+        try:
+            for file, test_path, status, duration, runs in connection.execute(
+                "SELECT file, path, status, duration, runs FROM tests"
+            ):
+                records[(file, test_path)] = Record(Status[status.upper()], duration, runs)
+        finally:
+            connection.close()
+
+        return records
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.filename, timeout=30.0)
+        connection.execute(_SCHEMA)
+
+        return connection
+
+
+def _key(filename: str, test_path: List[str]) -> Key:
+    return _realpath(filename), json.dumps(test_path)
+
+
+@lru_cache(maxsize=None)
+def _realpath(filename: str) -> str:
+    return path.realpath(filename)
@@ -0,0 +1,2 @@
+from .cassette import Cassette
+from .client import ConnectionPool, Request, Response, Transport, get_transport, set_transport
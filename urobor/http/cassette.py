@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from os import path
+from typing import Any, Callable, Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .client import Request, Response, Transport
+
+RECORD = "record"
+REPLAY = "replay"
+REFRESH = "refresh"
+MODES = (RECORD, REPLAY, REFRESH)
+
+DEFAULT_IGNORED_HEADERS = frozenset(["connection", "content-length", "date", "host", "user-agent"])
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class Cassette(Transport):
+    """
+    Transport recording request/response pairs to a json lines file. Requests are matched by method, url with
+    sorted query, headers without the ignored ones and body, json bodies are compared regardless of formatting.
+
+    Modes:
+    - `record` sends every request and stores the response,
+    - `replay` never touches the network, requests without recorded response fail,
+    - `refresh` replays recorded responses and sends requests which are missing or older than `max_age` seconds.
+
+    Entries are appended as they are recorded, so forked workers sharing the cassette add to the same file.
+    The file is read again and rewritten without outdated entries on `close`.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        transport: Callable[[], Transport] = None,
+        mode: str = REFRESH,
+        max_age: float = None,
+        ignored_headers: Iterable[str] = DEFAULT_IGNORED_HEADERS,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode `{mode}`, expected one of `{'`, `'.join(MODES)}`.")
+        self.filename = filename
+        self.mode = mode
+        self.max_age = max_age
+        self.ignored_headers = frozenset(name.lower() for name in ignored_headers)
+        self.hits = 0
+        self.misses = 0
+        self._create_transport = transport
+        self._transport: Optional[Transport] = None
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._outdated = 0
+        self._lock = threading.Lock()
+
+    def send(self, request: Request) -> Response:
+        key = self.key(request)
+        if self.mode != RECORD:
+            entry = self.entries.get(key)
+            if entry is not None and (self.mode == REPLAY or not self._is_stale(entry)):
+                with self._lock:
+                    self.hits += 1
+                return _decode_response(entry["response"])
+            if self.mode == REPLAY:
+                raise KeyError(f"No recorded response for `{request!r}` in cassette `{self.filename}`.")
+
+        response = self.transport.send(request)
+        self._record(key, request, response)
+
+        return response
+
+    def key(self, request: Request) -> str:
+        digest = hashlib.sha256(f"{request.method.upper()} {_normalize_url(request.url)}".encode("utf-8"))
+        headers = sorted(
+            (name.lower(), value.strip())
+            for name, value in request.headers.items()
+            if name.lower() not in self.ignored_headers
+        )
+        for name, value in headers:
+            digest.update(f"\0{name}:{value}".encode("utf-8"))
+        digest.update(b"\0\0" + _normalize_body(request))
+
+        return digest.hexdigest()
+
+    @property
+    def transport(self) -> Transport:
+        with self._lock:
+            if self._transport is None:
+                if self._create_transport is None:
+                    from .client import ConnectionPool
+
+                    self._transport = ConnectionPool()
+                else:
+                    self._transport = self._create_transport()
+
+            return self._transport
+
+    @property
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+
+            return self._entries
+
+    def close(self) -> None:
+        with self._lock:
+            if self._transport is not None:
+                self._transport.close()
+                self._transport = None
+            if self._entries is not None and self._outdated:
+                self._entries = self._load()
+                self._write(self._entries.values())
+                self._outdated = 0
+
+    def _record(self, key: str, request: Request, response: Response) -> None:
+        entry = {
+            "key": key,
+            "recorded_at": time.time(),
+            "request": f"{request.method} {request.url}",
+            "response": _encode_response(response),
+        }
+        entries = self.entries
+        with self._lock:
+            self.misses += 1
+            if key in entries:
+                self._outdated += 1
+            entries[key] = entry
+            directory = path.dirname(self.filename)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.filename, "a") as cassette_file:
+                cassette_file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        entries = {}
+        if not path.isfile(self.filename):
+            return entries
+        with open(self.filename) as cassette_file:
+            for line in cassette_file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["key"] in entries:
+                    self._outdated += 1
+                entries[entry["key"]] = entry
+
+        return entries
+
+    def _write(self, entries: Iterable[Dict[str, Any]]) -> None:
+        temporary_filename = f"{self.filename}.{os.getpid()}.tmp"
+        with open(temporary_filename, "w") as cassette_file:
+            for entry in entries:
+                cassette_file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        os.replace(temporary_filename, self.filename)
+
+    def _is_stale(self, entry: Dict[str, Any]) -> bool:
+        return self.max_age is not None and time.time() - entry["recorded_at"] > self.max_age
+
+
+def _normalize_url(url: str) -> str:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def _normalize_body(request: Request) -> bytes:
+    if not request.body:
+        return b""
+    body = request.body if isinstance(request.body, bytes) else str(request.body).encode("utf-8")
+    content_type = next((value for name, value in request.headers.items() if name.lower() == "content-type"), "")
+    if "json" in content_type:
+        try:
+            return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+        except ValueError:
+            pass
+
+    return body
+
+
+def _encode_response(response: Response) -> Dict[str, Any]:
+    value = {"status": response.status, "reason": response.reason, "headers": response.headers}
+    try:
+        value["body"] = response.body.decode("utf-8")
+    except UnicodeDecodeError:
+        value["body_base64"] = base64.b64encode(response.body).decode("ascii")
+
+    return value
+
+
+def _decode_response(value: Dict[str, Any]) -> Response:
+    if "body_base64" in value:
+        body = base64.b64decode(value["body_base64"])
+    else:
+        body = value["body"].encode("utf-8")
+
+    return Response(value["status"], value["reason"], dict(value["headers"]), body)
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import json
+import threading
+from abc import ABC, abstractmethod
+from http.client import HTTPConnection, HTTPSConnection
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .. import instrumentation
+
+_RETRYABLE_ERRORS = (ConnectionResetError, ConnectionAbortedError, BrokenPipeError)
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class Request:
+    __slots__ = ["method", "url", "headers", "body"]
+
+    def __init__(self, method: str, url: str, headers: Dict[str, str] = None, body: bytes = None):
+        self.method = method.upper()
+        self.url = url
+        self.headers = headers or {}
+        self.body = body
+
+    def __repr__(self) -> str:
+        return f"{self.method} {self.url}"
+
+
+class Response:
+    __slots__ = ["status", "reason", "headers", "body"]
+
+    def __init__(self, status: int, reason: str, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+    def to_dict(self) -> Mapping[str, Any]:
+        return ResponseValue(self)
+
+    def __repr__(self) -> str:
+        return f"{self.status} {self.reason}"
+
+
+class ResponseValue(Mapping):
+    """
+    Response stored in a context variable, `body` text and decoded `json` are computed on first access.
+    It is not a `dict`, so `Context` never copies it, and its values must not be modified.
+    """
+    __slots__ = ("response", "_values")
+    KEYS = ("status", "reason", "headers", "body", "json")
+
+    def __init__(self, response: Response):
+        self.response = response
+        self._values: Dict[str, Any] = {
+            "status": response.status,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._values:
+            self._values[key] = self._decode(key)
+
+        return self._values[key]
+
+    def _decode(self, key: str) -> Any:
+        if key == "body":
+            return self.response.text
+        if key == "json":
+            if "json" in self.response.headers.get("content-type", "") and self.response.body:
+                return self.response.json()
+            return None
+
+        raise KeyError(key)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class Transport(ABC):
+    @abstractmethod
+    def send(self, request: Request) -> Response:
+        ...
+
+    def perform(self, request: Request) -> Response:
+        """
+        Sends the request on behalf of a command, the call is reported to subscribed instruments.
+        """
+        if instrumentation.instruments:
+            with instrumentation.section(instrumentation.IO):
+                return self.send(request)
+
+        return self.send(request)
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
+
+
+class _HostPool:
+    def __init__(self, scheme: str, host: str, port: int, max_size: int, timeout: float):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._idle: List[HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def acquire(self) -> Tuple[HTTPConnection, bool]:
+        self._slots.acquire()
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+
+        return self.create(), False
+
+    def create(self) -> HTTPConnection:
+        if self.scheme == "https":
+            return HTTPSConnection(self.host, self.port, timeout=self.timeout)
+
+        return HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def release(self, connection: HTTPConnection, reusable: bool) -> None:
+        if reusable:
+            with self._lock:
+                self._idle.append(connection)
+        else:
+            connection.close()
+        self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._idle:
+                connection.close()
+            self._idle.clear()
+
+
+class ConnectionPool(Transport):
+    """
+    Thread-safe pool of keep-alive connections, at most `max_size` connections are open per host.
+    Connections are reused by all tests and thread workers sharing the pool, process workers get a pool each.
+    """
+
+    def __init__(self, max_size: int = 10, timeout: float = 30.0):
+        if max_size < 1:
+            raise ValueError(f"Pool size must be a positive integer, `{max_size}` given.")
+        self.max_size = max_size
+        self.timeout = timeout
+        self.created = 0
+        self.reused = 0
+        self._hosts: Dict[Tuple[str, str, int], _HostPool] = {}
+        self._lock = threading.Lock()
+
+    def send(self, request: Request) -> Response:
+        url = urlsplit(request.url)
+        if url.scheme not in _DEFAULT_PORTS:
+            raise ValueError(f"Unsupported url `{request.url}`, only http and https urls are supported.")
+        host_pool = self._host_pool(url.scheme, url.hostname, url.port or _DEFAULT_PORTS[url.scheme])
+        target = (url.path or "/") + (f"?{url.query}" if url.query else "")
+
+        connection, reused = host_pool.acquire()
+        try:
+            response, reusable = self._send(connection, request, target)
+        except _RETRYABLE_ERRORS:
+            connection.close()
+            if not reused:
+                host_pool.release(connection, False)
+                raise
+            connection = host_pool.create()
+            reused = False
+            try:
+                response, reusable = self._send(connection, request, target)
+            except BaseException:
+                host_pool.release(connection, False)
+                raise
+        except BaseException:
+            host_pool.release(connection, False)
+            raise
+
+        with self._lock:
+            if reused:
+                self.reused += 1
+            else:
+                self.created += 1
+        host_pool.release(connection, reusable)
+
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            for host_pool in self._hosts.values():
+                host_pool.close()
+            self._hosts.clear()
+
+    def _host_pool(self, scheme: str, host: str, port: int) -> _HostPool:
+        key = (scheme, host, port)
+        with self._lock:
+            if key not in self._hosts:
+                self._hosts[key] = _HostPool(scheme, host, port, self.max_size, self.timeout)
+
+            return self._hosts[key]
+
+    @staticmethod
+    def _send(connection: HTTPConnection, request: Request, target: str) -> Tuple[Response, bool]:
+        connection.request(request.method, target, body=request.body, headers=request.headers)
+        raw_response = connection.getresponse()
+        body = raw_response.read()
+        headers = {name.lower(): value for name, value in raw_response.getheaders()}
+
+        return Response(raw_response.status, raw_response.reason, headers, body), not raw_response.will_close
+
+
+_transport: Optional[Transport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> Transport:
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = ConnectionPool()
+
+        return _transport
+
+
+def set_transport(transport: Optional[Transport]) -> None:
+    global _transport
+    with _transport_lock:
+        if _transport is not None and _transport is not transport:
+            _transport.close()
+        _transport = transport
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import threading
+from contextlib import ExitStack, contextmanager, nullcontext
+from typing import TYPE_CHECKING, Any, ContextManager, Iterator, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .test_case import TestCase
+
+COMMAND = "command"
+INTERPOLATION = "interpolation"
+IO = "io"
+DEEPCOPY = "deepcopy"
+CONTEXT_COPY = "context_copy"
+
+
+class Instrument:
+    """
+    Observer of test runs subscribed with `subscribe`. Sections are entered around command execution, template
+    rendering, transport calls, context copies and deep copies of shared values. They may be entered from many
+    threads and asyncio tasks at once, blocking calls of asynchronous commands run in the context of their task.
+    """
+
+    def section(self, category: str, name: str, test: Optional[TestCase]) -> ContextManager[None]:
+        """
+        Returns a context manager wrapping the section, `name` is the command id for commands and the category
+        otherwise, `test` is passed for commands only.
+        """
+        return nullcontext()
+
+    def copied(self, value: Any) -> None:
+        """
+        Receives every value deep-copied into a context scope.
+        """
+
+
+# Hooks check this tuple first, nothing is called while it is empty.
+instruments: Tuple[Instrument, ...] = ()
+_lock = threading.Lock()
+
+
+def subscribe(instrument: Instrument) -> None:
+    global instruments
+    with _lock:
+        instruments = (*instruments, instrument)
+
+
+def unsubscribe(instrument: Instrument) -> None:
+    global instruments
+    with _lock:
+        instruments = tuple(subscribed for subscribed in instruments if subscribed is not instrument)
+
+
+@contextmanager
+def section(category: str, name: str = None, test: TestCase = None) -> Iterator[None]:
+    with ExitStack() as stack:
+        for instrument in instruments:
+            stack.enter_context(instrument.section(category, name or category, test))
+        yield
+
+
+def copied(value: Any) -> None:
+    for instrument in instruments:
+        instrument.copied(value)
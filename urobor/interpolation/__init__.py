@@ -0,0 +1,17 @@
+from .interpolated_string import InterpolatedString
+
+_FUNCTIONS = "urobor.interpolation.functions"
+_MODIFIERS = "urobor.interpolation.modifiers"
+
+InterpolatedString.register_function("uuid", f"{_FUNCTIONS}:create_uuid")
+InterpolatedString.register_function("objectid", f"{_FUNCTIONS}:create_object_id")
+InterpolatedString.register_function("date", f"{_FUNCTIONS}:create_iso_date")
+InterpolatedString.register_function("datetime", f"{_FUNCTIONS}:create_iso_datetime")
+InterpolatedString.register_function("time", f"{_FUNCTIONS}:create_iso_time")
+
+InterpolatedString.register_filter("uppercase", f"{_MODIFIERS}:string_to_upper", pure=True)
+InterpolatedString.register_filter("lowercase", f"{_MODIFIERS}:string_to_lower", pure=True)
+InterpolatedString.register_filter("snakecase", f"{_MODIFIERS}:string_to_snake_case", pure=True)
+InterpolatedString.register_filter("hyphens", f"{_MODIFIERS}:string_to_hyphens", pure=True)
+InterpolatedString.register_filter("strip", f"{_MODIFIERS}:string_strip", pure=True)
+InterpolatedString.register_filter("replace", f"{_MODIFIERS}:string_replace", pure=True)
@@ -1,8 +1,6 @@
 import uuid
 from datetime import datetime
 
-from bson import ObjectId
-
 
 def create_iso_time() -> str:
     return datetime.utcnow().isoformat("T", timespec="seconds").split("T")[1]
@@ -17,6 +15,8 @@ def create_iso_datetime() -> str:
 
 
 def create_object_id() -> str:
+    from bson import ObjectId
+
     return str(ObjectId())
 
 
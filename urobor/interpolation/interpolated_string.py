@@ -1,6 +1,14 @@
+from __future__ import annotations
+
 import re
-from functools import cached_property
-from typing import Any, Dict, List, Mapping
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+from .. import instrumentation
+from .memoization import CacheStats, PureCallable
+from .path import MISSING, Path
 
 _NAME_PATTERN = r"[_a-z][_a-z0-9-]*"
 _FUNCTION_PATTERN = _NAME_PATTERN + r"\s{0,1}\([^\)]*\)\s*"
@@ -35,6 +43,7 @@ class InterpolatedString:
 
     FILTERS = {}
     FUNCTIONS = {}
+    REGISTRY_VERSION = 0
 
     OPEN_SEQUENCE = "{{"
     CLOSE_SEQUENCE = "}}"
@@ -42,85 +51,16 @@ class InterpolatedString:
     def __init__(self, template: str):
         self.template = template
 
-    @cached_property
-    def pattern(self) -> Any:
-        return re.compile(
-            escape_sequence(InterpolatedString.OPEN_SEQUENCE)
-            + _PLACEHOLDER_PATTERN
-            + escape_sequence(InterpolatedString.CLOSE_SEQUENCE)
-        )
-
-    @cached_property
-    def escaped_template(self) -> str:
-        return self._escape_template(self.template)
+    @property
+    def compiled(self) -> CompiledTemplate:
+        return InterpolatedString.compile(self.template)
 
     def interpolate(self, mapping: Mapping) -> str:
-        template = self.escaped_template
-
-        def convert(match: re.Match) -> str:
-            if match.group("invalid"):
-                i = match.start("invalid")
-                lines = self.template[:i].splitlines(keepends=True)
-                if not lines:
-                    column_no = 1
-                    line_no = 1
-                else:
-                    column_no = i - len("".join(lines[:-1]))
-                    line_no = len(lines)
-                raise ValueError(
-                    f"Invalid placeholder `{match.group('invalid')}` on line `{line_no}`, at column `{column_no}`"
-                )
-
-            name = match.group("name").strip()
-            filters = [item.strip() for item in match.group("filters").split("|")[1:]]
-
-            if "." in name:
-                value = self._resolve_value(name.split("."), mapping)
-            elif name in mapping:
-                value = mapping[name]
-            elif name.endswith(")"):
-                extra_pos = name.find("(")
-                func_name = name[:extra_pos].strip()
-                func_extra = name[extra_pos + 1: -1].strip()
-                if func_name not in self.FUNCTIONS:
-                    raise RuntimeError(
-                        f"Call to unknown function `{func_name}`, "
-                        f"use`InterpolatedString.register_function` to register your function."
-                    )
-                if func_extra:
-                    value = self.FUNCTIONS[func_name](func_extra)
-                else:
-                    value = self.FUNCTIONS[func_name]()
-            else:
-                return ""
-
-            if not filters:
-                return str(value)
-
-            return self._apply_filters(value, filters)
-
-        return self._unescape_template(self.pattern.sub(convert, template))
-
-    @staticmethod
-    def _apply_filters(value: str, filters: List[str]) -> str:
-        for item in filters:
-            extra_position = item.find(" ")
-            if extra_position < 0:
-                filter_name = item
-                filter_extra = ""
-            else:
-                filter_name = item[:extra_position]
-                filter_extra = item[extra_position + 1:].strip()
+        return self.compiled.render(mapping)
 
-            if filter_name not in InterpolatedString.FILTERS:
-                raise KeyError(f"Filter `{filter_name}` not found.")
-
-            if filter_extra:
-                value = InterpolatedString.FILTERS[filter_name](value, filter_extra)
-            else:
-                value = InterpolatedString.FILTERS[filter_name](value)
-
-        return value
+    @classmethod
+    def compile(cls, template: str) -> CompiledTemplate:
+        return _compile_template(template, cls.OPEN_SEQUENCE, cls.CLOSE_SEQUENCE)
 
     @staticmethod
     def _escape_template(template: str) -> str:
@@ -138,35 +78,228 @@ class InterpolatedString:
         template = template.replace("&escape_close_sequence;", InterpolatedString.CLOSE_SEQUENCE)
         return template
 
-    @staticmethod
-    def _resolve_value(path: List[str], mapping: Mapping) -> Any:
-        value = mapping
-        for item in path:
-            if item in value:
-                value = value[item]
-            else:
-                return ""
-
-        return value
-
     @classmethod
-    def register_function(cls, name: str, function: callable) -> None:
-        cls.FUNCTIONS[name] = function
+    def register_function(cls, name: str, function: Union[callable, str], pure: bool = False) -> None:
+        """
+        Function can be passed as `module:attribute` string, it is imported when first template calls it.
+        Results of `pure` functions are memoized, functions returning different values for the same arguments
+        like `uuid()` must not be registered as pure.
+        """
+        cls.FUNCTIONS[name] = PureCallable(function) if pure else function
+        cls.REGISTRY_VERSION += 1
 
     @classmethod
-    def register_filter(cls, name: str, function: callable) -> None:
-        cls.FILTERS[name] = function
+    def register_filter(cls, name: str, function: Union[callable, str], pure: bool = False) -> None:
+        """
+        Filter can be passed as `module:attribute` string, it is imported when first template uses it.
+        Results of `pure` filters are memoized.
+        """
+        cls.FILTERS[name] = PureCallable(function) if pure else function
+        cls.REGISTRY_VERSION += 1
 
     @classmethod
     def unregister_function(cls, name: str) -> None:
         del cls.FUNCTIONS[name]
+        cls.REGISTRY_VERSION += 1
 
     @classmethod
     def unregister_filter(cls, name: str) -> None:
         del cls.FILTERS[name]
+        cls.REGISTRY_VERSION += 1
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, CacheStats]:
+        stats = {}
+        for kind, registry in (("function", cls.FUNCTIONS), ("filter", cls.FILTERS)):
+            for name, function in registry.items():
+                if isinstance(function, PureCallable):
+                    stats[f"{kind}:{name}"] = function.cache_stats()
+
+        return stats
 
     def __str__(self) -> str:
         return self.template
 
     def __add__(self, other: Dict[str, Any]) -> str:
         return self.interpolate(other)
+
+
+class _Placeholder(ABC):
+    __slots__ = ("filters", "_bound_filters", "_bound_version")
+
+    def __init__(self, filters: Tuple[Tuple[str, str], ...]):
+        self.filters = filters
+        self._bound_filters: Tuple[Callable[[Any], Any], ...] = ()
+        self._bound_version = -1
+
+    @abstractmethod
+    def render(self, mapping: Mapping) -> str:
+        ...
+
+    def _bind(self) -> None:
+        bound_filters = []
+        for filter_name, filter_extra in self.filters:
+            if filter_name not in InterpolatedString.FILTERS:
+                raise KeyError(f"Filter `{filter_name}` not found.")
+            bound_filters.append(_bind_extra(_load(InterpolatedString.FILTERS, filter_name), filter_extra))
+        self._bound_filters = tuple(bound_filters)
+
+    def _finalize(self, value: Any) -> str:
+        if not self.filters:
+            return str(value)
+
+        for bound_filter in self._bound_filters:
+            value = bound_filter(value)
+
+        return value
+
+
+class _VariablePlaceholder(_Placeholder):
+    __slots__ = ("name", "path")
+
+    def __init__(self, name: str, filters: Tuple[Tuple[str, str], ...]):
+        super().__init__(filters)
+        self.name = name
+        self.path = Path.compile(name)
+
+    def render(self, mapping: Mapping) -> str:
+        value = self.path.get(mapping)
+        if value is MISSING:
+            return ""
+
+        if self._bound_version != InterpolatedString.REGISTRY_VERSION:
+            self._bind()
+            self._bound_version = InterpolatedString.REGISTRY_VERSION
+
+        return self._finalize(value)
+
+
+class _FunctionPlaceholder(_Placeholder):
+    __slots__ = ("name", "extra", "_bound_function")
+
+    def __init__(self, name: str, extra: str, filters: Tuple[Tuple[str, str], ...]):
+        super().__init__(filters)
+        self.name = name
+        self.extra = extra
+        self._bound_function: Optional[Callable[[], Any]] = None
+
+    def _bind(self) -> None:
+        if self.name not in InterpolatedString.FUNCTIONS:
+            raise RuntimeError(
+                f"Call to unknown function `{self.name}`, "
+                f"use`InterpolatedString.register_function` to register your function."
+            )
+        self._bound_function = _bind_extra(_load(InterpolatedString.FUNCTIONS, self.name), self.extra, leading=False)
+        super()._bind()
+
+    def render(self, mapping: Mapping) -> str:
+        if self._bound_version != InterpolatedString.REGISTRY_VERSION:
+            self._bind()
+            self._bound_version = InterpolatedString.REGISTRY_VERSION
+
+        return self._finalize(self._bound_function())
+
+
+def _load(registry: Dict[str, Union[Callable, str]], name: str) -> Callable:
+    function = registry[name]
+    if isinstance(function, str):
+        module_name, _, attribute = function.partition(":")
+        function = getattr(import_module(module_name), attribute)
+        registry[name] = function
+
+    return function
+
+
+def _bind_extra(function: Callable, extra: str, leading: bool = True) -> Callable:
+    if not extra:
+        return function
+    if leading:
+        return lambda value: function(value, extra)
+    return lambda: function(extra)
+
+
+class CompiledTemplate:
+    """
+    Template parsed once into literal pieces and placeholder nodes, rendering just walks the nodes.
+    """
+    __slots__ = ("template", "nodes")
+
+    def __init__(self, template: str, nodes: List[Union[str, _Placeholder]]):
+        self.template = template
+        self.nodes = tuple(nodes)
+
+    @property
+    def is_constant(self) -> bool:
+        return all(isinstance(node, str) for node in self.nodes)
+
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        return tuple(node.name for node in self.nodes if isinstance(node, _VariablePlaceholder))
+
+    def render(self, mapping: Mapping) -> str:
+        if instrumentation.instruments:
+            with instrumentation.section(instrumentation.INTERPOLATION):
+                return self._render(mapping)
+
+        return self._render(mapping)
+
+    def _render(self, mapping: Mapping) -> str:
+        return "".join([node if node.__class__ is str else node.render(mapping) for node in self.nodes])
+
+    def __reduce__(self) -> Tuple[Callable, Tuple[str]]:
+        return InterpolatedString.compile, (self.template,)
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate({self.template!r})"
+
+
+@lru_cache(maxsize=None)
+def _placeholder_pattern(open_sequence: str, close_sequence: str) -> re.Pattern:
+    return re.compile(escape_sequence(open_sequence) + _PLACEHOLDER_PATTERN + escape_sequence(close_sequence))
+
+
+@lru_cache(maxsize=8192)
+def _compile_template(template: str, open_sequence: str, close_sequence: str) -> CompiledTemplate:
+    escaped_template = InterpolatedString._escape_template(template)
+    nodes = []
+    last_position = 0
+
+    for match in _placeholder_pattern(open_sequence, close_sequence).finditer(escaped_template):
+        if match.group("invalid"):
+            i = match.start("invalid")
+            lines = template[:i].splitlines(keepends=True)
+            if not lines:
+                column_no = 1
+                line_no = 1
+            else:
+                column_no = i - len("".join(lines[:-1]))
+                line_no = len(lines)
+            raise ValueError(
+                f"Invalid placeholder `{match.group('invalid')}` on line `{line_no}`, at column `{column_no}`"
+            )
+
+        if match.start() > last_position:
+            nodes.append(InterpolatedString._unescape_template(escaped_template[last_position:match.start()]))
+        last_position = match.end()
+
+        name = match.group("name").strip()
+        filters = tuple(_parse_filter(item.strip()) for item in match.group("filters").split("|")[1:])
+
+        if "." not in name and name.endswith(")"):
+            extra_pos = name.find("(")
+            nodes.append(_FunctionPlaceholder(name[:extra_pos].strip(), name[extra_pos + 1: -1].strip(), filters))
+        else:
+            nodes.append(_VariablePlaceholder(name, filters))
+
+    if last_position < len(escaped_template):
+        nodes.append(InterpolatedString._unescape_template(escaped_template[last_position:]))
+
+    return CompiledTemplate(template, nodes)
+
+
+def _parse_filter(item: str) -> Tuple[str, str]:
+    extra_position = item.find(" ")
+    if extra_position < 0:
+        return item, ""
+
+    return item[:extra_position], item[extra_position + 1:].strip()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import threading
+from functools import lru_cache
+from importlib import import_module
+from typing import Any, Callable, NamedTuple, Optional, Union
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    uncached: int
+    size: int
+    maxsize: int
+
+
+class PureCallable:
+    """
+    Memoizes a pure function in a bounded LRU cache. Calls with unhashable arguments bypass the cache and are
+    counted as `uncached`. Function can be given as `module:attribute` string, it is imported on first call.
+    """
+
+    def __init__(self, function: Union[Callable, str], maxsize: int = DEFAULT_CACHE_SIZE):
+        self.function = function
+        self.maxsize = maxsize
+        self.uncached = 0
+        self._cached: Optional[Callable] = None
+        self._lock = threading.Lock()
+
+    def __call__(self, *args: Any) -> Any:
+        cached = self._cached or self._load()
+        try:
+            return cached(*args)
+        except TypeError:
+            try:
+                hash(args)
+            except TypeError:
+                with self._lock:
+                    self.uncached += 1
+                return cached.__wrapped__(*args)
+            raise
+
+    def cache_stats(self) -> CacheStats:
+        if self._cached is None:
+            return CacheStats(0, 0, self.uncached, 0, self.maxsize)
+        info = self._cached.cache_info()
+
+        return CacheStats(info.hits, info.misses, self.uncached, info.currsize, self.maxsize)
+
+    def cache_clear(self) -> None:
+        if self._cached is not None:
+            self._cached.cache_clear()
+        self.uncached = 0
+
+    def _load(self) -> Callable:
+        with self._lock:
+            if self._cached is None:
+                function = self.function
+                if isinstance(function, str):
+                    module_name, _, attribute = function.partition(":")
+                    function = getattr(import_module(module_name), attribute)
+                    self.function = function
+                self._cached = lru_cache(maxsize=self.maxsize, typed=True)(function)
+
+        return self._cached
+
+    def __repr__(self) -> str:
+        return f"PureCallable({self.function!r})"
@@ -1,22 +1,26 @@
 import re
 
+_NON_WORD_PATTERN = re.compile(r"[\W]+")
+_SEPARATOR_PATTERN = re.compile(r"[\-\.\s]")
+_UPPERCASE_PATTERN = re.compile(r"[A-Z]")
+_UNDERSCORES_PATTERN = re.compile(r"_+")
+
 
 def string_to_snake_case(string: str) -> str:
-    string = re.sub(r"[\W]+", " ", string)  # Remove non-ASCII characters
-    string = re.sub(r"[\-\.\s]", "_", str(string))  # Replace space and hyphens
+    string = _NON_WORD_PATTERN.sub(" ", string)  # Remove non-ASCII characters
+    string = _SEPARATOR_PATTERN.sub("_", str(string))  # Replace space and hyphens
     if not string:
         return string
 
-    return re.sub(
-        r"_+",
+    return _UNDERSCORES_PATTERN.sub(
         "_",
         string[0].lower()
-        + re.sub(r"[A-Z]", lambda matched: "_" + matched.group(0).lower(), string[1:]),
+        + _UPPERCASE_PATTERN.sub(lambda matched: "_" + matched.group(0).lower(), string[1:]),
     )
 
 
 def string_to_hyphens(string: str) -> str:
-    return re.sub(r"_", "-", string_to_snake_case(string))
+    return string_to_snake_case(string).replace("_", "-")
 
 
 def string_strip(string: str) -> str:
@@ -37,4 +41,3 @@ def string_replace(string: str, extra: str = "") -> str:
         raise ValueError(f"String replace modifier expects `from > to` format, `{extra}` passed instead.")
 
     return string.replace(params[0], params[1])
-
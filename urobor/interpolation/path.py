@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Mapping, MutableMapping, Optional, Tuple
+
+MISSING = object()
+
+
+def _index(key: str) -> Optional[int]:
+    try:
+        return int(key)
+    except ValueError:
+        return None
+
+
+class Path:
+    """
+    Compiled accessor for dotted variable paths like `config.url` or `users.0.name`, numeric segments address
+    list items. Writes never modify existing containers, every container along the path is copied instead,
+    so values shared with other scopes stay intact.
+    """
+    __slots__ = ("expression", "keys", "_segments")
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.keys = tuple(expression.split("."))
+        self._segments: Tuple[Tuple[str, Optional[int]], ...] = tuple((key, _index(key)) for key in self.keys)
+
+    @classmethod
+    def compile(cls, expression: str) -> Path:
+        return _compile_path(expression)
+
+    def get(self, mapping: Mapping, default: Any = MISSING) -> Any:
+        value = mapping
+        for key, index in self._segments:
+            value = _step(value, key, index)
+            if value is MISSING:
+                return default
+
+        return value
+
+    def set(self, mapping: MutableMapping, value: Any) -> None:
+        key = self.keys[0]
+        if len(self.keys) == 1:
+            mapping[key] = value
+            return
+
+        mapping[key] = _assign(mapping.get(key), self._segments[1:], value)
+
+    def __repr__(self) -> str:
+        return f"Path({self.expression!r})"
+
+
+@lru_cache(maxsize=8192)
+def _compile_path(expression: str) -> Path:
+    return Path(expression)
+
+
+def _step(value: Any, key: str, index: Optional[int]) -> Any:
+    if index is not None and isinstance(value, (list, tuple)):
+        if -len(value) <= index < len(value):
+            return value[index]
+        return MISSING
+    try:
+        if key in value:
+            return value[key]
+    except TypeError:
+        pass
+
+    return MISSING
+
+
+def _assign(container: Any, segments: Tuple[Tuple[str, Optional[int]], ...], value: Any) -> Any:
+    (key, index), rest = segments[0], segments[1:]
+
+    if index is not None and isinstance(container, (list, tuple)):
+        if index == len(container):
+            copy = [*container, None]
+        elif -len(container) <= index < len(container):
+            copy = list(container)
+        else:
+            raise IndexError(f"List index `{index}` out of range, list has `{len(container)}` items.")
+        copy[index] = _assign(copy[index], rest, value) if rest else value
+        return copy
+
+    copy = dict(container) if isinstance(container, Mapping) else {}
+    copy[key] = _assign(copy.get(key), rest, value) if rest else value
+
+    return copy
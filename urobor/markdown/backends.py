@@ -0,0 +1,107 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Type
+
+from urobor.markdown.token import Token, TokenType
+
+_NO_MAP = (0, 0)
+
+
+class MarkdownBackend(ABC):
+    """
+    Turns markdown document into a stream of urobor tokens. Backends import their markdown library on first use.
+    """
+    name: str
+
+    @abstractmethod
+    def tokenize(self, contents: str) -> Iterator[Token]:
+        ...
+
+
+class MarkdownItBackend(MarkdownBackend):
+    name = "markdown-it"
+
+    def tokenize(self, contents: str) -> Iterator[Token]:
+        from markdown_it import MarkdownIt
+        from urobor.markdown.lexer import tokenize
+
+        return tokenize(MarkdownIt().parse(contents))
+
+
+class MistuneBackend(MarkdownBackend):
+    """
+    Optional backend, requires `mistune>=2,<3` installed with `urobor[mistune]`. Mistune does not keep source
+    positions, so tokens are not mapped to lines.
+    """
+    name = "mistune"
+
+    def tokenize(self, contents: str) -> Iterator[Token]:
+        try:
+            import mistune
+        except ImportError as error:
+            raise RuntimeError(
+                "Markdown backend `mistune` requires `mistune` package, install it with `urobor[mistune]` extra."
+            ) from error
+
+        return self._tokenize(mistune.create_markdown(renderer="ast")(contents))
+
+    def _tokenize(self, nodes: List[Dict[str, Any]]) -> Iterator[Token]:
+        levels = []
+        section = "__root__"
+        command_open = False
+
+        for node in nodes:
+            node_type = node["type"]
+
+            if node_type == "heading":
+                level = node["level"]
+                while levels and levels[-1] >= level:
+                    levels.pop()
+                    yield Token(_NO_MAP, TokenType.SECTION_END, "", section)
+                levels.append(level)
+                command_open = False
+                yield Token(_NO_MAP, TokenType.SECTION_START, "#" * level, section)
+                section = self._text(node)
+                yield Token(_NO_MAP, TokenType.SECTION_NAME, section, section)
+            elif node_type == "block_quote":
+                command_open = True
+                text = "".join([self._text(child) for child in node["children"]]).strip()
+                name, _, extra = text.partition(" ")
+                yield Token(_NO_MAP, TokenType.COMMAND_START, "", section)
+                yield Token(_NO_MAP, TokenType.COMMAND_NAME, name, section)
+                yield Token(_NO_MAP, TokenType.COMMAND_EXTRA, extra, section)
+            elif node_type == "block_code" and command_open:
+                block_type, _, block_extra = (node.get("info") or "").partition(" ")
+                yield Token(_NO_MAP, TokenType.COMMAND_ATTRIBUTE_START, "", section)
+                yield Token(_NO_MAP, TokenType.COMMAND_ATTRIBUTE_TYPE, block_type, section)
+                yield Token(_NO_MAP, TokenType.COMMAND_ATTRIBUTE_EXTRA, block_extra.strip(), section)
+                yield Token(_NO_MAP, TokenType.COMMAND_ATTRIBUTE_VALUE, node["text"], section)
+                yield Token(_NO_MAP, TokenType.COMMAND_ATTRIBUTE_END, "", section)
+            elif node_type == "paragraph" and not command_open:
+                yield Token(_NO_MAP, TokenType.SECTION_DESCRIPTION, self._text(node), section)
+
+        for _ in levels:
+            yield Token(_NO_MAP, TokenType.SECTION_END, "", section)
+
+    def _text(self, node: Dict[str, Any]) -> str:
+        if "children" in node and isinstance(node["children"], list):
+            return "".join([self._text(child) for child in node["children"]])
+
+        return node.get("text", "")
+
+
+DEFAULT_BACKEND = MarkdownItBackend.name
+BACKENDS: Dict[str, Type[MarkdownBackend]] = {
+    MarkdownItBackend.name: MarkdownItBackend,
+    MistuneBackend.name: MistuneBackend,
+}
+
+
+def register_backend(backend: Type[MarkdownBackend]) -> None:
+    BACKENDS[backend.name] = backend
+
+
+def get_backend(name: str = DEFAULT_BACKEND) -> MarkdownBackend:
+    if name not in BACKENDS:
+        raise KeyError(f"Unknown markdown backend `{name}`, available backends: `{'`, `'.join(BACKENDS)}`.")
+
+    return BACKENDS[name]()
@@ -0,0 +1,84 @@
+from typing import Iterable, List, Optional
+
+from urobor.commands.catalog import CommandCatalog, DEFAULT_CATALOG
+from urobor.commands.command import Argument, BlockArgument
+from urobor.markdown.token import Token, TokenType
+from urobor.test_case import TestCase
+
+
+class TreeBuilder:
+    """
+    Builds test tree incrementally from a stream of tokens.
+    """
+
+    def __init__(self, catalog: CommandCatalog = DEFAULT_CATALOG, filename: str = ""):
+        self.catalog = catalog
+        self.filename = filename
+        self.root = TestCase(name="__root__", level=0)
+        self._current = self.root
+        self._level = 0
+        self._command: Optional[Token] = None
+        self._command_name = ""
+        self._command_extra = ""
+        self._block_args: List[Argument] = []
+        self._block_type = ""
+        self._block_extra = ""
+
+    def feed(self, token: Token) -> None:
+        token_type = token.type
+
+        if token_type is TokenType.COMMAND_ATTRIBUTE_VALUE:
+            self._block_args.append(BlockArgument(token.value, self._block_type, self._block_extra))
+        elif token_type is TokenType.COMMAND_ATTRIBUTE_TYPE:
+            self._block_type = token.value
+        elif token_type is TokenType.COMMAND_ATTRIBUTE_EXTRA:
+            self._block_extra = token.value
+        elif token_type is TokenType.COMMAND_NAME:
+            self._command_name = token.value
+        elif token_type is TokenType.COMMAND_EXTRA:
+            self._command_extra = token.value
+        elif token_type is TokenType.COMMAND_START:
+            self._flush_command()
+            self._command = token
+        elif token_type is TokenType.SECTION_START:
+            self._flush_command()
+            self._level = len(token.value)
+        elif token_type is TokenType.SECTION_NAME:
+            self._add_test(token.value)
+
+    def feed_all(self, tokens: Iterable[Token]) -> TestCase:
+        for token in tokens:
+            self.feed(token)
+
+        return self.close()
+
+    def close(self) -> TestCase:
+        self._flush_command()
+
+        return self.root
+
+    def _add_test(self, name: str) -> None:
+        parent = self._current
+        while parent.level >= self._level:
+            parent = parent.parent
+        test = TestCase(name=name, level=self._level, parent=parent)
+        parent.children.append(test)
+        self._current = test
+
+    def _flush_command(self) -> None:
+        if self._command is None:
+            return
+
+        if self._command_name not in self.catalog:
+            raise RuntimeError(
+                f"Unknown command `{self._command_name}`, in file `{self.filename}:{self._command.map[0] + 1}`"
+            )
+        command_class = self.catalog.get(self._command_name)
+        arguments = command_class.parse_line_arguments(self._command_extra)
+        arguments.extend(self._block_args)
+        self._current.commands.append(command_class(arguments))
+
+        self._command = None
+        self._command_name = ""
+        self._command_extra = ""
+        self._block_args = []
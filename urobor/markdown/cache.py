@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from os import path
+from typing import Optional
+
+from urobor import __version__
+from urobor.commands.catalog import CommandCatalog
+from urobor.markdown.backends import DEFAULT_BACKEND
+from urobor.test_case import TestCase
+
+DEFAULT_CACHE_DIR = ".urobor_cache"
+FORMAT_VERSION = 3
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed test trees. Entries are keyed by file contents, tool version and registered commands,
+    so any change to one of them produces a different key and stale entries are never read. `FORMAT_VERSION`
+    has to be bumped whenever pickled classes, like arguments, change their attributes.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self.directory = path.join(directory, "parser")
+
+    def key(self, contents: bytes, catalog: CommandCatalog, backend: str = DEFAULT_BACKEND) -> str:
+        digest = hashlib.sha256(contents)
+        digest.update(f"\0{__version__}\0{FORMAT_VERSION}\0{backend}".encode("utf-8"))
+        for command in sorted(catalog, key=lambda item: item.id()):
+            digest.update(f"\0{command.id()}={command.__module__}.{command.__qualname__}".encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Optional[TestCase]:
+        try:
+            with open(self._filename(key), "rb") as cache_file:
+                return pickle.load(cache_file)
+        except Exception:
+            return None
+
+    def store(self, key: str, test: TestCase) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        filename = self._filename(key)
+        temporary_filename = f"{filename}.{os.getpid()}.tmp"
+        with open(temporary_filename, "wb") as cache_file:
+            pickle.dump(test, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_filename, filename)
+
+    def clear(self) -> None:
+        if not path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            os.remove(path.join(self.directory, name))
+
+    def _filename(self, key: str) -> str:
+        return path.join(self.directory, f"{key}.pickle")
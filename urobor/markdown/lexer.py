@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Iterator, Tuple
+
+from urobor.markdown.token import Token, TokenType
+
+if TYPE_CHECKING:
+    from markdown_it.token import Token as MarkdownToken
+
+_NO_MAP = (0, 0)
+
+
+def tokenize(tokens: Iterable[MarkdownToken]) -> Iterator[Token]:
+    """
+    Single pass over markdown-it block tokens emitting urobor tokens. Sections are closed before a heading of
+    the same or higher level, code blocks following a command become its attributes until the next command or
+    heading.
+    """
+    levels = []
+    section = "__root__"
+    in_heading = False
+    in_command = False
+    command_open = False
+    current_map = _NO_MAP
+    command_text = []
+
+    for token in tokens:
+        token_type = token.type
+
+        if in_heading:
+            if token_type == "heading_close":
+                in_heading = False
+                continue
+            section = _inline_text(token)
+            yield Token(current_map, TokenType.SECTION_NAME, section, section)
+            continue
+
+        if in_command:
+            if token_type == "blockquote_close":
+                in_command = False
+                text = "".join(command_text).strip()
+                name, _, extra = text.partition(" ")
+                yield Token(current_map, TokenType.COMMAND_NAME, name, section)
+                yield Token(current_map, TokenType.COMMAND_EXTRA, extra, section)
+                continue
+            if token_type == "inline":
+                command_text.append(_inline_text(token))
+            continue
+
+        if token_type == "heading_open":
+            level = len(token.markup)
+            while levels and levels[-1] >= level:
+                levels.pop()
+                yield Token(_map(token), TokenType.SECTION_END, "", section)
+            levels.append(level)
+            in_heading = True
+            command_open = False
+            current_map = _map(token)
+            yield Token(current_map, TokenType.SECTION_START, token.markup, section)
+            continue
+
+        if token_type == "blockquote_open":
+            in_command = True
+            command_open = True
+            current_map = _map(token)
+            command_text = []
+            yield Token(current_map, TokenType.COMMAND_START, "", section)
+            continue
+
+        if token_type == "fence" and command_open:
+            block_map = _map(token)
+            block_type, _, block_extra = token.info.partition(" ")
+            yield Token(block_map, TokenType.COMMAND_ATTRIBUTE_START, "", section)
+            yield Token(block_map, TokenType.COMMAND_ATTRIBUTE_TYPE, block_type, section)
+            yield Token(block_map, TokenType.COMMAND_ATTRIBUTE_EXTRA, block_extra.strip(), section)
+            yield Token(block_map, TokenType.COMMAND_ATTRIBUTE_VALUE, token.content, section)
+            yield Token(block_map, TokenType.COMMAND_ATTRIBUTE_END, "", section)
+            continue
+
+        if token_type == "inline" and not command_open:
+            yield Token(_map(token), TokenType.SECTION_DESCRIPTION, token.content, section)
+
+    for _ in levels:
+        yield Token(_NO_MAP, TokenType.SECTION_END, "", section)
+
+
+def _inline_text(token: MarkdownToken) -> str:
+    if token.children:
+        return "".join([child.content for child in token.children])
+
+    return token.content
+
+
+def _map(token: MarkdownToken) -> Tuple[int, int]:
+    return tuple(token.map) if token.map else _NO_MAP
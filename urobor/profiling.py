@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, ContextManager, Dict, IO, Iterator, List, Optional, Tuple
+
+from . import instrumentation
+from .instrumentation import CONTEXT_COPY, DEEPCOPY, INTERPOLATION, IO as IO_, Instrument
+from .test_case import Reporter, TestCase
+
+PARSE = "parse"
+SELF = "self"
+
+
+class _Frame:
+    __slots__ = ("category", "started", "children", "breakdown")
+
+    def __init__(self, category: str):
+        self.category = category
+        self.started = perf_counter()
+        self.children = 0.0
+        self.breakdown: Dict[str, float] = {}
+
+
+class Profiler(Reporter, Instrument):
+    """
+    Opt-in instrumentation of test runs. `install` subscribes to hooks around command execution, template
+    rendering, transport calls and context copies, nothing is measured and nothing costs anything until it is
+    called. Time of nested measurements is attributed exclusively, e.g. interpolation inside a command is not
+    counted as command's own time. Measurements are nested per thread and per asyncio task.
+
+    Commands executed in process workers are not measured.
+    """
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.copied_bytes = 0
+        self.stacks: Dict[Tuple[str, ...], float] = {}
+        self._filename = ""
+        self._frame: ContextVar[Optional[_Frame]] = ContextVar("profiler_frame", default=None)
+        self._lock = threading.Lock()
+
+    def file_started(self, filename: str) -> None:
+        self._filename = filename
+
+    def install(self) -> None:
+        instrumentation.subscribe(self)
+
+    def uninstall(self) -> None:
+        instrumentation.unsubscribe(self)
+
+    def section(self, category: str, name: str, test: Optional[TestCase]) -> ContextManager[None]:
+        return self.measure(name, test)
+
+    def copied(self, value: Any) -> None:
+        size = _deep_sizeof(value)
+        with self._lock:
+            self.copied_bytes += size
+
+    @contextmanager
+    def measure(self, category: str, test: TestCase = None) -> Iterator[None]:
+        parent = self._frame.get()
+        frame = _Frame(category)
+        token = self._frame.set(frame)
+        try:
+            yield
+        finally:
+            self._frame.reset(token)
+            elapsed = perf_counter() - frame.started
+            own = elapsed - frame.children
+            if parent is not None:
+                parent.children += elapsed
+                for name, value in frame.breakdown.items():
+                    parent.breakdown[name] = parent.breakdown.get(name, 0.0) + value
+                parent.breakdown[category] = parent.breakdown.get(category, 0.0) + own
+            self._record(frame, elapsed, own, test, parent is not None)
+
+    def _record(self, frame: _Frame, elapsed: float, own: float, test: Optional[TestCase], nested: bool) -> None:
+        with self._lock:
+            self.counts[frame.category] = self.counts.get(frame.category, 0) + 1
+            self.totals[frame.category] = self.totals.get(frame.category, 0.0) + own
+            if test is None:
+                if not nested:
+                    self._add_stack((self._filename or "(run)", frame.category), own)
+                return
+            self.latencies.setdefault(frame.category, []).append(elapsed)
+            prefix = (self._filename or "(run)", *test.path, frame.category)
+            self._add_stack((*prefix, SELF), own)
+            for name, value in frame.breakdown.items():
+                self._add_stack((*prefix, name), value)
+
+    def _add_stack(self, frames: Tuple[str, ...], value: float) -> None:
+        self.stacks[frames] = self.stacks.get(frames, 0.0) + value
+
+    def write_collapsed(self, stream: IO[str]) -> None:
+        """
+        Writes stacks in collapsed format read by flamegraph tools, values are microseconds.
+        """
+        for frames, value in sorted(self.stacks.items()):
+            microseconds = round(value * 1_000_000)
+            if microseconds:
+                stream.write(";".join(frame.replace(";", ",") for frame in frames) + f" {microseconds}\n")
+
+    def summary(self) -> str:
+        lines = [f"{'command':<14} {'count':>7} {'total ms':>10} {'mean ms':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8}"]
+        for name, latencies in sorted(self.latencies.items(), key=lambda item: -sum(item[1])):
+            latencies = sorted(latencies)
+            lines.append(
+                f"{name:<14} {len(latencies):>7} {sum(latencies) * 1000:>10.2f} "
+                f"{sum(latencies) / len(latencies) * 1000:>9.3f} {percentile(latencies, 50) * 1000:>8.3f} "
+                f"{percentile(latencies, 90) * 1000:>8.3f} {percentile(latencies, 99) * 1000:>8.3f}"
+            )
+        lines.append("")
+        lines.append(f"{'phase':<14} {'count':>7} {'total ms':>10}")
+        for category in (PARSE, INTERPOLATION, IO_, DEEPCOPY, CONTEXT_COPY):
+            lines.append(f"{category:<14} {self.counts.get(category, 0):>7} {self.totals.get(category, 0.0) * 1000:>10.2f}")
+        commands_self = sum(value for frames, value in self.stacks.items() if frames[-1] == SELF)
+        lines.append(f"{'commands self':<14} {'':>7} {commands_self * 1000:>10.2f}")
+        lines.append(f"{'copied bytes':<14} {self.copied_bytes:>18}")
+
+        return "\n".join(lines)
+
+    def __enter__(self) -> Profiler:
+        self.install()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.uninstall()
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    Nearest-rank percentile of sorted values.
+    """
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * percent // 100))
+
+    return values[int(rank) - 1]
+
+
+def _deep_sizeof(value: Any) -> int:
+    size = 0
+    stack = [value]
+    seen = set()
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            stack.extend(item)
+
+    return size
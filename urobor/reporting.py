@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+import statistics
+from time import perf_counter
+from typing import IO, Any, Callable, Dict, List, Optional
+
+from .commands.command import Command, Result
+from .test_case import Reporter, Status, TestCase
+
+_XML_TEXT = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+_XML_ATTRIBUTE = str.maketrans({
+    "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;",
+})
+
+
+class MultiReporter(Reporter):
+    def __init__(self, reporters: List[Reporter]):
+        self.reporters = reporters
+
+    def file_started(self, filename: str) -> None:
+        for reporter in self.reporters:
+            reporter.file_started(filename)
+
+    def test_started(self, test: TestCase) -> None:
+        for reporter in self.reporters:
+            reporter.test_started(test)
+
+    def command_finished(self, test: TestCase, command: Command, result: Result, duration: float) -> None:
+        for reporter in self.reporters:
+            reporter.command_finished(test, command, result, duration)
+
+    def test_finished(self, test: TestCase) -> None:
+        for reporter in self.reporters:
+            reporter.test_finished(test)
+
+    def run_finished(self) -> None:
+        for reporter in self.reporters:
+            reporter.run_finished()
+
+
+class JsonLinesReporter(Reporter):
+    """
+    Writes every event as a json line and flushes it right away, so the stream can be followed during the run.
+    """
+
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+        self._filename = ""
+
+    def file_started(self, filename: str) -> None:
+        self._filename = filename
+        self._write({"event": "file_started", "file": filename})
+
+    def test_started(self, test: TestCase) -> None:
+        self._write({"event": "test_started", "file": self._filename, "path": test.path})
+
+    def command_finished(self, test: TestCase, command: Command, result: Result, duration: float) -> None:
+        self._write({
+            "event": "command_finished",
+            "file": self._filename,
+            "path": test.path,
+            "command": repr(command),
+            "passed": bool(result),
+            "error": _describe_error(result),
+            "duration": duration,
+        })
+
+    def test_finished(self, test: TestCase) -> None:
+        self._write({
+            "event": "test_finished",
+            "file": self._filename,
+            "path": test.path,
+            "status": test.status.name.lower(),
+            "duration": test.duration,
+        })
+
+    def run_finished(self) -> None:
+        self._write({"event": "run_finished"})
+
+    def _write(self, event: Dict[str, Any]) -> None:
+        self.stream.write(json.dumps(event) + "\n")
+        self.stream.flush()
+
+
+class JUnitReporter(Reporter):
+    """
+    Streams JUnit XML, every spec file becomes a test suite and every test holding commands becomes a test case.
+    """
+
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+        self._suite_open = False
+        self._failures: Dict[int, List[str]] = {}
+        self.stream.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites>\n')
+
+    def file_started(self, filename: str) -> None:
+        self._close_suite()
+        self.stream.write(f"  <testsuite name={_quote(filename)}>\n")
+        self._suite_open = True
+
+    def command_finished(self, test: TestCase, command: Command, result: Result, duration: float) -> None:
+        if not result:
+            self._failures.setdefault(id(test), []).append(f"{command!r}: {_describe_error(result)}")
+
+    def test_finished(self, test: TestCase) -> None:
+        failures = self._failures.pop(id(test), [])
+        if not test.commands:
+            return
+        if not self._suite_open:
+            self.file_started("urobor")
+
+        path = test.path
+        classname = ".".join(path[:-1])
+        name = path[-1] if path else test.name
+        self.stream.write(
+            f'    <testcase classname={_quote(classname)} name={_quote(name)} time="{test.duration:.6f}"'
+        )
+        if failures:
+            self.stream.write(f">\n      <failure message={_quote(failures[0])}>")
+            self.stream.write(_escape("\n".join(failures)))
+            self.stream.write("</failure>\n    </testcase>\n")
+        elif test.status == Status.SKIPPED:
+            self.stream.write(">\n      <skipped/>\n    </testcase>\n")
+        else:
+            self.stream.write("/>\n")
+        self.stream.flush()
+
+    def run_finished(self) -> None:
+        self._close_suite()
+        self.stream.write("</testsuites>\n")
+        self.stream.flush()
+
+    def _close_suite(self) -> None:
+        if self._suite_open:
+            self.stream.write("  </testsuite>\n")
+            self._suite_open = False
+
+
+class ProgressReporter(Reporter):
+    """
+    Writes a line for every finished top-level test with the number of finished tests and an estimate of the
+    time left. Expected durations come from previous runs, tests without one are expected to take the median,
+    the estimate is scaled by the ratio of elapsed to expected time of finished tests.
+    """
+
+    def __init__(
+        self,
+        stream: IO[str],
+        tests: Dict[str, TestCase],
+        expected: Callable[[str, TestCase], Optional[float]] = None,
+    ):
+        self.stream = stream
+        units = [(filename, test) for filename, root in tests.items() for test in root.children]
+        durations = {id(test): expected(filename, test) if expected else None for filename, test in units}
+        known = [duration for duration in durations.values() if duration is not None]
+        default = statistics.median(known) if known else None
+        self._expected = {key: duration if duration is not None else default for key, duration in durations.items()}
+        self._total = len(units)
+        self._finished = 0
+        self._finished_expected = 0.0
+        self._started = perf_counter()
+
+    def test_finished(self, test: TestCase) -> None:
+        if id(test) not in self._expected:
+            return
+        expected = self._expected.pop(id(test))
+        self._finished += 1
+        self._finished_expected += expected or 0.0
+        self.stream.write(
+            f"[{self._finished}/{self._total}] {' / '.join(test.path)} {test.status.name.lower()} "
+            f"in {test.duration:.2f}s, {self._describe_left()}\n"
+        )
+        self.stream.flush()
+
+    def _describe_left(self) -> str:
+        elapsed = perf_counter() - self._started
+        if not self._expected:
+            return f"{elapsed:.1f}s elapsed"
+        if any(duration is None for duration in self._expected.values()):
+            left = elapsed / self._finished * len(self._expected)
+        else:
+            left = sum(self._expected.values())
+            if self._finished_expected > 0:
+                left *= elapsed / self._finished_expected
+
+        return f"about {left:.1f}s left"
+
+
+def _describe_error(result: Result) -> Any:
+    if result.error is None:
+        return None
+    exception = result.error.exception
+
+    return f"{type(exception).__name__}: {exception}"
+
+
+def _escape(text: str) -> str:
+    return text.translate(_XML_TEXT)
+
+
+def _quote(text: str) -> str:
+    return f'"{text.translate(_XML_ATTRIBUTE)}"'
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from glob import glob
+from os import path
+from typing import IO, TYPE_CHECKING, Callable, Dict, Iterable, List, Optional
+
+from .analysis import prune
+from .commands.catalog import CommandCatalog, DEFAULT_CATALOG
+from .history import History
+from .markdown.backends import MarkdownBackend
+from .markdown.cache import ParseCache
+from .markdown.parser import Parser
+from .reporting import MultiReporter, ProgressReporter
+from .selection import HeadingIndex, Selector, create_predicate
+from .sharding import Shard, Unit, collect_units, select
+from .test_case import Reporter, RunControl, TestCase
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+
+def discover(paths: Iterable[str]) -> List[str]:
+    files = []
+    for item in paths:
+        if path.isdir(item):
+            files.extend(sorted(glob(path.join(item, "**", "*.md"), recursive=True)))
+            continue
+        if not path.isfile(item):
+            raise FileNotFoundError(f"Spec file or directory `{item}` does not exist.")
+        files.append(item)
+
+    return files
+
+
+class Runner:
+    def __init__(
+        self,
+        jobs: int = 1,
+        processes: bool = False,
+        use_async: bool = False,
+        concurrency: int = None,
+        pool_size: int = None,
+        cache: ParseCache = None,
+        backend: MarkdownBackend = None,
+        shard: Shard = None,
+        durations: Dict[str, float] = None,
+        reporter: Reporter = None,
+        catalog: CommandCatalog = DEFAULT_CATALOG,
+        predicate: Callable[[TestCase], bool] = None,
+        selectors: List[Selector] = None,
+        index: HeadingIndex = None,
+        cassette: str = None,
+        record_mode: str = "refresh",
+        max_age: float = None,
+        history: History = None,
+        failed_first: bool = False,
+        progress: IO[str] = None,
+        fail_fast: bool = False,
+        stop_on_failure: bool = False,
+        time_budget: float = None,
+    ):
+        if jobs < 1:
+            raise ValueError(f"Number of jobs must be a positive integer, `{jobs}` given.")
+        if use_async and jobs > 1:
+            raise ValueError("Asynchronous runner cannot be combined with multiple jobs.")
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError(f"Time budget must be a positive number of seconds, `{time_budget}` given.")
+        self.jobs = jobs
+        self.processes = processes
+        self.use_async = use_async
+        self.concurrency = concurrency
+        self.pool_size = pool_size
+        self.cache = cache
+        self.backend = backend
+        self.shard = shard
+        self.durations = durations or {}
+        self.reporter = reporter or Reporter()
+        self.catalog = catalog
+        self.predicate = predicate
+        self.selectors = selectors or []
+        self.index = index
+        self.cassette = cassette
+        self.record_mode = record_mode
+        self.max_age = max_age
+        self.history = history
+        self.failed_first = failed_first
+        self.progress = progress
+        self.fail_fast = fail_fast
+        self.stop_on_failure = stop_on_failure
+        self.time_budget = time_budget
+        self.control: Optional[RunControl] = None
+        self.units: Optional[List[Unit]] = None
+
+    def parse(self, paths: Iterable[str]) -> Dict[str, TestCase]:
+        tests = {}
+        for filename in discover(paths):
+            if self.selectors and self.index and not self.index.may_match(filename, self.selectors):
+                continue
+            tests[filename] = self.parse_file(filename)
+            if self.index and self.index.get(filename) is None:
+                self.index.update(filename, tests[filename])
+        if self.index:
+            self.index.save()
+
+        predicate = self._create_predicate()
+        if predicate:
+            tests = {filename: prune(test, predicate) for filename, test in tests.items()}
+            tests = {filename: test for filename, test in tests.items() if test is not None}
+        self.units = collect_units(tests)
+        if self.shard:
+            durations = self.durations or (self.history.durations(tests) if self.history else None)
+            return select(tests, self.shard, durations, self.units)
+
+        return tests
+
+    def _create_predicate(self) -> Optional[Callable[[TestCase], bool]]:
+        if not self.selectors:
+            return self.predicate
+        selected = create_predicate(self.selectors)
+        if not self.predicate:
+            return selected
+
+        return lambda test: selected(test) and self.predicate(test)
+
+    def parse_file(self, filename: str) -> TestCase:
+        return Parser(filename, self.catalog, self.cache, self.backend).test
+
+    def run(self, paths: Iterable[str]) -> Dict[str, TestCase]:
+        return self.run_tests(self.parse(paths))
+
+    def run_tests(self, tests: Dict[str, TestCase]) -> Dict[str, TestCase]:
+        if self.history and self.failed_first:
+            tests = self.history.order(tests)
+        reporter = self.create_reporter(tests)
+        self.control = self.create_control()
+        self.configure_transport()
+        executor = self.create_executor()
+        try:
+            for filename, test in tests.items():
+                reporter.file_started(filename)
+                if self.use_async:
+                    import asyncio
+
+                    asyncio.run(
+                        test.run_async(concurrency=self.concurrency, reporter=reporter, control=self.control)
+                    )
+                else:
+                    priority = self.history.priority(filename) if self.history and executor else None
+                    test.run(executor=executor, reporter=reporter, priority=priority, control=self.control)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            if self.cassette:
+                from .http import set_transport
+
+                set_transport(None)
+            reporter.run_finished()
+
+        return tests
+
+    def create_reporter(self, tests: Dict[str, TestCase]) -> Reporter:
+        reporters = [self.reporter]
+        if self.history:
+            reporters.append(self.history)
+        if self.progress:
+            reporters.append(ProgressReporter(self.progress, tests, self.history.duration if self.history else None))
+
+        return reporters[0] if len(reporters) == 1 else MultiReporter(reporters)
+
+    def create_control(self) -> Optional[RunControl]:
+        """
+        Returns control of the run when it may stop early, the time budget starts counting down now.
+        """
+        if not self.fail_fast and not self.stop_on_failure and self.time_budget is None:
+            return None
+
+        return RunControl(self.fail_fast, self.stop_on_failure, self.time_budget)
+
+    def configure_transport(self) -> None:
+        # Async tests must not queue for connections below the number of tests allowed to run at once.
+        pool_size = self.pool_size or (self.concurrency if self.use_async else None)
+        if not pool_size and not self.cassette:
+            return
+
+        from .http import Cassette, ConnectionPool, set_transport
+
+        create_pool = (lambda: ConnectionPool(max_size=pool_size)) if pool_size else ConnectionPool
+        if self.cassette:
+            set_transport(Cassette(self.cassette, create_pool, self.record_mode, self.max_age))
+        else:
+            set_transport(create_pool())
+
+    def create_executor(self) -> Optional[Executor]:
+        if self.jobs == 1:
+            return None
+
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        if self.processes:
+            return ProcessPoolExecutor(max_workers=self.jobs)
+
+        return ThreadPoolExecutor(max_workers=self.jobs)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from fnmatch import fnmatchcase
+from os import path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .test_case import TestCase
+
+_GLOB_CHARACTERS = re.compile(r"[*?\[]")
+
+
+class Selector:
+    """
+    Selects tests by heading path, e.g. `Variables usage/Reusing a variable`. Segments are separated with `/` and
+    matched against consecutive headings: plain segments match exactly, segments with `*`, `?` or `[]` are globs,
+    segments starting with `re:` are regular expressions matched against the whole heading and `**` matches any
+    number of headings. Descendants of selected tests are selected too.
+    """
+    __slots__ = ("expression", "_segments")
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self._segments = tuple(_compile_segment(segment.strip()) for segment in expression.strip("/").split("/"))
+
+    @classmethod
+    def parse(cls, expression: str) -> Selector:
+        if not expression.strip("/ "):
+            raise ValueError(f"Invalid selector `{expression}`, expected heading path, e.g. `Section/Test`.")
+
+        return cls(expression)
+
+    def match(self, headings: Sequence[str]) -> bool:
+        return _match(self._segments, tuple(headings))
+
+    def __repr__(self) -> str:
+        return f"Selector({self.expression!r})"
+
+
+def _compile_segment(segment: str) -> Optional[Callable[[str], bool]]:
+    if segment == "**":
+        return None
+    if segment.startswith("re:"):
+        return re.compile(segment[3:]).fullmatch
+    if _GLOB_CHARACTERS.search(segment):
+        return lambda heading: fnmatchcase(heading, segment)
+
+    return segment.__eq__
+
+
+def _match(segments: Tuple[Any, ...], headings: Tuple[str, ...]) -> bool:
+    if not segments:
+        return not headings
+    if segments[0] is None:
+        return any(_match(segments[1:], headings[index:]) for index in range(len(headings) + 1))
+
+    return bool(headings) and bool(segments[0](headings[0])) and _match(segments[1:], headings[1:])
+
+
+def create_predicate(selectors: Iterable[Selector]) -> Callable[[TestCase], bool]:
+    selectors = list(selectors)
+
+    return lambda test: any(selector.match(test.path) for selector in selectors)
+
+
+class HeadingIndex:
+    """
+    Heading paths of spec files stored next to the parse cache. Entries are valid as long as file's modification
+    time and size are unchanged, files whose valid entry cannot match any selector are not read at all.
+    """
+
+    def __init__(self, directory: str):
+        self.filename = path.join(directory, "headings.json")
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._changed = False
+
+    def may_match(self, filename: str, selectors: Iterable[Selector]) -> bool:
+        headings = self.get(filename)
+        if headings is None:
+            return True
+
+        return any(selector.match(item) for item in headings for selector in selectors)
+
+    def get(self, filename: str) -> Optional[List[List[str]]]:
+        entry = self.entries.get(filename)
+        if entry is None or entry["stamp"] != _stamp(filename):
+            return None
+
+        return entry["headings"]
+
+    def update(self, filename: str, test: TestCase) -> None:
+        self.entries[filename] = {
+            "stamp": _stamp(filename),
+            "headings": [item.path for item in test.walk() if item.level > 0],
+        }
+        self._changed = True
+
+    def save(self) -> None:
+        if not self._changed:
+            return
+        os.makedirs(path.dirname(self.filename), exist_ok=True)
+        temporary_filename = f"{self.filename}.{os.getpid()}.tmp"
+        with open(temporary_filename, "w") as index_file:
+            json.dump(self.entries, index_file)
+        os.replace(temporary_filename, self.filename)
+        self._changed = False
+
+    @property
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            try:
+                with open(self.filename) as index_file:
+                    self._entries = json.load(index_file)
+            except (OSError, ValueError):
+                self._entries = {}
+
+        return self._entries
+
+
+def _stamp(filename: str) -> List[int]:
+    stat = os.stat(filename)
+
+    return [stat.st_mtime_ns, stat.st_size]
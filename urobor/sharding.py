@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import statistics
+from os import path
+from typing import Any, Dict, Iterable, List, NamedTuple
+
+from .test_case import Status, TestCase
+
+DEFAULT_DURATION = 1.0
+
+
+class Shard(NamedTuple):
+    index: int
+    total: int
+
+    @classmethod
+    def parse(cls, value: str) -> Shard:
+        index, separator, total = value.partition("/")
+        if not separator or not index.isdigit() or not total.isdigit():
+            raise ValueError(f"Invalid shard `{value}`, expected `index/total` format, e.g. `3/8`.")
+        shard = cls(int(index), int(total))
+        if not 1 <= shard.index <= shard.total:
+            raise ValueError(f"Invalid shard `{value}`, index must be between `1` and `{shard.total}`.")
+
+        return shard
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.total}"
+
+
+class Unit(NamedTuple):
+    """
+    Top-level test of a spec file, the smallest piece of work assigned to a shard. Files without headings but
+    with root commands are a single unit holding their root.
+    """
+    id: str
+    filename: str
+    position: int
+    test: TestCase
+
+
+def collect_units(tests: Dict[str, TestCase]) -> List[Unit]:
+    units = []
+    for filename, root in tests.items():
+        if not root.children:
+            if root.commands:
+                units.append(Unit(f"{filename}::", filename, 0, root))
+            continue
+        seen = {}
+        for position, test in enumerate(root.children):
+            unit_id = f"{filename}::{test.name}"
+            seen[unit_id] = seen.get(unit_id, 0) + 1
+            if seen[unit_id] > 1:
+                unit_id = f"{unit_id}#{seen[unit_id]}"
+            units.append(Unit(unit_id, filename, position, test))
+
+    return units
+
+
+def partition(units: List[Unit], total: int, durations: Dict[str, float] = None) -> List[List[Unit]]:
+    """
+    Greedy longest-processing-time-first split, each unit goes to the shard with the lowest expected time.
+    Units without recorded duration are expected to take the median of known durations.
+    """
+    durations = durations or {}
+    known = [durations[unit.id] for unit in units if unit.id in durations]
+    default = statistics.median(known) if known else DEFAULT_DURATION
+
+    shards: List[List[Unit]] = [[] for _ in range(total)]
+    loads = [0.0] * total
+    expected = {unit.id: durations.get(unit.id, default) for unit in units}
+    for unit in sorted(units, key=lambda item: (-expected[item.id], item.id)):
+        index = min(range(total), key=lambda item: (loads[item], item))
+        shards[index].append(unit)
+        loads[index] += expected[unit.id]
+
+    for shard in shards:
+        shard.sort(key=lambda item: (item.filename, item.position))
+
+    return shards
+
+
+def select(
+    tests: Dict[str, TestCase], shard: Shard, durations: Dict[str, float] = None, units: List[Unit] = None
+) -> Dict[str, TestCase]:
+    """
+    Returns roots holding only top-level tests assigned to the shard, root commands of a file are kept.
+    """
+    selected: Dict[str, TestCase] = {}
+    units = units if units is not None else collect_units(tests)
+    for unit in partition(units, shard.total, durations)[shard.index - 1]:
+        root = tests[unit.filename]
+        if unit.test is root:
+            selected[unit.filename] = root
+            continue
+        if unit.filename not in selected:
+            selected[unit.filename] = TestCase(root.name, level=root.level)
+            selected[unit.filename].commands = root.commands
+        selected[unit.filename].children.append(unit.test)
+
+    return selected
+
+
+def create_results(tests: Dict[str, TestCase], shard: Shard = None, units: List[Unit] = None) -> Dict[str, Any]:
+    """
+    `units` collected from complete documents keep their positions and ids when `tests` hold only a shard,
+    so merged reports follow document order and durations are recorded for the right tests.
+    """
+    if units is None:
+        units = collect_units(tests)
+    else:
+        selected = {id(test) for root in tests.values() for test in (root, *root.children)}
+        units = [unit for unit in units if id(unit.test) in selected]
+
+    return {
+        "shard": str(shard) if shard else None,
+        "results": [
+            {
+                "id": unit.id,
+                "file": unit.filename,
+                "position": unit.position,
+                "name": unit.test.name if unit.test.level else path.basename(unit.filename),
+                "status": unit.test.status.name.lower(),
+                "duration": unit.test.duration,
+                "tests": [
+                    {"path": test.path, "status": test.status.name.lower(), "duration": test.duration}
+                    for test in unit.test.walk()
+                ],
+            }
+            for unit in units
+        ],
+    }
+
+
+def merge(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    merged = sorted(
+        (item for result in results for item in result["results"]),
+        key=lambda item: (item["file"], item["position"]),
+    )
+    failed = len([item for item in merged if item["status"] == Status.FAILED.name.lower()])
+
+    return {
+        "total": len(merged),
+        "passed": len(merged) - failed,
+        "failed": failed,
+        "duration": sum(item["duration"] for item in merged),
+        "results": merged,
+    }
+
+
+def durations_from_results(results: Dict[str, Any]) -> Dict[str, float]:
+    return {item["id"]: item["duration"] for item in results["results"]}
+
+
+def load_durations(filename: str) -> Dict[str, float]:
+    if not path.isfile(filename):
+        return {}
+
+    return read_json(filename)
+
+
+def read_json(filename: str) -> Any:
+    with open(filename, "r") as json_file:
+        return json.load(json_file)
+
+
+def write_json(filename: str, value: Any) -> None:
+    with open(filename, "w") as json_file:
+        json.dump(value, json_file, indent=2)
@@ -1,13 +1,79 @@
 from __future__ import annotations
 
 from enum import IntEnum
-from typing import List
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from .commands.command import Context
+from . import instrumentation
+from .commands.command import Command, Context, Error, Result, blocking_executor
+
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Executor, Future
 
 
 class Reporter:
-    ...
+    """
+    Receives events while tests run. Command and test durations are measured with a monotonic clock.
+    When children run on an executor, their events are delivered after a subtree finishes, in document order.
+    """
+
+    def file_started(self, filename: str) -> None:
+        ...
+
+    def test_started(self, test: TestCase) -> None:
+        ...
+
+    def command_finished(self, test: TestCase, command: Command, result: Result, duration: float) -> None:
+        ...
+
+    def test_finished(self, test: TestCase) -> None:
+        ...
+
+    def run_finished(self) -> None:
+        ...
+
+
+class _EventRecorder(Reporter):
+    """
+    Records events of a subtree, tests are addressed by child indexes, so tests added while the subtree runs,
+    like rows of `foreach`, can be found again once the same expansions are applied to the original tree.
+    """
+
+    def __init__(self, test: TestCase):
+        self.events: List[Tuple[Any, ...]] = []
+        self._addresses: Dict[int, Tuple[int, ...]] = {id(test): ()}
+
+    def test_started(self, test: TestCase) -> None:
+        self.events.append(("test_started", self._address(test)))
+
+    def command_finished(self, test: TestCase, command: Command, result: Result, duration: float) -> None:
+        self.events.append(("command_finished", self._address(test), test.commands.index(command), result, duration))
+
+    def test_finished(self, test: TestCase) -> None:
+        self.events.append(("test_finished", self._address(test)))
+
+    def _address(self, test: TestCase) -> Tuple[int, ...]:
+        address = self._addresses.get(id(test))
+        if address is None:
+            address = self._address(test.parent) + (test.parent.children.index(test),)
+            self._addresses[id(test)] = address
+
+        return address
+
+    @staticmethod
+    def replay(test: TestCase, events: List[Tuple[Any, ...]], reporter: Reporter) -> None:
+        for event in events:
+            target = test._resolve(event[1])
+            if event[0] == "command_finished":
+                _, _, command_index, result, duration = event
+                reporter.command_finished(target, target.commands[command_index], result, duration)
+            else:
+                getattr(reporter, event[0])(target)
+
+
+_NULL_REPORTER = Reporter()
+MAX_ROW_WORKERS = 32
 
 
 class Status(IntEnum):
@@ -18,37 +84,423 @@ class Status(IntEnum):
     PASSED = 1
 
 
+class RunControl:
+    """
+    Decides whether remaining work runs. `fail_fast` stops the whole run at the first failed command,
+    `stop_on_failure` stops a test at its first failed command and skips its children, no test or command is
+    started once `time_budget` seconds have passed on `clock`. Tests which are not run are marked as skipped.
+    Thread workers share the control, process workers get a copy and only see the deadline.
+    """
+
+    def __init__(
+        self,
+        fail_fast: bool = False,
+        stop_on_failure: bool = False,
+        time_budget: float = None,
+        clock: Callable[[], float] = monotonic,
+    ):
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError(f"Time budget must be a positive number of seconds, `{time_budget}` given.")
+        self.fail_fast = fail_fast
+        self.stop_on_failure = stop_on_failure
+        self.clock = clock
+        self.deadline = clock() + time_budget if time_budget is not None else None
+        self.stopped = False
+
+    @property
+    def cancelled(self) -> bool:
+        if not self.stopped and self.expired:
+            self.stopped = True
+
+        return self.stopped
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and self.clock() >= self.deadline
+
+    def failed(self) -> bool:
+        """
+        Records a failed command, returns whether the rest of the test has to be skipped.
+        """
+        if self.fail_fast:
+            self.stopped = True
+
+        return self.fail_fast or self.stop_on_failure
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
 class TestCase:
-    __slots__ = ["name", "status", "commands", "children", "parent", "level"]
+    __slots__ = ["name", "status", "duration", "commands", "children", "parent", "level", "template"]
 
     def __init__(self, name: str, level: int = 1, parent: TestCase = None):
         self.name = name
         self.status = Status.NOT_STARTED
+        self.duration = 0.0
         self.commands = []
         self.children: List[TestCase] = []
         self.parent = parent
         self.level = level
+        self.template: Optional[List[TestCase]] = None
+
+    def run(
+        self,
+        context: Context = None,
+        executor: Executor = None,
+        reporter: Reporter = None,
+        priority: Callable[[TestCase], float] = None,
+        control: RunControl = None,
+    ) -> None:
+        """
+        Runs commands sequentially and then all the children, each child gets its own copy of the context.
+
+        When `executor` is passed, children subtrees are scheduled on it and run concurrently. Subtrees run
+        sequentially inside a worker, statuses are collected in document order once all of them have finished.
+        Subtrees with higher `priority`, e.g. expected duration, are submitted first. `control` stops the run
+        early, see `RunControl`.
+        """
+        reporter = reporter or _NULL_REPORTER
+        if control is not None and control.cancelled:
+            self._skip(reporter)
+            return
 
-    def run(self, context: Context = None) -> None:
+        started = perf_counter()
         context = context or Context({})
+        reporter.test_started(self)
+        position = self.run_commands(context, reporter, control)
+
+        if self._stopped(control):
+            for test in self.children:
+                test._skip(reporter)
+        elif position is None:
+            self._run_children([context.copy() for _ in self.children], executor, reporter, priority, control)
+        else:
+            contexts = self._expand_rows(self.commands[position], context, reporter)
+            if executor is None and self.commands[position].concurrent and len(contexts) > 1:
+                from concurrent.futures import ThreadPoolExecutor
+
+                with ThreadPoolExecutor(max_workers=min(len(contexts), MAX_ROW_WORKERS)) as row_executor:
+                    self._run_children(contexts, row_executor, reporter, control=control)
+            else:
+                self._run_children(contexts, executor, reporter, priority, control)
 
-        for command in self.commands:
-            result = command.execute(context)
+        self._propagate_status()
+        self.duration = perf_counter() - started
+        reporter.test_finished(self)
+
+    def _run_children(
+        self,
+        contexts: List[Context],
+        executor: Optional[Executor],
+        reporter: Reporter,
+        priority: Callable[[TestCase], float] = None,
+        control: RunControl = None,
+    ) -> None:
+        if executor is None:
+            for test, context in zip(self.children, contexts):
+                test.run(context, reporter=reporter, control=control)
+            return
+
+        record = reporter is not _NULL_REPORTER
+        order = range(len(contexts))
+        if priority is not None:
+            order = sorted(order, key=lambda index: -priority(self.children[index]))
+        futures: List[Optional[Future]] = [None] * len(contexts)
+
+        def finished(future: Future) -> None:
+            if control.fail_fast and not future.cancelled() and future.exception() is None:
+                if any(status == Status.FAILED for status, _ in future.result()[0]):
+                    control.stop()
+            if control.cancelled:
+                for pending in futures:
+                    if pending is not None:
+                        pending.cancel()
+
+        for index in order:
+            if control is not None and control.cancelled:
+                break
+            futures[index] = executor.submit(_run_subtree, self.children[index], contexts[index], record, control)
+            if control is not None:
+                futures[index].add_done_callback(finished)
+        for test, future in zip(self.children, futures):
+            if future is None or future.cancelled():
+                test._skip(reporter)
+                continue
+            results, events, expansions = future.result()
+            test._apply_expansions(expansions)
+            test._apply_results(results)
+            _EventRecorder.replay(test, events, reporter)
+
+    def run_commands(self, context: Context, reporter: Reporter = None, control: RunControl = None) -> Optional[int]:
+        """
+        Executes own commands only, children are not run. Stops at a command expanding the test into rows,
+        like `foreach`, and returns its position.
+        """
+        reporter = reporter or _NULL_REPORTER
+        for position, command in enumerate(self.commands):
+            if control is not None and control.cancelled:
+                return None
+            if command.expands:
+                return position
+            command_started = perf_counter()
+            if instrumentation.instruments:
+                with instrumentation.section(instrumentation.COMMAND, command.id(), self):
+                    result = self._execute(command, context)
+            else:
+                result = self._execute(command, context)
+            reporter.command_finished(self, command, result, perf_counter() - command_started)
             if not result:
                 self.status = Status.FAILED
+                if control is not None and control.failed():
+                    return None
                 continue
 
+        return None
+
+    def _stopped(self, control: Optional[RunControl]) -> bool:
+        if control is None:
+            return False
+        if control.cancelled or (control.stop_on_failure and self.status == Status.FAILED):
+            if self.status is Status.NOT_STARTED:
+                self.status = Status.SKIPPED
+            return True
+
+        return False
+
+    def _skip(self, reporter: Reporter) -> None:
+        reporter.test_started(self)
+        self.status = Status.SKIPPED
+        self.duration = 0.0
         for test in self.children:
-            test.run(context.copy())
+            test._skip(reporter)
+        reporter.test_finished(self)
 
+    def expand(self, rows: int) -> None:
+        """
+        Replaces children with one shell test per row. Shells run commands following the expanding command and
+        copies of the original children, all of them share command lists with the parsed tree.
+        """
+        if self.template is None:
+            self.template = self.children
+        position = next(index for index, command in enumerate(self.commands) if command.expands)
+        commands = self.commands[position + 1:]
+        self.children = []
+        for index in range(rows):
+            shell = TestCase(f"#{index + 1}", self.level + 1, self)
+            shell.commands = commands
+            shell.children = [test._shell(shell) for test in self.template]
+            self.children.append(shell)
+
+    def _shell(self, parent: TestCase) -> TestCase:
+        shell = TestCase(self.name, self.level, parent)
+        shell.commands = self.commands
+        shell.children = [test._shell(shell) for test in (self.template if self.template is not None else self.children)]
+
+        return shell
+
+    def _expand_rows(self, command: Command, context: Context, reporter: Reporter) -> List[Context]:
+        command_started = perf_counter()
+        result = Result()
+        try:
+            rows = list(command.rows(context))
+        except Exception as error:
+            rows = []
+            result.error = Error(error)
+        reporter.command_finished(self, command, result, perf_counter() - command_started)
+        if not result:
+            self.status = Status.FAILED
+
+        self.expand(len(rows))
+        contexts = []
+        for row in rows:
+            row_context = context.copy()
+            command.bind(row_context, row)
+            contexts.append(row_context)
+
+        return contexts
+
+    async def run_async(
+        self, context: Context = None, concurrency: int = None, reporter: Reporter = None, control: RunControl = None
+    ) -> None:
+        """
+        Runs the tree on the current event loop, children of a test are awaited concurrently while commands
+        inside a test are awaited one after another. `concurrency` limits number of tests executing commands
+        at the same time. Reporter receives events as they happen. Blocking I/O of commands runs on threads of
+        this tree, as many as `concurrency` allows or one per test when it is not limited.
+        """
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+        executor = ThreadPoolExecutor(concurrency or sum(1 for _ in self.walk()), thread_name_prefix="urobor")
+        token = blocking_executor.set(executor)
+        try:
+            await self._run_async(context or Context({}), semaphore, reporter or _NULL_REPORTER, control)
+        finally:
+            blocking_executor.reset(token)
+            executor.shutdown(wait=False)
+
+    async def _run_async(
+        self,
+        context: Context,
+        semaphore: Optional[asyncio.Semaphore],
+        reporter: Reporter,
+        control: Optional[RunControl],
+    ) -> None:
+        import asyncio
+
+        if control is not None and control.cancelled:
+            self._skip(reporter)
+            return
+
+        started = perf_counter()
+        reporter.test_started(self)
+        if semaphore is None:
+            position = await self._execute_commands_async(context, reporter, control)
+        else:
+            async with semaphore:
+                position = await self._execute_commands_async(context, reporter, control)
+
+        if self._stopped(control):
+            for test in self.children:
+                test._skip(reporter)
+        else:
+            if position is None:
+                contexts = [context.copy() for _ in self.children]
+            else:
+                contexts = self._expand_rows(self.commands[position], context, reporter)
+            await asyncio.gather(*[
+                test._run_async(child_context, semaphore, reporter, control)
+                for test, child_context in zip(self.children, contexts)
+            ])
+
+        self._propagate_status()
+        self.duration = perf_counter() - started
+        reporter.test_finished(self)
+
+    async def _execute_commands_async(
+        self, context: Context, reporter: Reporter, control: Optional[RunControl]
+    ) -> Optional[int]:
+        for position, command in enumerate(self.commands):
+            if control is not None and control.cancelled:
+                return None
+            if command.expands:
+                return position
+            command_started = perf_counter()
+            try:
+                if instrumentation.instruments:
+                    with instrumentation.section(instrumentation.COMMAND, command.id(), self):
+                        result = await command.execute_async(context)
+                else:
+                    result = await command.execute_async(context)
+            except Exception as error:
+                result = Result()
+                result.error = Error(error)
+            reporter.command_finished(self, command, result, perf_counter() - command_started)
+            if not result:
+                self.status = Status.FAILED
+                if control is not None and control.failed():
+                    return None
+                continue
+
+        return None
+
+    @staticmethod
+    def _execute(command: Command, context: Context) -> Result:
+        try:
+            return command.execute(context)
+        except Exception as error:
+            result = Result()
+            result.error = Error(error)
+
+            return result
+
+    def _propagate_status(self) -> None:
+        for test in self.children:
             if test.status == Status.FAILED:
                 self.status = test.status
 
         if self.status is Status.NOT_STARTED:
             self.status = Status.PASSED
 
+    def walk(self) -> Iterator[TestCase]:
+        yield self
+        for test in self.children:
+            yield from test.walk()
+
+    @property
+    def path(self) -> List[str]:
+        path = []
+        test = self
+        while test is not None and test.level > 0:
+            path.append(test.name)
+            test = test.parent
+
+        return path[::-1]
+
+    def _resolve(self, address: Tuple[int, ...]) -> TestCase:
+        test = self
+        for index in address:
+            test = test.children[index]
+
+        return test
+
+    def _expansions(self) -> List[Tuple[Tuple[int, ...], int]]:
+        expansions = []
+        stack = [((), self)]
+        while stack:
+            address, test = stack.pop()
+            if test.template is not None:
+                expansions.append((address, len(test.children)))
+            stack.extend((address + (index,), child) for index, child in reversed(list(enumerate(test.children))))
+
+        return expansions
+
+    def _apply_expansions(self, expansions: List[Tuple[Tuple[int, ...], int]]) -> None:
+        for address, rows in expansions:
+            test = self._resolve(address)
+            if test.template is None or len(test.children) != rows:
+                test.expand(rows)
+
+    def _apply_results(self, results: List[Tuple[Status, float]]) -> None:
+        for test, (status, duration) in zip(self.walk(), results):
+            test.status = status
+            test.duration = duration
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "status": self.status,
+            "duration": self.duration,
+            "commands": self.commands,
+            "children": self.children,
+            "level": self.level,
+            "template": self.template,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for key, value in state.items():
+            setattr(self, key, value)
+        self.parent = None
+        for test in self.children:
+            test.parent = self
+        for test in self.template or ():
+            test.parent = self
+
     def __repr__(self) -> str:
         return f"{self.name} ({len([child for child in self.children if child.status == Status.PASSED])}/{len(self.children)})"
 
     def __bool__(self) -> bool:
         return self.status == Status.PASSED
+
+
+def _run_subtree(
+    test: TestCase, context: Context, record: bool, control: RunControl = None
+) -> Tuple[List[Tuple[Status, float]], List[Tuple[Any, ...]], List[Tuple[Tuple[int, ...], int]]]:
+    recorder = _EventRecorder(test) if record else None
+    test.run(context, reporter=recorder, control=control)
+
+    results = [(item.status, item.duration) for item in test.walk()]
+
+    return results, recorder.events if recorder else [], test._expansions()
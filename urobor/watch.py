@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+from .commands.command import Command, Context, Result
+from .reporting import MultiReporter
+from .runner import Runner, discover
+from .test_case import Reporter, Status, TestCase
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+Key = Tuple[Tuple[str, int], ...]
+
+
+def fingerprint(test: TestCase) -> Tuple[Any, ...]:
+    return tuple(
+        (
+            command.id(),
+            tuple(
+                (argument.value, getattr(argument, "content_type", None), getattr(argument, "extra", None))
+                for argument in command.arguments
+            ),
+        )
+        for command in test.commands
+    )
+
+
+def index(test: TestCase) -> Dict[Key, TestCase]:
+    """
+    Maps heading paths to tests, repeated headings under one parent are told apart by their occurrence.
+    """
+    result = {}
+    stack = [((), test)]
+    while stack:
+        key, item = stack.pop()
+        result[key] = item
+        stack.extend(_children(key, item))
+
+    return result
+
+
+def diff(old: TestCase, new: TestCase) -> List[TestCase]:
+    """
+    Returns top-most tests of the new tree which did not exist in the old one or whose commands changed.
+    Changed tests have to run again together with their descendants, siblings get their own copies of the
+    context, so descendants are the only tests that can see variables set by a changed test.
+    """
+    old_index = index(old)
+    changed = []
+    stack = [((), new)]
+    while stack:
+        key, test = stack.pop()
+        previous = old_index.get(key)
+        if previous is None or fingerprint(previous) != fingerprint(test):
+            changed.append(test)
+            continue
+        stack.extend(reversed(list(_children(key, test))))
+
+    return changed
+
+
+def _children(key: Key, test: TestCase) -> Iterator[Tuple[Key, TestCase]]:
+    occurrences: Dict[str, int] = {}
+    for child in test.children:
+        occurrence = occurrences.get(child.name, 0)
+        occurrences[child.name] = occurrence + 1
+        yield key + ((child.name, occurrence),), child
+
+
+class _FailureRecorder(Reporter):
+    def __init__(self):
+        self.failed: Set[int] = set()
+
+    def command_finished(self, test: TestCase, command: Command, result: Result, duration: float) -> None:
+        if not result:
+            self.failed.add(id(test))
+
+
+class Watcher:
+    """
+    Polls spec files and runs them again when they change. Only sections that are new or whose commands
+    changed are run, together with their descendants, statuses of the remaining sections are carried over from
+    the previous run. Before a changed section runs, commands of its ancestors are executed to rebuild its context.
+    """
+
+    def __init__(self, runner: Runner, paths: Iterable[str]):
+        self.runner = runner
+        self.paths = list(paths)
+        self.tests: Dict[str, TestCase] = {}
+        self._stamps: Dict[str, Tuple[int, int]] = {}
+        self._failed: Dict[str, Set[Key]] = {}
+
+    def check(self) -> Dict[str, List[TestCase]]:
+        """
+        Runs files changed since the last check, returns tests that were run for each of them.
+        """
+        stamps = {}
+        for filename in discover(self.paths):
+            stat = os.stat(filename)
+            stamps[filename] = (stat.st_mtime_ns, stat.st_size)
+        for filename in set(self.tests) - set(stamps):
+            del self.tests[filename]
+            del self._failed[filename]
+            del self._stamps[filename]
+
+        changed = [filename for filename, stamp in stamps.items() if self._stamps.get(filename) != stamp]
+        if not changed:
+            return {}
+
+        updates = {}
+        executor = self.runner.create_executor()
+        try:
+            for filename in changed:
+                self._stamps[filename] = stamps[filename]
+                updates[filename] = self._update(filename, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            self.runner.reporter.run_finished()
+
+        return updates
+
+    def _update(self, filename: str, executor: Executor = None) -> List[TestCase]:
+        test = self.runner.parse_file(filename)
+        previous = self.tests.get(filename)
+        changed = [test] if previous is None else diff(previous, test)
+        tests = index(test)
+        keys = {id(item): key for key, item in tests.items()}
+        rerun = {id(item) for changed_test in changed for item in changed_test.walk()}
+
+        failed = set()
+        if previous is not None:
+            previous_tests = index(previous)
+            for key, item in tests.items():
+                if id(item) not in rerun and key in previous_tests:
+                    item.status = previous_tests[key].status
+                    item.duration = previous_tests[key].duration
+            failed = {key for key in self._failed[filename] if key in tests and id(tests[key]) not in rerun}
+
+        recorder = _FailureRecorder()
+        reporter = MultiReporter([recorder, self.runner.reporter])
+        reporter.file_started(filename)
+        contexts: Dict[int, Context] = {}
+        for item in changed:
+            item.run(self._prepare_context(item, contexts, recorder), executor, reporter)
+
+        failed.update(keys[test_id] for test_id in recorder.failed)
+        for key, item in sorted(tests.items(), key=lambda entry: -len(entry[0])):
+            if id(item) in rerun:
+                continue
+            children_failed = any(child.status == Status.FAILED for child in item.children)
+            item.status = Status.FAILED if key in failed or children_failed else Status.PASSED
+
+        self.tests[filename] = test
+        self._failed[filename] = failed
+
+        return changed
+
+    def _prepare_context(self, test: TestCase, contexts: Dict[int, Context], reporter: Reporter) -> Context:
+        if test.parent is None:
+            return Context({})
+        if id(test.parent) not in contexts:
+            context = self._prepare_context(test.parent, contexts, reporter)
+            test.parent.run_commands(context, reporter)
+            contexts[id(test.parent)] = context
+
+        return contexts[id(test.parent)].copy()